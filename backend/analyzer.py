@@ -0,0 +1,777 @@
+import re
+import json
+from datetime import datetime, timedelta, timezone
+import logging
+from typing import List, Dict
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+import hashlib
+from dotenv import load_dotenv
+from scraper_config import keywords
+from nlp_pipeline import SPACY_MODEL, get_nlp, model_version
+from resume_cache import file_digest, open_resume_cache
+from llm_cache import cache_key, open_cache
+from llm_providers import LLM_PROVIDER, JsonArrayStream, get_provider, parse_llm_json
+from prompt_compaction import (
+    CHARS_PER_TOKEN, LLM_JOB_TOKENS, LLM_PROMPT_TOKENS, LLM_RESUME_TOKENS, SentenceRanker, compact_jobs,
+    compact_resume, estimate_tokens
+)
+
+# Heavy dependencies (pandas/sklearn via job_store/job_index, PyMuPDF, python-docx,
+# google-generativeai, selenium via scraper) are imported where they are used so a
+# run only pays for the code paths it takes.
+
+# Load environment variables
+load_dotenv()
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Corpus freshness policy for analyze_jobs:
+#   stale   - re-scrape only keywords whose newest posting is older than CORPUS_TTL_HOURS (default)
+#   always  - full re-scrape before every analysis (previous behavior)
+#   offline - never scrape, analyze whatever is in the job store
+REFRESH_MODES = ("stale", "always", "offline")
+REFRESH_MODE = os.getenv("REFRESH_MODE", "stale").lower()
+CORPUS_TTL_HOURS = float(os.getenv("CORPUS_TTL_HOURS", "24"))
+
+# final_score = MATCH_WEIGHT * match_score + SKILL_WEIGHT * skill_match_percent / 100
+MATCH_WEIGHT = 0.6
+SKILL_WEIGHT = 0.4
+# Blend dense LSA similarity (semantic_index.py) into the match component of final_score
+SEMANTIC_MATCH = os.getenv("SEMANTIC_MATCH", "false").lower() in ("1", "true", "yes")
+SEMANTIC_BLEND = float(os.getenv("SEMANTIC_BLEND", "0.5"))
+
+# Bump when the analysis prompt changes so answers cached for the old prompt are not reused
+PROMPT_VERSION = 2
+# Job fields that identify a posting in the LLM cache (scores drift between index refits)
+LLM_JOB_FIELDS = ("title", "company", "location", "link", "description")
+
+# LLM analysis mode:
+#   batch   - all jobs in a single prompt (default)
+#   per_job - one small request per job, LLM_CONCURRENCY in flight, overall assessment aggregated locally (opt-in)
+LLM_MODES = ("batch", "per_job")
+LLM_MODE = os.getenv("LLM_MODE", "batch").lower()
+LLM_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", "8"))
+LLM_TOP_JOBS = int(os.getenv("LLM_TOP_JOBS", "5"))  # matches sent to the LLM
+# Fit prompts into LLM_PROMPT_TOKENS by keeping the most relevant description sentences (prompt_compaction.py)
+LLM_COMPACT = os.getenv("LLM_COMPACT", "true").lower() in ("1", "true", "yes")
+# Per-job answers carry these lists; they are tallied across jobs into career_insights
+INSIGHT_FIELDS = ("skill_gaps", "growth_areas", "industry_trends")
+
+# Custom skill patterns (extend this list based on your domain)
+SKILL_PATTERNS = [
+    r'python|java|javascript|react|node\.js|sql|aws|docker|kubernetes|git|c\+\+|ruby|golang',
+    r'machine learning|deep learning|artificial intelligence|data science|nlp|computer vision',
+    r'agile|scrum|ci/cd|devops|test driven development|rest api|microservices',
+    r'mongodb|postgresql|mysql|redis|elasticsearch|kafka|graphql'
+]
+
+# Skills checked by get_skill_gap_analysis
+GAP_SKILLS = [
+    'docker', 'kubernetes', 'aws', 'azure', 'gcp', 'ci/cd', 'jenkins',
+    'react', 'vue', 'angular', 'node.js', 'typescript', 'graphql',
+    'machine learning', 'python', 'java', 'golang', 'rust'
+]
+
+# Terms always kept in the corpus statistics index (resume skills are added on first use)
+TRACKED_SKILLS = sorted(set(GAP_SKILLS) | {
+    re.sub(r'\\(.)', r'\1', term) for pattern in SKILL_PATTERNS for term in pattern.split('|')
+})
+# spaCy entity labels kept as skill candidates
+SKILL_ENTITY_LABELS = ("PRODUCT", "ORG", "GPE")
+# Bump when skills_from_entities changes so cached resume skills are recomputed
+SKILL_EXTRACTION_VERSION = 1
+
+# PDFs with at least this many pages are extracted by PDF_WORKERS processes, one page range each
+PDF_PARALLEL_PAGES = int(os.getenv("PDF_PARALLEL_PAGES", "16"))
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", "0")) or (os.cpu_count() or 1)
+
+# Matches listed in the report (the scorer keeps max(this, LLM top jobs))
+REPORT_TOP_MATCHES = 10
+# Locations listed in the report's per-location demand breakdown
+REPORT_TOP_LOCATIONS = 10
+
+def _pdf_pages_text(resume_path, start, stop):
+    import fitz  # PyMuPDF
+    with fitz.open(resume_path) as doc:
+        return "".join(doc[i].get_text() for i in range(start, stop))
+
+def extract_resume_text(resume_path, workers=None):
+    """Extract text from a resume PDF or DOCX (large PDFs page-parallel across `workers` processes)"""
+    if resume_path.lower().endswith('.pdf'):
+        import fitz  # PyMuPDF
+        with fitz.open(resume_path) as doc:
+            pages = doc.page_count
+            workers = min(PDF_WORKERS if workers is None else workers, pages)
+            if pages < PDF_PARALLEL_PAGES or workers <= 1:
+                return "".join(page.get_text() for page in doc)
+        # PyMuPDF documents can't be shared across threads; each process opens its own copy
+        step = -(-pages // workers)
+        starts = list(range(0, pages, step))
+        with ProcessPoolExecutor(max_workers=len(starts)) as executor:
+            return "".join(executor.map(_pdf_pages_text, [resume_path] * len(starts), starts,
+                                        [min(start + step, pages) for start in starts]))
+    if resume_path.lower().endswith('.docx'):
+        try:
+            from docx import Document
+        except ImportError:
+            raise ImportError("python-docx not installed. Install with 'pip install python-docx'.")
+        d = Document(resume_path)
+        return "\n".join(p.text for p in d.paragraphs)
+    raise ValueError("Unsupported resume format. Use PDF or DOCX.")
+
+def skill_extraction_version():
+    """Digest of everything skill extraction depends on; part of each resume cache entry"""
+    parts = [SKILL_EXTRACTION_VERSION, SKILL_PATTERNS, SKILL_ENTITY_LABELS, SPACY_MODEL, model_version()]
+    return hashlib.blake2b(json.dumps(parts).encode("utf-8"), digest_size=8).hexdigest()
+
+def doc_entities(doc):
+    """[(text, label)] of the named entities in a spaCy doc"""
+    return [(ent.text, ent.label_) for ent in doc.ents]
+
+def skills_from_entities(text, entities):
+    """Combine NER entities with pattern matches over the raw text"""
+    skills = []
+    
+    # NER-based extraction
+    for ent_text, label in entities:
+        if label in SKILL_ENTITY_LABELS and len(ent_text) > 2:
+            skills.append(ent_text)
+    
+    # Pattern-based extraction
+    lowered = text.lower()
+    for pattern in SKILL_PATTERNS:
+        matches = re.finditer(pattern, lowered)
+        skills.extend([match.group() for match in matches])
+    
+    # Clean and normalize skills
+    return list(set([
+        re.sub(r'[^\x00-\x7F]+', '', skill).strip()
+        for skill in skills
+        if skill.strip() and not skill.startswith('\x80')
+    ]))
+
+def skills_from_doc(text, doc):
+    """Combine NER entities from a spaCy doc with pattern matches over the raw text"""
+    return skills_from_entities(text, doc_entities(doc))
+
+def stale_keywords(ttl_hours=None, store_path=None):
+    """Keywords with no postings in the store newer than the TTL."""
+    ttl = timedelta(hours=CORPUS_TTL_HOURS if ttl_hours is None else ttl_hours)
+    cutoff = datetime.now(timezone.utc) - ttl
+    from job_store import open_store
+    with open_store(store_path) as store:
+        last_seen = store.keyword_last_seen()
+    return [kw for kw in keywords if kw not in last_seen or last_seen[kw] < cutoff]
+
+def refresh_job_store(mode=None, ttl_hours=None, store_path=None):
+    """Bring the job store up to date according to the freshness policy. Returns the scraped keywords."""
+    mode = (mode or REFRESH_MODE).lower()
+    if mode not in REFRESH_MODES:
+        raise ValueError(f"Unknown refresh mode {mode!r}; expected one of {', '.join(REFRESH_MODES)}")
+    if mode == "offline":
+        logging.info("Offline mode: analyzing the stored corpus without scraping")
+        return []
+    if mode == "always":
+        targets = list(keywords)
+    else:
+        targets = stale_keywords(ttl_hours, store_path)
+    if not targets:
+        logging.info("Job corpus is fresh; skipping scrape")
+        return []
+    logging.info(f"Refreshing {len(targets)} keyword(s): {', '.join(targets)}")
+    from scraper import get_csv_file  # selenium / undetected-chromedriver
+    get_csv_file(targets)
+    return targets
+
+class JobCorpus:
+    """The stored jobs, streamed as DataFrame chunks with the combined_text column used for matching.
+
+    Every iteration reads the store again with one cursor, `chunk_rows` postings at a time, so the
+    job index, corpus stats and scorer each hold a single chunk. All iterations see the jobs that
+    were stored when the corpus was opened, even while a crawl keeps writing."""
+
+    def __init__(self, store_path=None, chunk_rows=None):
+        from job_store import open_store
+        from scoring import SCORE_CHUNK_ROWS
+        with open_store(store_path) as store:
+            self.store_path = store.path
+            self.last_rowid = store.last_rowid()
+            self._len = store.count("rowid <= ?", (self.last_rowid,))
+        if not self._len:
+            raise ValueError("Job store has no rows. Scraper likely failed or was blocked.")
+        self.chunk_rows = chunk_rows or SCORE_CHUNK_ROWS
+        logging.info(f"{self._len} jobs in job store")
+
+    def __len__(self):
+        return self._len
+
+    def __iter__(self):
+        from job_store import JobStore
+        store = JobStore(self.store_path)
+        try:
+            for chunk in store.iter_dataframes(self.chunk_rows, where="rowid <= ?", params=(self.last_rowid,)):
+                chunk['combined_text'] = chunk['title'] + " " + chunk['description'] + " " + chunk['company']
+                yield chunk
+        finally:
+            store.close()
+
+    def rows(self, positions):
+        """The postings at the given corpus positions (0-based, iteration order), indexed by position."""
+        import pandas as pd
+        wanted = sorted(set(int(p) for p in positions))
+        found, start = [], 0
+        for chunk in self:
+            stop = start + len(chunk)
+            picked = [p for p in wanted if start <= p < stop]
+            found.append(chunk.iloc[[p - start for p in picked]].set_axis(picked))
+            start = stop
+        return pd.concat(found)
+
+def _normalize(value) -> str:
+    return " ".join(str(value or "").split())
+
+def _fit_score(entry):
+    try:
+        return float(str(entry.get("fit_score", "")).rstrip("%"))
+    except ValueError:
+        return None
+
+def match_job_entries(jobs, entries):
+    """Pair each job with its job_analysis entry by title and company, falling back to position"""
+    by_name = {}
+    for entry in entries:
+        key = (_normalize(entry.get("job_title")).lower(), _normalize(entry.get("company")).lower())
+        by_name.setdefault(key, entry)
+    paired = []
+    for i, job in enumerate(jobs):
+        entry = by_name.get((_normalize(job.get("title")).lower(), _normalize(job.get("company")).lower()))
+        if entry is None and len(entries) == len(jobs):
+            entry = entries[i]
+        paired.append(entry)
+    return paired
+
+def aggregate_job_analyses(analyses, top_insights=10) -> Dict:
+    """Merge per-job answers (in rank order) into the batch schema without another LLM call"""
+    entries = []
+    tallies = {field: Counter() for field in INSIGHT_FIELDS}
+    labels = {}
+    for analysis in analyses:
+        entries.append({k: v for k, v in analysis.items() if k not in INSIGHT_FIELDS})
+        for field in INSIGHT_FIELDS:
+            for item in analysis.get(field) or []:
+                label = _normalize(item)
+                if label:
+                    tallies[field][label.lower()] += 1
+                    labels.setdefault(label.lower(), label)
+    scored = [(score, entry) for entry in entries for score in [_fit_score(entry)] if score is not None]
+    if scored:
+        average = sum(score for score, _ in scored) / len(scored)
+        best_score, best = max(scored, key=lambda pair: pair[0])
+        summary = (f"{len(entries)} jobs analysed, average fit {average:.0f}%; best fit: "
+                   f"{best.get('job_title', '?')} at {best.get('company', '?')} ({best_score:.0f}%)")
+    else:
+        average = 0
+        summary = f"{len(entries)} jobs analysed; no fit scores returned"
+    return {
+        "overall_assessment": {"fit_score": round(average), "summary": summary},
+        "job_analysis": entries,
+        "career_insights": {
+            field: [labels[key] for key, _ in tallies[field].most_common(top_insights)]
+            for field in INSIGHT_FIELDS
+        }
+    }
+
+class JobAnalyzer:
+    def __init__(self, resume_path, use_llm=True):
+        self.resume_path = resume_path
+        self.resume_text = None
+        self.resume_digest = None
+        self.resume_cache = open_resume_cache()
+        self.skills = None
+        self.corpus = None
+        self.matched_jobs = None
+        self.job_index = None
+        self.semantic_index = None
+        self.semantic_match = SEMANTIC_MATCH
+        self.match_stats = None
+        self.corpus_stats = None
+        self.llm_analysis = None
+        self.use_llm = use_llm
+        self.llm_mode = LLM_MODE
+        self.llm_concurrency = LLM_CONCURRENCY
+        self.llm_provider = LLM_PROVIDER
+        self._provider = None
+        self._provider_ready = False
+        # Optional callback receiving each job_analysis entry as soon as it is available
+        self.on_job_analysis = None
+        self.llm_timings = {}
+        self._llm_started = 0.0
+        self.compact_prompts = LLM_COMPACT
+        self.llm_prompt_stats = {}
+        self._ranker = None
+        
+        # Optional overrides for the job store (JOB_STORE_PATH) and LLM cache (LLM_CACHE_PATH) locations
+        self.store_path = None
+        self.llm_cache_path = None
+        
+    @property
+    def provider(self):
+        """LLM provider (llm_providers.py), created (and its SDK imported) on first use"""
+        if not self._provider_ready:
+            self._provider_ready = True
+            if self.use_llm:
+                self._provider = get_provider(self.llm_provider)
+        return self._provider
+
+    @property
+    def nlp(self):
+        """Shared NER-only spaCy pipeline, loaded on first use"""
+        return get_nlp()
+
+    def extract_text_from_pdf(self):
+        """Extract text from resume PDF or DOCX"""
+        logging.info("Extracting text from resume...")
+        try:
+            # Parsed resumes are cached by file content; an unchanged file is never reopened
+            self.resume_digest = file_digest(self.resume_path) if self.resume_cache is not None else None
+            cached = self.resume_cache.text(self.resume_digest) if self.resume_digest else None
+            if cached is not None:
+                logging.info("Resume text loaded from cache")
+                self.resume_text = cached
+                return
+            self.resume_text = extract_resume_text(self.resume_path)
+            if self.resume_digest:
+                self.resume_cache.put(self.resume_digest, self.resume_text)
+        except Exception as e:
+            logging.error(f"Error extracting text from resume: {e}")
+            raise
+
+    def extract_skills(self):
+        """Extract skills from resume using NLP (cached per resume digest and extraction version)"""
+        logging.info("Extracting skills from resume...")
+        version = skill_extraction_version()
+        cached = self.resume_cache.analysis(self.resume_digest, version) if self.resume_digest else None
+        if cached is not None:
+            self.skills = cached["skills"]
+            logging.info(f"Loaded {len(self.skills)} unique skills from cache")
+            return
+        entities = doc_entities(self.nlp(self.resume_text))
+        self.skills = skills_from_entities(self.resume_text, entities)
+        if self.resume_digest:
+            self.resume_cache.put(self.resume_digest, self.resume_text, version, entities, self.skills)
+        logging.info(f"Extracted {len(self.skills)} unique skills")
+
+    def _llm_context(self) -> Dict:
+        """Normalized prompt inputs shared by every job; hashed into each cache key"""
+        return {
+            "model": self.provider.name,
+            "prompt_version": PROMPT_VERSION,
+            "resume": _normalize(self._resume_excerpt()),
+            "skills": sorted({s.lower() for s in self.skills}),
+            "budget": [LLM_PROMPT_TOKENS, LLM_JOB_TOKENS] if self.compact_prompts else None,
+        }
+
+    def _resume_excerpt(self) -> str:
+        """Resume text for prompts: whole sections within LLM_RESUME_TOKENS (or the first 1000 chars uncompacted)"""
+        if not self.compact_prompts:
+            return self.resume_text[:1000]
+        return compact_resume(self.resume_text, LLM_RESUME_TOKENS * CHARS_PER_TOKEN)
+
+    def _prompt_inputs(self, jobs: List[Dict], template, render):
+        """(resume excerpt, job records) for a prompt; compacted so template(resume, render(jobs)) fits
+        LLM_PROMPT_TOKENS, which may drop the lowest-ranked jobs"""
+        resume = self._resume_excerpt()
+        if not self.compact_prompts:
+            return resume, jobs
+        if self._ranker is None:
+            vectorizer = self.job_index.vectorizer if self.job_index is not None else None
+            self._ranker = SentenceRanker(self.skills, vectorizer)
+        room = LLM_PROMPT_TOKENS * CHARS_PER_TOKEN - len(template(resume, ""))
+        compacted = compact_jobs(jobs, self._ranker, room, render=render)
+        if len(compacted) < len(jobs):
+            logging.warning(f"Prompt budget of {LLM_PROMPT_TOKENS} tokens fits {len(compacted)} of "
+                            f"{len(jobs)} jobs; the rest are not analysed")
+        return resume, compacted
+
+    def _jobs_json(self, jobs) -> str:
+        if self.compact_prompts:
+            return json.dumps(jobs, indent=1, ensure_ascii=False, default=str)
+        return json.dumps(jobs, indent=2, default=str)
+
+    def _record_prompt(self, prompt: str):
+        stats = self.llm_prompt_stats
+        tokens = estimate_tokens(prompt)
+        stats["prompts"] = stats.get("prompts", 0) + 1
+        stats["tokens"] = stats.get("tokens", 0) + tokens
+        stats["max_tokens"] = max(stats.get("max_tokens", 0), tokens)
+
+    def _build_llm_prompt(self, top_jobs: List[Dict]):
+        """(prompt, number of leading top_jobs it covers) for all jobs (batch mode)"""
+        resume, jobs = self._prompt_inputs(top_jobs, self._batch_prompt, self._jobs_json)
+        prompt = self._batch_prompt(resume, self._jobs_json(jobs))
+        self._record_prompt(prompt)
+        return prompt, len(jobs)
+
+    def _batch_prompt(self, resume: str, jobs: str) -> str:
+        return f"""As an expert job matching AI, analyze these job opportunities based on the candidate's resume and skills.
+        
+Resume Summary:
+{resume}
+
+Candidate's Key Skills:
+{', '.join(self.skills)}
+
+Please analyze the following job opportunities and provide:
+1. Overall fit assessment (0-100%)
+2. Key strengths and potential challenges
+3. Growth opportunities
+4. Cultural fit assessment
+5. Specific recommendations for application
+
+Job Opportunities:
+{jobs}
+
+Provide your analysis in a structured JSON format with the following fields:
+{{
+    "overall_assessment": {{
+        "fit_score": number,
+        "summary": "string"
+    }},
+    "job_analysis": [
+        {{
+            "job_title": "string",
+            "company": "string",
+            "fit_score": number,
+            "strengths": ["string"],
+            "challenges": ["string"],
+            "growth_opportunities": ["string"],
+            "cultural_fit": "string",
+            "recommendations": ["string"]
+        }}
+    ],
+    "career_insights": {{
+        "skill_gaps": ["string"],
+        "growth_areas": ["string"],
+        "industry_trends": ["string"]
+    }}
+}}"""
+
+    def _build_job_prompt(self, job: Dict) -> str:
+        """Small prompt for one job (per_job mode)"""
+        resume, jobs = self._prompt_inputs([job], self._job_prompt, lambda records: self._jobs_json(records[0]))
+        prompt = self._job_prompt(resume, self._jobs_json(jobs[0]))
+        self._record_prompt(prompt)
+        return prompt
+
+    def _job_prompt(self, resume: str, job: str) -> str:
+        return f"""As an expert job matching AI, assess how well the candidate fits this job opportunity.
+
+Resume Summary:
+{resume}
+
+Candidate's Key Skills:
+{', '.join(self.skills)}
+
+Job:
+{job}
+
+Respond with JSON only, in this format:
+{{
+    "job_title": "string",
+    "company": "string",
+    "fit_score": number,
+    "strengths": ["string"],
+    "challenges": ["string"],
+    "growth_opportunities": ["string"],
+    "cultural_fit": "string",
+    "recommendations": ["string"],
+    "skill_gaps": ["string"],
+    "growth_areas": ["string"],
+    "industry_trends": ["string"]
+}}"""
+
+    def _emit_job_analysis(self, entry: Dict):
+        """Hand one finished job_analysis entry to on_job_analysis, recording time to first insight"""
+        if "first_insight" not in self.llm_timings:
+            self.llm_timings["first_insight"] = time.perf_counter() - self._llm_started
+            logging.info(f"First job analysis ready after {self.llm_timings['first_insight']:.2f}s")
+        if self.on_job_analysis is not None:
+            self.on_job_analysis({k: v for k, v in entry.items() if k not in INSIGHT_FIELDS})
+
+    def _analyze_job(self, job: Dict, prompt: str) -> Dict:
+        analysis = parse_llm_json(self.provider.generate(prompt))
+        analysis.setdefault("job_title", job.get("title"))
+        analysis.setdefault("company", job.get("company"))
+        return analysis
+
+    def _analyze_jobs_individually(self, top_jobs: List[Dict], cache) -> Dict:
+        """per_job mode: cached answers are reused, the rest requested LLM_CONCURRENCY at a time"""
+        context = self._llm_context()
+        keys = [
+            cache_key("job_request", context, {field: _normalize(job.get(field)) for field in LLM_JOB_FIELDS})
+            for job in top_jobs
+        ]
+        analyses = [cache.get(key) for key in keys]
+        missing = [i for i, analysis in enumerate(analyses) if analysis is None]
+        for analysis in analyses:
+            if analysis is not None:
+                self._emit_job_analysis(analysis)
+        if missing:
+            logging.info(f"Requesting LLM analysis for {len(missing)} job(s) "
+                         f"({self.llm_concurrency} in flight), {len(top_jobs) - len(missing)} reused from cache")
+            with ThreadPoolExecutor(max_workers=max(1, self.llm_concurrency), thread_name_prefix="llm") as executor:
+                # prompts are built here so compaction and prompt stats stay on one thread
+                futures = {executor.submit(self._analyze_job, top_jobs[i], self._build_job_prompt(top_jobs[i])): i
+                           for i in missing}
+                for future in as_completed(futures):
+                    i = futures[future]
+                    try:
+                        analyses[i] = future.result()
+                    except Exception as e:
+                        # one failed job should not cost the others
+                        logging.warning(f"LLM analysis failed for {top_jobs[i].get('title')}: {e}")
+                        continue
+                    cache.put(keys[i], analyses[i])
+                    self._emit_job_analysis(analyses[i])
+        else:
+            logging.info("LLM analysis served from cache (0 calls)")
+        analysed = [analysis for analysis in analyses if analysis is not None]
+        if not analysed:
+            raise ValueError("No job could be analysed")
+        return aggregate_job_analyses(analysed)
+
+    def _analyze_jobs_batched(self, top_jobs: List[Dict], cache) -> Dict:
+        """batch mode: one prompt for all jobs not answered before"""
+        context = self._llm_context()
+        job_keys = [
+            cache_key("job", context, {field: _normalize(job.get(field)) for field in LLM_JOB_FIELDS})
+            for job in top_jobs
+        ]
+        report_key = cache_key("report", context, job_keys)
+        insights_key = cache_key("insights", context)
+
+        cached = cache.get(report_key)
+        if cached is not None:
+            logging.info("LLM analysis served from cache (0 calls)")
+            for entry in cached.get("job_analysis") or []:
+                self._emit_job_analysis(entry)
+            return cached
+        
+        entries = [cache.get(key) for key in job_keys]
+        missing = [i for i, entry in enumerate(entries) if entry is None]
+        for entry in entries:
+            if entry is not None:
+                self._emit_job_analysis(entry)
+        fresh = {}
+        if missing:
+            logging.info(f"Requesting LLM analysis for {len(missing)} job(s), "
+                         f"{len(top_jobs) - len(missing)} reused from cache")
+            # Stream the answer; each job_analysis entry is handed on as soon as it is complete
+            stream = JsonArrayStream("job_analysis")
+            prompt, included = self._build_llm_prompt([top_jobs[i] for i in missing])
+            for chunk in self.provider.stream(prompt):
+                for entry in stream.feed(chunk):
+                    self._emit_job_analysis(entry)
+            fresh = stream.result()
+            # jobs left out to fit the prompt budget stay unanswered (and uncached)
+            paired = match_job_entries([top_jobs[i] for i in missing[:included]], fresh.get("job_analysis") or [])
+            for i, entry in zip(missing, paired):
+                if entry is not None:
+                    entries[i] = entry
+                    cache.put(job_keys[i], entry)
+            if fresh.get("career_insights"):
+                cache.put(insights_key, fresh["career_insights"])
+        
+        if len(missing) == len(top_jobs):
+            # nothing reused: keep the model's answer as is
+            analysis = fresh
+        else:
+            analysed = [entry for entry in entries if entry is not None]
+            scores = [score for score in map(_fit_score, analysed) if score is not None]
+            analysis = {
+                "overall_assessment": {
+                    "fit_score": round(sum(scores) / len(scores)) if scores else 0,
+                    "summary": (fresh.get("overall_assessment") or {}).get("summary")
+                               or f"Average of {len(scores)} cached per-job fit scores"
+                },
+                "job_analysis": analysed,
+                "career_insights": fresh.get("career_insights") or cache.get(insights_key)
+                                   or {"skill_gaps": [], "growth_areas": [], "industry_trends": []}
+            }
+        if all(entry is not None for entry in entries):
+            cache.put(report_key, analysis)
+        return analysis
+
+    def analyze_jobs_with_llm(self, top_jobs: List[Dict]) -> Dict:
+        """Analyze jobs with the configured LLM provider for better matching and insights.
+
+        Answers are cached on disk (llm_cache.py): an unchanged request makes no call, and
+        jobs analysed before for the same resume are reused so only new ones are sent.
+        per_job mode sends one small request per job, LLM_CONCURRENCY at a time."""
+        if not self.provider:
+            return {"disabled": True, "reason": "LLM model not available"}
+        if self.llm_mode not in LLM_MODES:
+            raise ValueError(f"Unknown LLM mode {self.llm_mode!r}; expected one of {', '.join(LLM_MODES)}")
+        
+        logging.info(f"Starting LLM-based job analysis ({len(top_jobs)} jobs, {self.llm_mode} mode, "
+                     f"{self.provider.name})...")
+        self.llm_timings = {}
+        self.llm_prompt_stats = {}
+        self._ranker = None
+        self._llm_started = time.perf_counter()
+        try:
+            with open_cache(self.llm_cache_path) as cache:
+                if self.llm_mode == "per_job":
+                    self.llm_analysis = self._analyze_jobs_individually(top_jobs, cache)
+                else:
+                    self.llm_analysis = self._analyze_jobs_batched(top_jobs, cache)
+            
+            self.llm_timings["total"] = time.perf_counter() - self._llm_started
+            logging.info(f"Completed LLM-based job analysis in {self.llm_timings['total']:.2f}s")
+            if self.llm_prompt_stats:
+                stats = self.llm_prompt_stats
+                logging.info(f"LLM prompts: {stats['prompts']}, ~{stats['tokens']} tokens "
+                             f"(max {stats['max_tokens']} per prompt, compaction {'on' if self.compact_prompts else 'off'})")
+            return self.llm_analysis
+            
+        except Exception as e:
+            logging.error(f"Error in LLM analysis: {e}")
+            return {
+                "error": "Failed to complete LLM analysis",
+                "details": str(e)
+            }
+
+    def refresh_jobs(self, mode=None, ttl_hours=None):
+        """Bring the job store up to date according to the freshness policy."""
+        return refresh_job_store(mode, ttl_hours, self.store_path)
+
+    def analyze_jobs(self, min_match_score=0.3, refresh=None, ttl_hours=None, llm_top_jobs=None):
+        """Analyze jobs and find matches"""
+        logging.info("Starting job analysis...")
+        
+        # Refresh job data according to the freshness policy
+        self.refresh_jobs(refresh, ttl_hours)
+        
+        # Scraped jobs (with combined_text) are streamed from the persistent store chunk by chunk
+        self.corpus = JobCorpus(self.store_path)
+        
+        from job_index import JobIndex
+        
+        # TF-IDF job vectors are persisted; only new or changed postings get vectorized
+        self.job_index = JobIndex().sync(self.corpus)
+        
+        # Dense LSA vectors follow the job index rows and are memory-mapped, not loaded
+        if self.semantic_match:
+            from semantic_index import SemanticIndex
+            self.semantic_index = (self.semantic_index or SemanticIndex()).sync(self.job_index)
+        
+        # Per-skill corpus statistics live in the job store; only new or changed postings are counted
+        from corpus_stats import CorpusStats
+        if self.corpus_stats is not None:
+            self.corpus_stats.close()
+        # Only the tracked vocabulary is persisted; resume-only terms (NER entities) are counted in memory
+        self.corpus_stats = CorpusStats(self.store_path).sync(self.corpus, TRACKED_SKILLS)
+        self.corpus_stats.count_transient(self.corpus, self.skills)
+        
+        # Stream the corpus through the scorer in chunks, keeping only the best matches
+        from scoring import score_jobs
+        llm_top_jobs = LLM_TOP_JOBS if llm_top_jobs is None else llm_top_jobs
+        self.matched_jobs, self.match_stats = score_jobs(
+            self.corpus, self.job_index, self.skills, max(REPORT_TOP_MATCHES, llm_top_jobs), min_match_score,
+            MATCH_WEIGHT, SKILL_WEIGHT,
+            semantic_index=self.semantic_index if self.semantic_match else None, semantic_blend=SEMANTIC_BLEND
+        )
+        
+        logging.info(f"Found {self.match_stats['matches']} matching jobs")
+        
+        # Get top jobs for LLM analysis
+        top_jobs = self.matched_jobs.head(llm_top_jobs).to_dict('records')
+        
+        # Perform LLM analysis
+        llm_analysis = self.analyze_jobs_with_llm(top_jobs)
+        
+        return self.generate_report(llm_analysis)
+
+    def generate_report(self, llm_analysis=None):
+        """Generate detailed analysis report"""
+        if self.matched_jobs is None or len(self.matched_jobs) == 0:
+            return {
+                "analysis_date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "total_jobs_analyzed": len(self.corpus) if self.corpus is not None else 0,
+                "matching_jobs_found": 0,
+                "top_matches": [],
+                "skill_analysis": {
+                    "your_skills": self.skills,
+                    "most_demanded_skills": {},
+                    "skill_gap_analysis": []
+                },
+                "error": "No matching jobs found."
+            }
+            
+        report = {
+            "analysis_date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "total_jobs_analyzed": len(self.corpus),
+            "matching_jobs_found": self.match_stats["matches"],
+            "score_distribution": self.match_stats["above"],
+            "top_matches": [],
+            "skill_analysis": {
+                "your_skills": self.skills,
+                "most_demanded_skills": self.get_most_demanded_skills(),
+                "skill_gap_analysis": self.get_skill_gap_analysis(),
+                "demand_by_keyword": self.get_skill_demand_breakdown("keyword"),
+                "demand_by_location": self.get_skill_demand_breakdown("location", REPORT_TOP_LOCATIONS)
+            },
+            "llm_analysis": llm_analysis
+        }
+        
+        # Add top 10 matching jobs
+        for _, job in self.matched_jobs.head(REPORT_TOP_MATCHES).iterrows():
+            match = {
+                "title": job['title'],
+                "company": job['company'],
+                "location": job['location'],
+                "match_score": f"{job['final_score']:.2f}",
+                "matched_skills": job['matched_skills'],
+                "link": job['link']
+            }
+            if 'semantic_score' in job:
+                match["semantic_score"] = f"{job['semantic_score']:.2f}"
+            report["top_matches"].append(match)
+            
+        # Save report to file
+        with open('job_analysis_report.json', 'w') as f:
+            json.dump(report, f, indent=2)
+            
+        return report
+
+    def get_most_demanded_skills(self):
+        """Analyze most demanded skills from job postings (corpus statistics lookup)"""
+        stats = self.corpus_stats.term_stats(self.skills)
+        skill_frequency = {skill: counts["tc"] for skill, counts in stats.items()}
+        return dict(sorted(skill_frequency.items(), key=lambda x: x[1], reverse=True))
+
+    def get_skill_gap_analysis(self):
+        """Analyze potential skill gaps (corpus statistics lookup)"""
+        own_skills = {s.lower() for s in self.skills}
+        candidates = [skill for skill in GAP_SKILLS if skill not in own_skills]
+        stats = self.corpus_stats.term_stats(candidates)
+        total_jobs = self.corpus_stats.job_count() or 1
+        missing_skills = []
+        
+        for skill in candidates:
+            count = stats[skill]["desc_tc"]
+            if count > total_jobs * 0.1:
+                missing_skills.append({
+                    'skill': skill,
+                    'demand_level': count / total_jobs
+                })
+                
+        return sorted(missing_skills, key=lambda x: x['demand_level'], reverse=True)
+
+    def get_skill_demand_breakdown(self, by="keyword", limit=0):
+        """Number of postings mentioning each of your skills, per search keyword or location"""
+        return self.corpus_stats.breakdown(self.skills, by, limit)
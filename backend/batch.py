@@ -0,0 +1,215 @@
+"""Score a directory of resumes against the job corpus in one pass.
+
+    python batch.py --resumes resumes/ --top-k 10 --out batch_results/
+
+Parsed resumes come from the resume cache (resume_cache.py) when the file is unchanged;
+the rest are extracted in parallel and spaCy runs once over them. Every resume is scored
+with scoring.ScoringKernel, the same final_score as main.py (including the optional
+semantic blend), in SCORE_CHUNK_ROWS chunks: one sparse matrix-matrix product per chunk and
+one skill scan of the chunk for the union of all resumes' skills.
+
+Outputs (in --out):
+  batch_report.json   per-resume skills and top-k matches
+  top_matches.csv     the same top-k matches as one long table
+  scores.npy          float32 resumes x jobs final_score matrix
+  scores_index.json   row (resume) and column (job link) labels for scores.npy
+"""
+import argparse
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from job_index import JobIndex
+from analyzer import (
+    CORPUS_TTL_HOURS, MATCH_WEIGHT, REFRESH_MODE, REFRESH_MODES, SEMANTIC_BLEND, SEMANTIC_MATCH, SKILL_WEIGHT,
+    JobCorpus, doc_entities, extract_resume_text, refresh_job_store, skill_extraction_version,
+    skills_from_entities
+)
+from nlp_pipeline import NLP_N_PROCESS, pipe_docs
+from resume_cache import file_digest, open_resume_cache
+from scoring import ScoringKernel
+
+BATCH_WORKERS = int(os.getenv("BATCH_WORKERS", "0")) or (os.cpu_count() or 1)
+RESUME_EXTENSIONS = (".pdf", ".docx")
+
+
+def find_resumes(resume_dir):
+    return sorted(
+        os.path.join(resume_dir, name) for name in os.listdir(resume_dir)
+        if name.lower().endswith(RESUME_EXTENSIONS) and not name.startswith("~$")
+    )
+
+
+def extract_all(paths, workers=BATCH_WORKERS):
+    """{path: text} for every resume that could be parsed, extracted in parallel processes."""
+    texts = {}
+    with ProcessPoolExecutor(max_workers=max(1, min(workers, len(paths)))) as executor:
+        # one process per resume already; large PDFs are not split further
+        futures = {path: executor.submit(extract_resume_text, path, 1) for path in paths}
+        for path, future in futures.items():
+            try:
+                texts[path] = future.result()
+            except Exception as e:
+                logging.error(f"Skipping {os.path.basename(path)}: {e}")
+    return texts
+
+
+def parse_resumes(paths, workers=BATCH_WORKERS, n_process=NLP_N_PROCESS, cache=None):
+    """{path: (text, skills)} for every resume that could be parsed.
+
+    Resumes found in `cache` (by file digest) skip extraction, and skip spaCy too when their
+    skills were cached for the current extraction version; everything else is parsed and
+    written back."""
+    version = skill_extraction_version()
+    digests, texts, parsed = {}, {}, {}
+    for path in paths:
+        entry = None
+        if cache is not None:
+            digests[path] = file_digest(path)
+            entry = cache.get(digests[path])
+        if entry is None:
+            continue
+        texts[path] = entry["text"]
+        analysis = entry.get("analyses", {}).get(version)
+        if analysis is not None:
+            parsed[path] = (entry["text"], analysis["skills"])
+
+    missing = [p for p in paths if p not in texts]
+    if missing:
+        logging.info(f"Extracting {len(missing)} resumes with {workers} workers...")
+        texts.update(extract_all(missing, workers))
+    unparsed = [p for p in paths if p in texts and p not in parsed]
+    logging.info(f"{len(parsed)} of {len(paths)} resumes parsed from cache, {len(unparsed)} through spaCy")
+    for path, doc in zip(unparsed, pipe_docs([texts[p] for p in unparsed], n_process=n_process)):
+        entities = doc_entities(doc)
+        skills = skills_from_entities(texts[path], entities)
+        parsed[path] = (texts[path], skills)
+        if cache is not None:
+            cache.put(digests[path], texts[path], version, entities, skills)
+    return {path: parsed[path] for path in paths if path in parsed}
+
+
+def score_resumes(resume_skills, corpus, job_index, semantic_index=None):
+    """Score every resume against every job, one corpus chunk at a time.
+
+    Returns (final, links, kernel): final is the dense resumes x jobs final_score array (columns
+    in corpus order, labelled by links); kernel is the ScoringKernel, used again for the details
+    of the top rows."""
+    kernel = ScoringKernel(job_index, list(resume_skills.values()), MATCH_WEIGHT, SKILL_WEIGHT,
+                           semantic_index, SEMANTIC_BLEND)
+    final = np.empty((len(resume_skills), len(corpus)), dtype=np.float32)
+    links = []
+    for chunk in corpus:
+        start = len(links)
+        final[:, start:start + len(chunk)] = kernel.score(job_index.positions(chunk['link']),
+                                                          chunk['combined_text'])["final"]
+        links.extend(chunk['link'])
+    return final, links, kernel
+
+
+def top_k_rows(scores, k):
+    """Column indices of the k highest scores, best first."""
+    k = min(k, scores.shape[0])
+    if k <= 0:
+        return np.array([], dtype=np.int64)
+    idx = np.argpartition(-scores, k - 1)[:k]
+    return idx[np.argsort(-scores[idx], kind="stable")]
+
+
+def run_batch(resume_dir, out_dir, top_k=10, min_match_score=0.3, refresh=None, ttl_hours=None, workers=BATCH_WORKERS,
+              n_process=NLP_N_PROCESS, semantic=SEMANTIC_MATCH):
+    started = time.perf_counter()
+    paths = find_resumes(resume_dir)
+    if not paths:
+        raise FileNotFoundError(f"No PDF/DOCX resumes found in {resume_dir}")
+    parsed = parse_resumes(paths, workers, n_process, open_resume_cache())
+    resume_skills = {os.path.basename(path): skills for path, (text, skills) in parsed.items()}
+
+    refresh_job_store(refresh, ttl_hours)
+    corpus = JobCorpus()
+    job_index = JobIndex().sync(corpus)
+    semantic_index = None
+    if semantic:
+        from semantic_index import SemanticIndex
+        semantic_index = SemanticIndex().sync(job_index)
+    final, links, kernel = score_resumes(resume_skills, corpus, job_index, semantic_index)
+
+    os.makedirs(out_dir, exist_ok=True)
+    report = {
+        "analysis_date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "total_jobs_analyzed": len(links),
+        "resumes": {}
+    }
+    tops = [[j for j in top_k_rows(final[r], top_k) if final[r, j] > min_match_score]
+            for r in range(len(resume_skills))]
+    # one more pass over the store for just the rows that made some resume's top-k
+    top_jobs = corpus.rows(j for top in tops for j in top)
+    rows = []
+    for r, name in enumerate(resume_skills):
+        top = tops[r]
+        jobs = top_jobs.loc[top]
+        scores = kernel.score(job_index.positions(jobs['link']), jobs['combined_text'])
+        matches = []
+        for i, j in enumerate(top):
+            job = jobs.iloc[i]
+            entry = {
+                "rank": i + 1,
+                "title": job['title'],
+                "company": job['company'],
+                "location": job['location'],
+                "match_score": f"{final[r, j]:.2f}",
+                "matched_skills": kernel.matched_skills(r, scores["hits"], i),
+                "link": job['link']
+            }
+            matches.append(entry)
+            extra = {"tfidf_score": round(float(scores["match"][r, i]), 4),
+                     "skill_match_percent": round(float(scores["skill_share"][r, i] * 100), 2)}
+            if scores["semantic"] is not None:
+                extra["semantic_score"] = round(float(scores["semantic"][r, i]), 4)
+            rows.append({"resume": name, **entry, **extra})
+        report["resumes"][name] = {
+            "your_skills": resume_skills[name],
+            "matching_jobs_found": int((final[r] > min_match_score).sum()),
+            "top_matches": matches
+        }
+
+    with open(os.path.join(out_dir, "batch_report.json"), "w") as f:
+        json.dump(report, f, indent=2)
+    pd.DataFrame(rows).to_csv(os.path.join(out_dir, "top_matches.csv"), index=False)
+    np.save(os.path.join(out_dir, "scores.npy"), final.astype(np.float32))
+    with open(os.path.join(out_dir, "scores_index.json"), "w") as f:
+        json.dump({"resumes": list(resume_skills), "links": links}, f)
+    logging.info(f"Scored {len(resume_skills)} resumes x {len(links)} jobs in {time.perf_counter() - started:.2f}s")
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score a directory of resumes against the job corpus")
+    parser.add_argument("--resumes", required=True, help="directory of PDF/DOCX resumes")
+    parser.add_argument("--out", default="batch_results", help="output directory")
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--min-score", type=float, default=0.3)
+    parser.add_argument("--refresh", choices=REFRESH_MODES, default=REFRESH_MODE)
+    parser.add_argument("--ttl-hours", type=float, default=CORPUS_TTL_HOURS)
+    parser.add_argument("--workers", type=int, default=BATCH_WORKERS, help="resume extraction processes")
+    parser.add_argument("--n-process", type=int, default=NLP_N_PROCESS, help="spaCy nlp.pipe processes")
+    parser.add_argument("--semantic", action=argparse.BooleanOptionalAction, default=SEMANTIC_MATCH,
+                        help="blend dense LSA similarity into the match score, as main.py does")
+    args = parser.parse_args()
+    report = run_batch(args.resumes, args.out, args.top_k, args.min_score, args.refresh, args.ttl_hours,
+                       args.workers, args.n_process, args.semantic)
+    for name, result in report["resumes"].items():
+        print(f"{name}: {result['matching_jobs_found']} matching jobs")
+        for job in result["top_matches"][:3]:
+            print(f"  {job['match_score']}  {job['title']} @ {job['company']}")
+    print(f"\nResults saved to {args.out}/")
+
+
+if __name__ == "__main__":
+    main()
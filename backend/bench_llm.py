@@ -0,0 +1,135 @@
+"""Offline benchmark of the LLM analysis stage using the deterministic local provider.
+
+    python bench_llm.py --jobs 50
+    python bench_llm.py --jobs 5 --modes batch,per_job --first-token 1.0 --chars-per-sec 500 --json llm.json
+    python bench_llm.py --compact on           # only the compacted prompts
+
+Runs JobAnalyzer.analyze_jobs_with_llm on synthetic jobs (full store records with 5-10k
+character descriptions) for each LLM mode, with prompt compaction off and on, against an
+empty cache. Reports prompt size, total wall time, time to first insight (first
+job_analysis entry handed on) and provider calls, so prompt and concurrency changes can be
+compared without an API key.
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import tempfile
+
+from analyzer import JobAnalyzer, LLM_CONCURRENCY, LLM_MODES
+from llm_providers import (
+    LOCAL_LLM_CHARS_PER_SECOND, LOCAL_LLM_CHUNK_CHARS, LOCAL_LLM_FIRST_TOKEN_SECONDS, LOCAL_LLM_PROMPT_CHARS_PER_SECOND,
+    LocalProvider
+)
+
+SKILLS = ["python", "sql", "aws", "docker", "kubernetes", "react", "machine learning", "kafka", "git", "java"]
+FILLER = [
+    "We are an equal opportunity employer and value diversity at our company.",
+    "Our benefits include health, dental and vision coverage, plus a generous parental leave policy.",
+    "You will collaborate with product managers, designers and other engineers across time zones.",
+    "We offer flexible working hours and a yearly learning budget.",
+    "Candidates must be authorized to work in the country of employment.",
+    "The team ships small changes frequently and values clear written communication.",
+]
+
+
+def synthetic_jobs(count: int, seed: int = 0):
+    rng = random.Random(seed)
+    jobs = []
+    for i in range(count):
+        mentioned = rng.sample(SKILLS, rng.randint(1, 6))
+        sentences = [f"Hands-on experience with {skill} in production is required." for skill in mentioned]
+        while sum(map(len, sentences)) < rng.randint(5000, 10000):
+            sentences.append(rng.choice(FILLER))
+        rng.shuffle(sentences)
+        job = {
+            "title": f"Engineer {i}",
+            "link": f"https://example.com/jobs/view/{1000 + i}",
+            "company": f"Company {i % 7}",
+            "location": "Remote",
+            "posted_raw": "2 days ago",
+            "posted_date_pdt": "2026-01-01",
+            "description": " ".join(sentences),
+            "source": "linkedin",
+            "page_url": "https://example.com/jobs/search?keywords=Engineer",
+            "keyword": "Software Engineer",
+            "matched_skills": [s for s in mentioned if s in SKILLS[:5]],
+            "match_score": rng.random(),
+            "skill_match_percent": rng.random() * 100,
+            "final_score": rng.random(),
+        }
+        job["combined_text"] = f"{job['title']} {job['description']} {job['company']}"
+        jobs.append(job)
+    return jobs
+
+
+def run_mode(mode: str, jobs, provider: LocalProvider, concurrency: int, compact: bool = True):
+    analyzer = JobAnalyzer("bench", use_llm=True)
+    analyzer.resume_text = "Backend engineer with Python, SQL, AWS and Docker experience. " * 10
+    analyzer.skills = SKILLS[:5]
+    analyzer.llm_provider = provider
+    analyzer.llm_mode = mode
+    analyzer.llm_concurrency = concurrency
+    analyzer.compact_prompts = compact
+    provider.calls = 0
+    entries = []
+    analyzer.on_job_analysis = entries.append
+    with tempfile.TemporaryDirectory() as tmp:
+        analyzer.llm_cache_path = os.path.join(tmp, "llm_cache.db")
+        result = analyzer.analyze_jobs_with_llm(jobs)
+    return {
+        "mode": mode,
+        "compact": compact,
+        "jobs": len(jobs),
+        "prompt_tokens": analyzer.llm_prompt_stats.get("tokens", 0),
+        "max_prompt_tokens": analyzer.llm_prompt_stats.get("max_tokens", 0),
+        "calls": provider.calls,
+        "entries": len(entries),
+        "first_insight_seconds": round(analyzer.llm_timings.get("first_insight", 0.0), 3),
+        "total_seconds": round(analyzer.llm_timings.get("total", 0.0), 3),
+        "fit_score": (result.get("overall_assessment") or {}).get("fit_score"),
+        "error": result.get("error"),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the LLM analysis stage offline")
+    parser.add_argument("--jobs", type=int, default=20)
+    parser.add_argument("--modes", default=",".join(LLM_MODES), help="comma separated LLM modes")
+    parser.add_argument("--concurrency", type=int, default=LLM_CONCURRENCY)
+    parser.add_argument("--first-token", type=float, default=LOCAL_LLM_FIRST_TOKEN_SECONDS,
+                        help="seconds before the first streamed chunk")
+    parser.add_argument("--chars-per-sec", type=float, default=LOCAL_LLM_CHARS_PER_SECOND)
+    parser.add_argument("--prompt-chars-per-sec", type=float, default=LOCAL_LLM_PROMPT_CHARS_PER_SECOND,
+                        help="prompt reading speed; longer prompts delay the first chunk")
+    parser.add_argument("--compact", choices=["off", "on", "both"], default="both", help="prompt compaction")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    provider = LocalProvider(args.first_token, args.chars_per_sec, LOCAL_LLM_CHUNK_CHARS, args.prompt_chars_per_sec)
+    compaction = {"off": [False], "on": [True], "both": [False, True]}[args.compact]
+    jobs = synthetic_jobs(args.jobs)
+
+    results = []
+    print(f"{'mode':<10}{'compact':>8}{'jobs':>6}{'calls':>7}{'tokens':>9}{'max/prompt':>12}"
+          f"{'first insight':>15}{'total':>9}{'fit':>6}")
+    for mode in [m.strip() for m in args.modes.split(",") if m.strip()]:
+        for compact in compaction:
+            result = run_mode(mode, jobs, provider, args.concurrency, compact)
+            results.append(result)
+            print(f"{mode:<10}{'on' if compact else 'off':>8}{result['jobs']:>6}{result['calls']:>7}"
+                  f"{result['prompt_tokens']:>9}{result['max_prompt_tokens']:>12}"
+                  f"{result['first_insight_seconds']:>14.2f}s{result['total_seconds']:>8.2f}s{result['fit_score'] or 0:>6}")
+            if result["error"]:
+                print(f"  error: {result['error']}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Scraper throughput benchmark against the local replay server (no live LinkedIn traffic).
+
+    python bench_scraper.py --synthetic 500 --keyword "Software Engineer"
+    python bench_scraper.py --fixtures fixtures/ --modes bulk,legacy --json bench.json
+    python bench_scraper.py --synthetic 500 --modes bulk,http --latency 0.05
+
+Reports wall time per stage (driver_init, page_load, scroll, see_more, extract, detail),
+pages/sec and cards/sec for each extraction mode, so scraper changes can be compared
+against a reproducible baseline. Mode "http" runs the browserless backend (http_scraper.py)
+instead of Selenium; its pages are card list requests.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import time
+
+# Benchmarks run headless unless told otherwise; must be set before scraper reads its env
+os.environ.setdefault("HEADLESS", "true")
+
+import http_scraper  # noqa: E402
+from detail_fetcher import DetailFetcher  # noqa: E402
+import scraper  # noqa: E402
+from replay import ReplayServer, load_fixtures, synthetic_fixtures  # noqa: E402
+
+from rate_limiter import limiter  # noqa: E402
+
+
+def run_benchmark(server: ReplayServer, keywords, mode: str, max_pages: int, rate: float):
+    """Scrape every keyword once against the replay server and return per-stage metrics."""
+    scraper.job_boards[0] = server.search_url_template
+    scraper.EXTRACT_MODE = mode
+    scraper.MAX_PAGES = max_pages
+    scraper.registry.clear()
+    scraper.reset_stage_metrics()
+    limiter.configure(rate=rate, max_rate=rate, jitter=0.0)
+    started = time.perf_counter()
+    if mode == "http":
+        crawler = http_scraper.HttpScraper(scraper.registry, search_url=server.search_url_template)
+        asyncio.run(crawler.run(list(keywords)))
+    else:
+        # discover mode: descriptions come from the detail pool (never skipping known links here)
+        fetcher = DetailFetcher(search_url=server.search_url_template, skip_known=False) if mode == "discover" else None
+        for kw in keywords:
+            scraper.scrape_keyword(kw, fetcher=fetcher)
+        if fetcher is not None:
+            fetcher.close()
+    wall = time.perf_counter() - started
+    if mode == "http":
+        # one "page" is a card list request; the whole crawl is the extract stage
+        stages = {
+            "list": {"seconds": 0.0, "calls": crawler.stats["list_requests"], "items": crawler.stats["jobs"]},
+            "detail": {"seconds": 0.0, "calls": crawler.stats["detail_requests"], "items": crawler.stats["jobs"]},
+        }
+        pages, cards, extract_s = crawler.stats["list_requests"], crawler.stats["jobs"], wall
+    else:
+        stages = {name: dict(entry) for name, entry in scraper.stage_metrics.items()}
+        pages = stages.get("page_load", {}).get("calls", 0)
+        cards = stages.get("extract", {}).get("items", 0)
+        extract_s = stages.get("extract", {}).get("seconds", 0.0)
+        if fetcher is not None:
+            # worker-seconds, summed over DETAIL_WORKERS threads that overlap the browser stages
+            stages["detail"] = {"seconds": fetcher.stats["seconds"], "calls": fetcher.stats["fetched"] + fetcher.stats["failed"],
+                                "items": fetcher.stats["fetched"]}
+    return {
+        "mode": mode,
+        "keywords": list(keywords),
+        "wall_seconds": round(wall, 3),
+        "pages": pages,
+        "cards": cards,
+        "unique_jobs": len(scraper.registry),
+        "pages_per_sec": round(pages / wall, 3) if wall else 0.0,
+        "cards_per_sec": round(cards / wall, 3) if wall else 0.0,
+        "extract_cards_per_sec": round(cards / extract_s, 3) if extract_s else 0.0,
+        "stages": {name: {k: round(v, 3) if isinstance(v, float) else v for k, v in entry.items()}
+                   for name, entry in stages.items()},
+        "server_requests": dict(server.stats),
+        "rate_limiter": limiter.snapshot(),
+    }
+
+
+def print_result(result):
+    print(f"\n=== mode={result['mode']} ===")
+    print(f"wall: {result['wall_seconds']:.2f}s  pages: {result['pages']}  cards: {result['cards']}  "
+          f"unique: {result['unique_jobs']}")
+    print(f"pages/sec: {result['pages_per_sec']:.3f}  cards/sec: {result['cards_per_sec']:.3f}  "
+          f"(extract stage only: {result['extract_cards_per_sec']:.3f})")
+    rl = result["rate_limiter"]
+    print(f"rate limiter: {rl['acquired']} acquires, {rl['waited_seconds']:.2f}s waited, throttled={rl['throttled']}")
+    print(f"{'stage':<12}{'seconds':>10}{'calls':>8}{'items':>8}")
+    for name, entry in sorted(result["stages"].items(), key=lambda x: -x[1]["seconds"]):
+        print(f"{name:<12}{entry['seconds']:>10.2f}{entry['calls']:>8}{entry['items']:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the scraper against recorded or synthetic fixtures")
+    parser.add_argument("--fixtures", help="directory written by 'replay.py record'")
+    parser.add_argument("--synthetic", type=int, default=200, help="cards per keyword when no fixtures are given")
+    parser.add_argument("--keyword", action="append", default=[])
+    parser.add_argument("--modes", default="discover,bulk", help="comma separated EXTRACT_MODE values, or http")
+    parser.add_argument("--max-pages", type=int, default=1)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every replay response")
+    parser.add_argument("--rate", type=float, default=50.0, help="shared rate limiter cap (requests/sec)")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    if args.fixtures:
+        fixtures = load_fixtures(args.fixtures)
+        keywords = args.keyword or [k for k in fixtures]
+    else:
+        keywords = args.keyword or ["Software Engineer"]
+        fixtures = synthetic_fixtures(keywords, args.synthetic)
+    if not fixtures:
+        parser.error("no fixtures found")
+
+    logging.getLogger().setLevel(logging.WARNING)
+
+    results = []
+    with ReplayServer(fixtures, latency=args.latency) as server:
+        for mode in [m.strip() for m in args.modes.split(",") if m.strip()]:
+            server.stats.clear()
+            result = run_benchmark(server, keywords, mode, args.max_pages, args.rate)
+            print_result(result)
+            results.append(result)
+    scraper.close_driver_pool()
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
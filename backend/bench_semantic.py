@@ -0,0 +1,115 @@
+"""Offline benchmark of sparse TF-IDF vs dense LSA (semantic_index.py) resume matching.
+
+    python bench_semantic.py --jobs 50000
+    python bench_semantic.py --jobs 20000 --dims 64,128,256 --json semantic.json
+
+Builds a JobIndex and a SemanticIndex for a synthetic corpus in a temporary directory,
+then times the query step of each (sparse: transform + sparse dot product over the job
+matrix; dense: projection + mat-vec over the memory-mapped vectors, plus top-k) and
+reports build time, on-disk / in-memory size and how many of the sparse top-k the dense
+top-k recovers.
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import tempfile
+import time
+
+import numpy as np
+
+from job_index import JobIndex
+from semantic_index import SemanticIndex
+
+SKILLS = ["python", "sql", "aws", "docker", "kubernetes", "react", "machine learning", "kafka", "git", "java",
+          "spark", "airflow", "terraform", "typescript", "go", "postgres", "pandas", "tensorflow"]
+WORDS = ("team product build scale service platform data pipeline customer design deliver own "
+         "reliable system api cloud model analytics backend frontend infrastructure mentor").split()
+QUERY = "python sql aws docker machine learning pandas"
+
+
+def synthetic_corpus(count: int, seed: int = 0):
+    rng = random.Random(seed)
+    links, texts = [], []
+    for i in range(count):
+        words = rng.sample(SKILLS, rng.randint(2, 7)) + [rng.choice(WORDS) for _ in range(rng.randint(60, 160))]
+        rng.shuffle(words)
+        links.append(f"https://example.com/jobs/view/{i}")
+        texts.append(f"Engineer {i % 97} " + " ".join(words))
+    return links, texts
+
+
+def _timed(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return result, best
+
+
+def run(links, texts, dims: int, k: int, repeat: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        job_index = JobIndex(os.path.join(tmp, "job_index"))
+        started = time.perf_counter()
+        job_index.fit(links, texts)
+        sparse_build = time.perf_counter() - started
+        semantic = SemanticIndex(os.path.join(tmp, "semantic_index"), dims)
+        started = time.perf_counter()
+        semantic.fit(job_index)
+        dense_build = time.perf_counter() - started
+
+        def sparse_query():
+            scores = (job_index.transform([QUERY]) @ job_index.matrix.T).toarray().ravel()
+            top = np.argpartition(-scores, k - 1)[:k]
+            return top[np.argsort(-scores[top])]
+
+        def dense_query():
+            return semantic.top_k(semantic.embed(job_index, [QUERY])[0], k)[0]
+
+        sparse_top, sparse_seconds = _timed(sparse_query, repeat)
+        dense_top, dense_seconds = _timed(dense_query, repeat)
+        matrix = job_index.matrix
+        return {
+            "jobs": len(links),
+            "dims": semantic.dims,
+            "sparse_build_seconds": round(sparse_build, 3),
+            "dense_build_seconds": round(dense_build, 3),
+            "sparse_query_ms": round(sparse_seconds * 1000, 2),
+            "dense_query_ms": round(dense_seconds * 1000, 2),
+            "sparse_mb": round((matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes) / 2**20, 2),
+            "dense_mb": round(os.path.getsize(os.path.join(semantic.path, "vectors.f32")) / 2**20, 2),
+            "top_k_overlap": len(set(sparse_top) & set(dense_top)) / k,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark sparse vs dense resume matching offline")
+    parser.add_argument("--jobs", type=int, default=20000)
+    parser.add_argument("--dims", default="128", help="comma separated LSA dimensions")
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5, help="query timings keep the best of N runs")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    links, texts = synthetic_corpus(args.jobs)
+    results = []
+    print(f"{'jobs':>8}{'dims':>6}{'build sparse':>14}{'build dense':>13}{'query sparse':>14}"
+          f"{'query dense':>13}{'MB sparse':>11}{'MB dense':>10}{'overlap':>9}")
+    for dims in [int(d) for d in args.dims.split(",") if d.strip()]:
+        r = run(links, texts, dims, args.top_k, args.repeat)
+        results.append(r)
+        print(f"{r['jobs']:>8}{r['dims']:>6}{r['sparse_build_seconds']:>13.2f}s{r['dense_build_seconds']:>12.2f}s"
+              f"{r['sparse_query_ms']:>11.1f}ms{r['dense_query_ms']:>10.1f}ms"
+              f"{r['sparse_mb']:>11.1f}{r['dense_mb']:>10.1f}{r['top_k_overlap']:>9.0%}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Cold-start benchmark for the CLI entry points, based on `python -X importtime`.
+
+    python bench_startup.py                      # main, analyzer, scraper, batch
+    python bench_startup.py --runs 5 --json startup.json --budget-ms 500 main
+
+For each module it reports the median total import time, the median wall time of a
+fresh interpreter running `import <module>`, and the slowest imported packages, so regressions in
+startup cost can be tracked in CI (non-zero exit when a budget is exceeded).
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_MODULES = ["main", "analyzer", "scraper", "batch"]
+
+_LINE = re.compile(r"^import time:\s+(\d+)\s*\|\s*(\d+)\s*\|( *)(\S+)")
+
+
+def import_profile(module: str = None):
+    """Run `import module` in a fresh interpreter. Returns (total_us, {package: cumulative_us}).
+
+    With module=None only interpreter startup (site, .pth hooks) is measured."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}" if module else "pass"],
+        cwd=BASE_DIR, capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+    total = 0
+    cumulative = {}
+    for line in proc.stderr.splitlines():
+        m = _LINE.match(line)
+        if not m:
+            continue
+        cum_us, indent, name = int(m.group(2)), len(m.group(3)), m.group(4)
+        if indent <= 1:  # top-level import
+            total += cum_us
+        top = name.split(".")[0]
+        cumulative[top] = max(cumulative.get(top, 0), cum_us)
+    return total, cumulative
+
+
+def cold_start_ms(module: str) -> float:
+    """Wall time of a fresh interpreter importing the module (interpreter startup included)."""
+    started = time.perf_counter()
+    subprocess.run([sys.executable, "-c", f"import {module}"], cwd=BASE_DIR, capture_output=True)
+    return (time.perf_counter() - started) * 1000
+
+
+def bench_module(module: str, runs: int, top: int, baseline):
+    """baseline is (total_us, packages) from import_profile(None); interpreter startup is subtracted."""
+    base_total, base_packages = baseline
+    totals, walls, packages = [], [], {}
+    for _ in range(runs):
+        total, cumulative = import_profile(module)
+        totals.append(max(0, total - base_total) / 1000)
+        for name, us in cumulative.items():
+            if name not in base_packages:
+                packages.setdefault(name, []).append(us / 1000)
+        walls.append(cold_start_ms(module))
+    slowest = sorted(((statistics.median(v), k) for k, v in packages.items() if k != module), reverse=True)[:top]
+    return {
+        "module": module,
+        "import_ms": round(statistics.median(totals), 1),
+        "cold_start_ms": round(statistics.median(walls), 1),
+        "slowest_imports_ms": {name: round(ms, 1) for ms, name in slowest},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold-start import cost of the entry points")
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=8, help="slowest packages to list per module")
+    parser.add_argument("--budget-ms", type=float, default=0, help="fail if any module's import time exceeds this")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    baseline = import_profile(None)
+    print(f"interpreter startup imports: {baseline[0] / 1000:.1f} ms (excluded below)")
+    results = []
+    for module in args.modules:
+        result = bench_module(module, args.runs, args.top, baseline)
+        results.append(result)
+        print(f"\n{module}: import {result['import_ms']:.1f} ms, cold start {result['cold_start_ms']:.1f} ms")
+        for name, ms in result["slowest_imports_ms"].items():
+            print(f"  {ms:>9.1f} ms  {name}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    over = [r["module"] for r in results if args.budget_ms and r["import_ms"] > args.budget_ms]
+    if over:
+        print(f"\nOver budget ({args.budget_ms:.0f} ms): {', '.join(over)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
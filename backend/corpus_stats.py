@@ -0,0 +1,322 @@
+"""Incrementally maintained skill statistics over the job corpus, stored in the job store.
+
+For every indexed term (lowercase skill) the index keeps, per job, its occurrence count in
+`title + description + company` (the matching text) and in the description alone, plus
+running totals (jobs containing the term, total occurrences) for the whole corpus and per
+keyword and per location. The indexed vocabulary is a fixed list (the analyzer's tracked
+skills): `sync` only counts new or changed postings, backfills terms added to the list once
+and drops terms removed from it, so demand and skill-gap analytics are table lookups and
+the tables do not grow with every resume. Resume-specific terms (NER entities) are counted
+in memory by `count_transient` and never persisted.
+
+    python corpus_stats.py python docker aws
+    python corpus_stats.py --by keyword python docker
+"""
+import argparse
+import hashlib
+import logging
+import sqlite3
+import time
+from collections import defaultdict
+from threading import Lock
+
+from job_store import JOB_STORE_PATH
+
+SCOPES = ("all", "keyword", "location")
+SYNC_CHUNK_ROWS = 5000  # postings counted per pass, bounds memory during (re)indexing
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS term_index_terms (term TEXT PRIMARY KEY) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS term_index_jobs (
+    link TEXT PRIMARY KEY,
+    digest TEXT NOT NULL,
+    keyword TEXT NOT NULL,
+    location TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS job_terms (
+    link TEXT NOT NULL,
+    term TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    desc_count INTEGER NOT NULL,
+    PRIMARY KEY (link, term)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS term_stats (
+    scope TEXT NOT NULL,
+    value TEXT NOT NULL,
+    term TEXT NOT NULL,
+    df INTEGER NOT NULL,
+    tc INTEGER NOT NULL,
+    desc_tc INTEGER NOT NULL,
+    PRIMARY KEY (scope, value, term)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS scope_jobs (
+    scope TEXT NOT NULL,
+    value TEXT NOT NULL,
+    jobs INTEGER NOT NULL,
+    PRIMARY KEY (scope, value)
+) WITHOUT ROWID;
+"""
+
+_ADD_STATS = """
+INSERT INTO term_stats (scope, value, term, df, tc, desc_tc) VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT(scope, value, term) DO UPDATE SET
+    df = df + excluded.df, tc = tc + excluded.tc, desc_tc = desc_tc + excluded.desc_tc
+"""
+_ADD_JOBS = """
+INSERT INTO scope_jobs (scope, value, jobs) VALUES (?, ?, ?)
+ON CONFLICT(scope, value) DO UPDATE SET jobs = jobs + excluded.jobs
+"""
+
+
+def _digest(*parts) -> str:
+    return hashlib.blake2b("\x1f".join(parts).encode("utf-8"), digest_size=8).hexdigest()
+
+
+def _text(value) -> str:
+    return value if isinstance(value, str) else ""
+
+
+def _scopes(keyword: str, location: str):
+    return (("all", ""), ("keyword", keyword), ("location", location))
+
+
+def _normalize_terms(terms):
+    return list(dict.fromkeys(t.strip().lower() for t in terms if t and t.strip()))
+
+
+def _columns(df):
+    """link, title, description, company, keyword and location lists of a corpus DataFrame chunk."""
+    return [df["link"].tolist()] + [df[c].map(_text).tolist()
+                                    for c in ("title", "description", "company", "keyword", "location")]
+
+
+def _count(matcher, columns, rows):
+    """(row, term, count in the matching text, count in the description) for every term found."""
+    _, titles, descriptions, companies = columns[:4]
+    combined = matcher.count_matrix([f"{titles[i]} {descriptions[i]} {companies[i]}" for i in rows]).tocoo()
+    described = matcher.count_matrix([descriptions[i] for i in rows]).todok()
+    for r, c, n in zip(combined.row, combined.col, combined.data):
+        yield rows[r], matcher.skills[c], int(n), int(described.get((r, c), 0))
+
+
+class CorpusStats:
+    """Per-term document frequency and occurrence totals, overall and per keyword / location."""
+
+    def __init__(self, path: str = None):
+        self.path = path or JOB_STORE_PATH
+        self._lock = Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._transient_terms = set()
+        self._transient = {}        # (scope, value, term) -> [df, tc, desc_tc] of count_transient terms
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # -- maintenance -------------------------------------------------------
+
+    def terms(self) -> set:
+        with self._lock:
+            return {row[0] for row in self._conn.execute("SELECT term FROM term_index_terms")}
+
+    def sync(self, corpus, terms=()) -> "CorpusStats":
+        """Bring the index in line with the corpus and make `terms` exactly the indexed vocabulary.
+
+        `corpus` is an iterable of DataFrame chunks (link, title, description, company, keyword,
+        location), e.g. analyzer.JobCorpus; postings are counted one chunk at a time."""
+        from skill_matcher import SkillMatcher
+
+        started = time.perf_counter()
+        indexed = self.terms()
+        wanted = set(_normalize_terms(terms))
+        new_terms = sorted(wanted - indexed)
+        dropped = sorted(indexed - wanted)
+        all_terms = sorted(wanted)
+        with self._lock:
+            state = {link: (digest, kw, loc) for link, digest, kw, loc in
+                     self._conn.execute("SELECT link, digest, keyword, location FROM term_index_jobs")}
+
+        stat_delta = defaultdict(lambda: [0, 0, 0])
+        job_delta = defaultdict(int)
+        entries = []
+        indexed_jobs = []           # (link, digest, keyword, location) of new and changed postings
+        current = set()
+        every_term = SkillMatcher(all_terms) if all_terms else None
+        only_new = SkillMatcher(new_terms) if new_terms else None
+
+        # Read and count first, outside any write transaction: the store is shared with a
+        # running crawl's JobWriter, which must never wait out its busy timeout on this sync.
+        for chunk in corpus:
+            columns = _columns(chunk)
+            links, titles, descriptions, companies, keywords, locations = columns
+            digests = [_digest(*row) for row in zip(titles, descriptions, companies, keywords, locations)]
+            current.update(links)
+            changed = [i for i, link in enumerate(links) if state.get(link, (None,))[0] != digests[i]]
+            unchanged = [i for i, link in enumerate(links) if link in state and state[link][0] == digests[i]]
+            # new and changed postings: every term; unchanged ones: only the new terms
+            for rows, matcher in ((changed, every_term), (unchanged, only_new)):
+                if not rows or matcher is None:
+                    continue
+                for start in range(0, len(rows), SYNC_CHUNK_ROWS):
+                    for i, term, n, d in _count(matcher, columns, rows[start:start + SYNC_CHUNK_ROWS]):
+                        entries.append((links[i], term, n, d))
+                        for scope in _scopes(keywords[i], locations[i]):
+                            delta = stat_delta[scope + (term,)]
+                            delta[0] += 1
+                            delta[1] += n
+                            delta[2] += d
+            for i in changed:
+                indexed_jobs.append((links[i], digests[i], keywords[i], locations[i]))
+                for scope in _scopes(keywords[i], locations[i]):
+                    job_delta[scope] += 1
+
+        stale = [link for link in state if link not in current]
+        if not (stale or indexed_jobs or new_terms or dropped):
+            return self
+
+        # take out what stale and changed postings contributed last time
+        removed = stale + [job[0] for job in indexed_jobs if job[0] in state]
+        dropped_set = set(dropped)
+        with self._lock:
+            for start in range(0, len(removed), 500):
+                chunk = removed[start:start + 500]
+                marks = ", ".join("?" for _ in chunk)
+                for link, term, n, d in self._conn.execute(
+                        f"SELECT link, term, count, desc_count FROM job_terms WHERE link IN ({marks})", chunk):
+                    if term in dropped_set:
+                        continue  # its rows are deleted below anyway
+                    for scope in _scopes(*state[link][1:]):
+                        delta = stat_delta[scope + (term,)]
+                        delta[0] -= 1
+                        delta[1] -= n
+                        delta[2] -= d
+        for link in removed:
+            for scope in _scopes(*state[link][1:]):
+                job_delta[scope] -= 1
+
+        # then apply everything in one short write transaction
+        with self._lock, self._conn:
+            # terms no longer tracked leave the index entirely
+            for start in range(0, len(dropped), 500):
+                chunk = dropped[start:start + 500]
+                marks = ", ".join("?" for _ in chunk)
+                for table in ("job_terms", "term_stats", "term_index_terms"):
+                    self._conn.execute(f"DELETE FROM {table} WHERE term IN ({marks})", chunk)
+            for start in range(0, len(removed), 500):
+                chunk = removed[start:start + 500]
+                marks = ", ".join("?" for _ in chunk)
+                self._conn.execute(f"DELETE FROM job_terms WHERE link IN ({marks})", chunk)
+                self._conn.execute(f"DELETE FROM term_index_jobs WHERE link IN ({marks})", chunk)
+            self._conn.executemany("INSERT INTO job_terms VALUES (?, ?, ?, ?)", entries)
+            self._conn.executemany("INSERT INTO term_index_jobs VALUES (?, ?, ?, ?)", indexed_jobs)
+            self._conn.executemany("INSERT INTO term_index_terms VALUES (?)", [(t,) for t in new_terms])
+            self._conn.executemany(_ADD_STATS, [key + tuple(v) for key, v in stat_delta.items() if any(v)])
+            self._conn.executemany(_ADD_JOBS, [key + (n,) for key, n in job_delta.items() if n])
+            self._conn.execute("DELETE FROM term_stats WHERE df <= 0")
+            self._conn.execute("DELETE FROM scope_jobs WHERE jobs <= 0")
+        logging.info("Corpus stats: %d postings (re)counted, %d removed, %d new terms, %d dropped in %.2fs",
+                     len(indexed_jobs), len(stale), len(new_terms), len(dropped), time.perf_counter() - started)
+        return self
+
+    def count_transient(self, corpus, terms) -> "CorpusStats":
+        """Count the `terms` that are not indexed over the corpus chunks in memory, so lookups
+        cover them until the next call. Nothing is written to the store."""
+        from skill_matcher import SkillMatcher
+
+        terms = sorted(set(_normalize_terms(terms)) - self.terms())
+        stats = defaultdict(lambda: [0, 0, 0])
+        if terms:
+            started = time.perf_counter()
+            matcher = SkillMatcher(terms)
+            for chunk in corpus:
+                columns = _columns(chunk)
+                keywords, locations = columns[4:]
+                for start in range(0, len(chunk), SYNC_CHUNK_ROWS):
+                    rows = range(start, min(start + SYNC_CHUNK_ROWS, len(chunk)))
+                    for i, term, n, d in _count(matcher, columns, rows):
+                        for scope in _scopes(keywords[i], locations[i]):
+                            total = stats[scope + (term,)]
+                            total[0] += 1
+                            total[1] += n
+                            total[2] += d
+            logging.info("Corpus stats: %d untracked terms counted in memory in %.2fs",
+                         len(terms), time.perf_counter() - started)
+        self._transient_terms = set(terms)
+        self._transient = dict(stats)
+        return self
+
+    # -- lookups -----------------------------------------------------------
+
+    def term_stats(self, terms, scope: str = "all", value: str = "") -> dict:
+        """{term: {"df", "tc", "desc_tc"}} for the given (lowercased) terms; zeros when absent."""
+        terms = _normalize_terms(terms)
+        stats = {t: {"df": 0, "tc": 0, "desc_tc": 0} for t in terms}
+        for term in self._transient_terms.intersection(terms):
+            df, tc, desc_tc = self._transient.get((scope, value, term), (0, 0, 0))
+            stats[term] = {"df": df, "tc": tc, "desc_tc": desc_tc}
+        with self._lock:
+            for start in range(0, len(terms), 500):
+                chunk = terms[start:start + 500]
+                rows = self._conn.execute(
+                    f"SELECT term, df, tc, desc_tc FROM term_stats WHERE scope = ? AND value = ? "
+                    f"AND term IN ({', '.join('?' for _ in chunk)})", (scope, value, *chunk)
+                )
+                for term, df, tc, desc_tc in rows:
+                    stats[term] = {"df": df, "tc": tc, "desc_tc": desc_tc}
+        return stats
+
+    def job_count(self, scope: str = "all", value: str = "") -> int:
+        with self._lock:
+            row = self._conn.execute("SELECT jobs FROM scope_jobs WHERE scope = ? AND value = ?",
+                                     (scope, value)).fetchone()
+        return row[0] if row else 0
+
+    def breakdown(self, terms, by: str = "keyword", limit: int = 0) -> dict:
+        """{keyword or location: {"jobs": n, "skills": {term: df}}}, largest groups first."""
+        if by not in SCOPES[1:]:
+            raise ValueError(f"Unknown breakdown {by!r}; expected keyword or location")
+        terms = _normalize_terms(terms)
+        with self._lock:
+            groups = self._conn.execute(
+                "SELECT value, jobs FROM scope_jobs WHERE scope = ? AND value != '' ORDER BY jobs DESC"
+                + (" LIMIT ?" if limit else ""), (by, limit) if limit else (by,)
+            ).fetchall()
+        out = {}
+        for value, jobs in groups:
+            stats = self.term_stats(terms, by, value)
+            out[value] = {"jobs": jobs, "skills": {t: stats[t]["df"] for t in terms}}
+        return out
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format='[%(levelname)s] %(message)s')
+    parser = argparse.ArgumentParser(description="Query indexed skill statistics of the job store")
+    parser.add_argument("terms", nargs="*", help="defaults to every indexed term")
+    parser.add_argument("--by", choices=SCOPES[1:], help="break down per keyword or location")
+    parser.add_argument("--limit", type=int, default=10, help="groups shown with --by")
+    parser.add_argument("--path", default=None, help="job store (defaults to JOB_STORE_PATH)")
+    args = parser.parse_args()
+
+    with CorpusStats(args.path) as stats:
+        terms = args.terms or sorted(stats.terms())
+        if args.by:
+            for value, group in stats.breakdown(terms, args.by, args.limit).items():
+                counts = ", ".join(f"{t}={n}" for t, n in group["skills"].items() if n)
+                print(f"{value} ({group['jobs']} jobs): {counts or '-'}")
+            return
+        total = stats.job_count()
+        print(f"{total} indexed jobs")
+        for term, s in sorted(stats.term_stats(terms).items(), key=lambda x: -x[1]["df"]):
+            print(f"{term:<24}{s['df']:>8} jobs{s['tc']:>10} mentions")
+
+
+if __name__ == "__main__":
+    main()
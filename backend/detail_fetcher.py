@@ -0,0 +1,123 @@
+"""Phase two of the crawl: fetch job descriptions for discovered cards on a worker pool.
+
+Discovery (phase one) only reads card metadata and links. Discovered jobs are submitted
+here; links already stored with a description skip the fetch entirely (they are written
+with an empty description, which the store's upsert never lets overwrite the stored
+one), and the rest are fetched from the guest jobPosting endpoint by DETAIL_WORKERS
+threads sharing one keep-alive HTTP client. Finished records go to the JobWriter.
+"""
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+
+from http_scraper import (
+    HTTP_RETRIES, HTTP_TIMEOUT, HTTP_USER_AGENT, MISSING_DESCRIPTION, SKIP_KNOWN_LINKS, guest_endpoints, parse_description
+)
+from job_pipeline import canonical_link
+from job_records import job_id_from_link
+from job_store import open_store
+from rate_limiter import limiter, looks_blocked
+from scraper_config import job_boards
+
+DETAIL_WORKERS = int(os.getenv("DETAIL_WORKERS", "8"))
+
+
+class DetailFetcher:
+    """Worker pool that completes discovered job records and hands them to `writer`."""
+
+    def __init__(self, writer=None, workers: int = DETAIL_WORKERS, search_url: str = None,
+                 store_path: str = None, skip_known: bool = SKIP_KNOWN_LINKS):
+        import httpx  # optional dependency, shared with the HTTP backend
+        self.writer = writer
+        self.workers = max(1, workers)
+        _, self.detail_url, _ = guest_endpoints(search_url or job_boards[0])
+        self._store = open_store(store_path) if skip_known else None
+        self._client = httpx.Client(
+            timeout=HTTP_TIMEOUT, follow_redirects=True, headers={"User-Agent": HTTP_USER_AGENT},
+            limits=httpx.Limits(max_connections=self.workers, max_keepalive_connections=self.workers)
+        )
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="detail")
+        self._pending = set()  # in-flight futures only, so memory doesn't grow with the crawl
+        self._lock = Lock()
+        self.stats = {"submitted": 0, "known": 0, "fetched": 0, "failed": 0, "seconds": 0.0}
+
+    def _count(self, key: str, value=1):
+        with self._lock:
+            self.stats[key] += value
+
+    def _emit(self, job):
+        if self.writer is not None:
+            self.writer.put(job)
+
+    def submit(self, jobs):
+        """Queue discovered jobs (dicts with an empty description). Returns immediately."""
+        jobs = list(jobs)
+        if not jobs:
+            return
+        self._count("submitted", len(jobs))
+        known = self._store.known_links(canonical_link(j["link"]) for j in jobs) if self._store else set()
+        for job in jobs:
+            if canonical_link(job["link"]) in known:
+                self._count("known")
+                self._emit(job)
+            else:
+                future = self._executor.submit(self._fetch, job)
+                with self._lock:
+                    self._pending.add(future)
+                future.add_done_callback(self._done)
+
+    def _done(self, future):
+        with self._lock:
+            self._pending.discard(future)
+
+    def _fetch(self, job):
+        job_id = job.get("job_id") or job_id_from_link(job["link"])
+        description = ""
+        started = time.perf_counter()
+        for _ in range((1 + HTTP_RETRIES) if job_id else 0):
+            limiter.acquire()
+            try:
+                resp = self._client.get(self.detail_url + job_id)
+            except Exception as e:
+                logging.debug("Detail %s failed: %s", job_id, e)
+                break
+            blocked = looks_blocked(str(resp.url), resp.status_code)
+            if blocked:
+                limiter.throttled(blocked)
+                if blocked == "http_429":
+                    continue
+            elif resp.status_code == 200:
+                limiter.success()
+                description = parse_description(resp.text)
+                break
+            logging.debug("Detail %s -> HTTP %d", job_id, resp.status_code)
+            break
+        self._count("seconds", time.perf_counter() - started)
+        self._count("fetched" if description else "failed")
+        job.pop("job_id", None)
+        job["description"] = description or MISSING_DESCRIPTION
+        self._emit(job)
+
+    def wait(self):
+        """Block until every submitted fetch has finished."""
+        with self._lock:
+            futures = list(self._pending)
+        for future in futures:
+            future.result()
+
+    def close(self):
+        self.wait()
+        self._executor.shutdown(wait=True)
+        self._client.close()
+        if self._store is not None:
+            self._store.close()
+        logging.info("Detail fetcher closed (%s)",
+                     ", ".join(f"{k}={round(v, 2) if isinstance(v, float) else v}" for k, v in self.stats.items()))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,113 @@
+"""Pool of warm browser sessions shared across keywords (and runs in the same process).
+
+Launching undetected-chromedriver costs seconds, so keywords borrow an existing session
+instead of starting a cold browser each. Sessions are health-checked when borrowed and
+recycled after DRIVER_MAX_PAGES page loads to keep memory and fingerprint state bounded.
+"""
+import logging
+import os
+import queue
+import threading
+
+DRIVER_POOL_SIZE = int(os.getenv("DRIVER_POOL_SIZE", "0"))  # 0 = match keyword concurrency
+DRIVER_MAX_PAGES = int(os.getenv("DRIVER_MAX_PAGES", "25"))  # recycle a session after this many pages (0 = never)
+
+
+class DriverPool:
+    """Thread-safe pool of at most `size` live drivers created by `factory()`."""
+
+    def __init__(self, factory, size: int = 1, max_pages: int = DRIVER_MAX_PAGES):
+        self.factory = factory
+        self.size = max(1, size)
+        self.max_pages = max_pages
+        self._idle = queue.LifoQueue()  # most recently used first: warmest caches
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._pages = {}
+        self._lock = threading.Lock()
+        self.stats = {"launched": 0, "reused": 0, "recycled": 0, "unhealthy": 0}
+
+    def _count(self, key: str):
+        with self._lock:
+            self.stats[key] += 1
+
+    @staticmethod
+    def _healthy(driver) -> bool:
+        try:
+            return driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def _launch(self):
+        driver = self.factory()
+        if driver is not None:
+            with self._lock:
+                self._pages[id(driver)] = 0
+            self._count("launched")
+        return driver
+
+    def _discard(self, driver):
+        with self._lock:
+            self._pages.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def acquire(self):
+        """Borrow a healthy driver (blocks while `size` drivers are in use). Returns None if launch fails."""
+        self._slots.acquire()
+        try:
+            while True:
+                try:
+                    driver = self._idle.get_nowait()
+                except queue.Empty:
+                    break
+                if self._healthy(driver):
+                    self._count("reused")
+                    return driver
+                self._count("unhealthy")
+                self._discard(driver)
+            driver = self._launch()
+        except Exception:
+            self._slots.release()
+            raise
+        if driver is None:
+            self._slots.release()
+        return driver
+
+    def release(self, driver):
+        """Return a borrowed driver; sessions past the page budget are quit instead of pooled."""
+        if driver is None:
+            return
+        with self._lock:
+            pages = self._pages.get(id(driver), 0)
+        if self.max_pages and pages >= self.max_pages:
+            self._count("recycled")
+            self._discard(driver)
+        else:
+            self._idle.put(driver)
+        self._slots.release()
+
+    def checkpoint(self, driver):
+        """Count one page load; swap in a fresh session once the page budget is used up."""
+        with self._lock:
+            self._pages[id(driver)] = pages = self._pages.get(id(driver), 0) + 1
+        if not self.max_pages or pages < self.max_pages:
+            return driver
+        self._count("recycled")
+        self._discard(driver)
+        fresh = self._launch()
+        if fresh is None:
+            # keep the slot accounting consistent: caller treats None as "stop"
+            self._slots.release()
+        return fresh
+
+    def close(self):
+        """Quit every idle driver. The pool stays usable and relaunches on demand."""
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(driver)
+        logging.info("Driver pool closed (%s)", ", ".join(f"{k}={v}" for k, v in self.stats.items()))
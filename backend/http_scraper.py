@@ -0,0 +1,256 @@
+"""Browserless scraping backend: LinkedIn's public guest endpoints over pooled async HTTP.
+
+The search cards and job descriptions the Selenium path reads are static HTML served by
+
+  /jobs-guest/jobs/api/seeMoreJobPostings/search?keywords=..&start=N   card list fragments
+  /jobs-guest/jobs/api/jobPosting/<job_id>                             description pane
+
+so this backend fetches them with one shared httpx.AsyncClient (keep-alive connection pool),
+at most HTTP_CONCURRENCY requests in flight and paced by the shared rate limiter, and parses
+them with lxml. Records use the same
+schema as scraper.py and flow through the same JobRegistry / JobWriter.
+
+    SCRAPE_BACKEND=http python scraper.py
+    python http_scraper.py --keyword "Software Engineer"   # no selenium import at all
+
+Point JOB_SEARCH_URL at a replay.py server to run it offline.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from job_pipeline import JobWriter, canonical_link
+from job_records import build_job_record, job_id_from_link
+from job_registry import JobRegistry
+from job_store import open_store
+from rate_limiter import limiter, looks_blocked
+from scraper_config import job_boards, keywords
+
+HTTP_CONCURRENCY = int(os.getenv("HTTP_CONCURRENCY", "16"))  # requests in flight across all keywords
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "15"))
+HTTP_MAX_PAGES = int(os.getenv("HTTP_MAX_PAGES", "40"))  # card list requests per keyword
+HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", "2"))  # extra attempts after a 429
+TARGET_JOBS_PER_KEYWORD = int(os.getenv("TARGET_JOBS_PER_KEYWORD", "5000"))
+# Skip the description request for links already stored with one (daily recrawls)
+SKIP_KNOWN_LINKS = os.getenv("SKIP_KNOWN_LINKS", "true").lower() in ("1", "true", "yes")
+HTTP_USER_AGENT = os.getenv(
+    "HTTP_USER_AGENT",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/124.0 Safari/537.36"
+)
+
+# httpx logs every request at INFO
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+LIST_PATH = "/jobs-guest/jobs/api/seeMoreJobPostings/search"
+DETAIL_PATH = "/jobs-guest/jobs/api/jobPosting/"
+MISSING_DESCRIPTION = "Description not available"
+
+# Query parameters of the search page URL that don't apply to the list endpoint
+_SEARCH_ONLY_PARAMS = {"keywords", "start", "pageNum", "position", "trk"}
+
+
+def _has_class(name: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+_CARD_XPATH = f"//div[{_has_class('base-card')}]"
+_DESCRIPTION_XPATH = f"//div[{_has_class('show-more-less-html__markup')}]"
+
+
+def _text(node, xpath: str) -> str:
+    return " ".join(node.xpath(f"string({xpath})").split())
+
+
+def parse_cards(html: str):
+    """[{job_id, title, link, company, location, posted}] for every card in a list fragment."""
+    import lxml.html
+    if not html or not html.strip():
+        return []
+    root = lxml.html.fromstring(f"<ul>{html}</ul>")
+    cards = []
+    for card in root.xpath(_CARD_XPATH):
+        links = card.xpath(f".//a[{_has_class('base-card__full-link')}]/@href")
+        link = links[0].strip() if links else ""
+        urn = card.get("data-entity-urn") or ""
+        cards.append({
+            "job_id": urn.rsplit(":", 1)[-1] if urn else job_id_from_link(link),
+            "title": _text(card, f".//h3[{_has_class('base-search-card__title')}]"),
+            "link": link,
+            "company": _text(card, f".//h4[{_has_class('base-search-card__subtitle')}]"),
+            "location": _text(card, f".//span[{_has_class('job-search-card__location')}]"),
+            "posted": _text(card, ".//time"),
+        })
+    return cards
+
+
+def parse_description(html: str) -> str:
+    """Plain text of the description pane in a jobPosting fragment ('' when absent)."""
+    import lxml.html
+    if not html or not html.strip():
+        return ""
+    nodes = lxml.html.fromstring(html).xpath(_DESCRIPTION_XPATH)
+    return " ".join(nodes[0].text_content().split()) if nodes else ""
+
+
+def guest_endpoints(search_url: str):
+    """(list_url_prefix, detail_url_prefix, extra list params) derived from a job_boards search URL."""
+    parts = urlsplit(search_url)
+    base = f"{parts.scheme}://{parts.netloc}"
+    extra = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+             if k not in _SEARCH_ONLY_PARAMS and "{" not in v]
+    return base + LIST_PATH, base + DETAIL_PATH, extra
+
+
+class HttpScraper:
+    """Crawl keywords concurrently over one pooled async client."""
+
+    def __init__(self, registry=None, writer=None, search_url: str = None,
+                 concurrency: int = HTTP_CONCURRENCY, max_pages: int = HTTP_MAX_PAGES, store=None):
+        self.registry = registry
+        self.store = store  # JobStore: links already stored with a description skip the detail request
+        self.writer = writer
+        self.list_url, self.detail_url, self.extra_params = guest_endpoints(search_url or job_boards[0])
+        self.concurrency = max(1, concurrency)
+        self.max_pages = max_pages
+        self.stats = {"list_requests": 0, "detail_requests": 0, "known": 0, "errors": 0, "jobs": 0}
+        self._client = None
+        self._slots = None
+
+    async def _get(self, url: str, params=None) -> str:
+        for attempt in range(1 + HTTP_RETRIES):
+            async with self._slots:
+                await limiter.acquire_async()  # after a throttle this also waits out the cooldown
+                try:
+                    resp = await self._client.get(url, params=params)
+                except Exception as e:
+                    self.stats["errors"] += 1
+                    logging.debug("GET %s failed: %s", url, e)
+                    return ""
+            blocked = looks_blocked(str(resp.url), resp.status_code)
+            if blocked:
+                limiter.throttled(blocked)
+                if blocked == "http_429":
+                    continue
+            elif resp.status_code == 200:
+                limiter.success()
+                return resp.text
+            break
+        self.stats["errors"] += 1
+        logging.debug("GET %s -> HTTP %d", resp.url, resp.status_code)
+        return ""
+
+    async def _detail(self, card, keyword: str, page_url: str, known: bool = False):
+        if known:
+            # empty description: the store keeps the one it already has
+            self.stats["known"] += 1
+            return build_job_record(card["title"], card["link"], card["company"], card["location"],
+                                    card["posted"], "", page_url, keyword)
+        description = ""
+        if card["job_id"]:
+            self.stats["detail_requests"] += 1
+            description = parse_description(await self._get(self.detail_url + card["job_id"]))
+        return build_job_record(card["title"], card["link"], card["company"], card["location"], card["posted"],
+                                description or MISSING_DESCRIPTION, page_url, keyword)
+
+    def _accept(self, job) -> bool:
+        if self.registry is not None and not self.registry.add(job):
+            return False
+        if self.writer is not None:
+            self.writer.put(job)
+        return True
+
+    async def _list_page(self, keyword: str, start: int):
+        params = [("keywords", keyword), *self.extra_params, ("start", str(start))]
+        self.stats["list_requests"] += 1
+        cards = parse_cards(await self._get(self.list_url, params))
+        if not cards and start == 0:
+            limiter.throttled("empty")  # a keyword's first page is only empty when the list is withheld
+        return f"{self.list_url}?{urlencode(params)}", [c for c in cards if c["title"]]
+
+    async def scrape_keyword(self, keyword: str) -> int:
+        """Page through the card list for one keyword; descriptions are fetched concurrently."""
+        added = 0
+        start = 0
+        pending = asyncio.ensure_future(self._list_page(keyword, start))
+        try:
+            for page in range(self.max_pages):
+                page_url, cards = await pending
+                pending = None
+                if not cards:
+                    break
+                start += len(cards)
+                # prefetch the next card list while this page's descriptions download
+                if page + 1 < self.max_pages:
+                    pending = asyncio.ensure_future(self._list_page(keyword, start))
+                fresh = [c for c in cards if self.registry is None or c["link"] not in self.registry]
+                known = self.store.known_links(canonical_link(c["link"]) for c in fresh) if self.store else set()
+                jobs = await asyncio.gather(*(self._detail(c, keyword, page_url, canonical_link(c["link"]) in known)
+                                              for c in fresh))
+                page_new = sum(self._accept(job) for job in jobs)
+                added += page_new
+                kw_total = self.registry.keyword_count(keyword) if self.registry is not None else added
+                if TARGET_JOBS_PER_KEYWORD and kw_total >= TARGET_JOBS_PER_KEYWORD:
+                    break
+                if page_new == 0 and kw_total > 0:
+                    break
+        finally:
+            if pending is not None:
+                pending.cancel()
+        self.stats["jobs"] += added
+        logging.info("[KW=%s] HTTP backend collected %d new jobs", keyword, added)
+        return added
+
+    async def run(self, run_keywords):
+        import httpx  # optional dependency, only needed for this backend
+        limits = httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency)
+        self._slots = asyncio.Semaphore(self.concurrency)
+        async with httpx.AsyncClient(limits=limits, timeout=HTTP_TIMEOUT, follow_redirects=True,
+                                     headers={"User-Agent": HTTP_USER_AGENT}) as client:
+            self._client = client
+            counts = await asyncio.gather(*(self.scrape_keyword(kw) for kw in run_keywords))
+        self._client = None
+        return dict(zip(run_keywords, counts))
+
+
+def scrape_keywords(run_keywords, registry=None, writer=None, search_url: str = None,
+                    concurrency: int = HTTP_CONCURRENCY, max_pages: int = HTTP_MAX_PAGES,
+                    skip_known: bool = SKIP_KNOWN_LINKS, store_path: str = None):
+    """Synchronous entry point used by scraper.get_csv_file. Returns {keyword: new jobs}."""
+    store = open_store(store_path) if skip_known else None
+    crawler = HttpScraper(registry, writer, search_url, concurrency, max_pages, store)
+    started = time.perf_counter()
+    try:
+        counts = asyncio.run(crawler.run(list(run_keywords)))
+    finally:
+        if store is not None:
+            store.close()
+    elapsed = time.perf_counter() - started
+    logging.info("HTTP backend: %d jobs in %.1fs (%.1f jobs/sec; %s)", crawler.stats["jobs"], elapsed,
+                 crawler.stats["jobs"] / elapsed if elapsed > 0 else 0.0,
+                 ", ".join(f"{k}={v}" for k, v in crawler.stats.items()))
+    return counts
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format='[%(levelname)s] %(message)s')
+    parser = argparse.ArgumentParser(description="Scrape job listings over HTTP without a browser")
+    parser.add_argument("--keyword", action="append", default=[], help="defaults to scraper_config.keywords")
+    parser.add_argument("--concurrency", type=int, default=HTTP_CONCURRENCY)
+    parser.add_argument("--max-pages", type=int, default=HTTP_MAX_PAGES)
+    parser.add_argument("--refetch", action="store_true", help="fetch descriptions even for stored links")
+    args = parser.parse_args()
+
+    writer = JobWriter().start()
+    try:
+        scrape_keywords(args.keyword or keywords, JobRegistry(), writer,
+                        concurrency=args.concurrency, max_pages=args.max_pages, skip_known=not args.refetch)
+    finally:
+        print(f"Wrote {writer.close()} jobs to the job store")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""Persisted TF-IDF index over the job corpus.
+
+The vectorizer (vocabulary + IDF weights) is fitted once and saved together with the
+L2-normalized sparse job matrix. New or changed postings are transformed with the stored
+vocabulary and appended; the index is only refitted when the corpus has grown by more
+than JOB_INDEX_REFIT_RATIO since the last fit. Matching a resume is then one
+`transform` plus one sparse dot product.
+"""
+import hashlib
+import json
+import logging
+import os
+import time
+
+import joblib
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+BASE_DIR = os.path.dirname(__file__)
+JOB_INDEX_DIR = os.getenv("JOB_INDEX_DIR", os.path.join(BASE_DIR, "job_index"))
+JOB_INDEX_REFIT_RATIO = float(os.getenv("JOB_INDEX_REFIT_RATIO", "0.5"))
+
+# Bump when vectorizer settings change so stale indexes are rebuilt instead of reused
+INDEX_VERSION = 1
+VECTORIZER_PARAMS = dict(
+    lowercase=True,
+    stop_words='english',
+    ngram_range=(1, 2),
+    max_features=5000
+)
+
+
+def _digest(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def _fit_id(vectorizer) -> str:
+    """Digest of the fitted vocabulary and IDF weights, i.e. of the matrix column space."""
+    h = hashlib.blake2b(digest_size=8)
+    h.update(json.dumps(sorted((term, int(col)) for term, col in vectorizer.vocabulary_.items())).encode("utf-8"))
+    h.update(np.asarray(vectorizer.idf_, dtype=np.float64).tobytes())
+    return h.hexdigest()
+
+
+class JobIndex:
+    """TF-IDF vectors for every job, addressable by link."""
+
+    def __init__(self, path: str = None):
+        self.path = path or JOB_INDEX_DIR
+        self.vectorizer = None
+        self.matrix = None          # csr_matrix, one L2-normalized row per job
+        self.links = []
+        self.digests = []
+        self.fitted_docs = 0
+        self.fit_id = None          # changes whenever the vectorizer is (re)fitted
+        self._row = {}
+
+    # -- persistence -------------------------------------------------------
+
+    def _file(self, name):
+        return os.path.join(self.path, name)
+
+    def load(self) -> bool:
+        """Load a saved index. Returns False if none exists or it was built with other settings."""
+        try:
+            with open(self._file("meta.json")) as f:
+                meta = json.load(f)
+            if meta.get("version") != INDEX_VERSION:
+                logging.info("Job index version changed; rebuilding")
+                return False
+            self.vectorizer = joblib.load(self._file("vectorizer.joblib"))
+            self.matrix = sp.load_npz(self._file("matrix.npz")).tocsr()
+        except (OSError, ValueError) as e:
+            logging.debug(f"No usable job index at {self.path}: {e}")
+            return False
+        self.links = meta["links"]
+        self.digests = meta["digests"]
+        self.fitted_docs = meta["fitted_docs"]
+        self.fit_id = meta.get("fit_id") or _fit_id(self.vectorizer)
+        self._row = {link: i for i, link in enumerate(self.links)}
+        return True
+
+    def save(self):
+        os.makedirs(self.path, exist_ok=True)
+        if hasattr(self.vectorizer, "stop_words_"):
+            # only needed while fitting and dominates the pickle size
+            self.vectorizer.stop_words_ = None
+        tmp = self._file("vectorizer.tmp.joblib")
+        joblib.dump(self.vectorizer, tmp)
+        os.replace(tmp, self._file("vectorizer.joblib"))
+        tmp = self._file("matrix.tmp.npz")
+        sp.save_npz(tmp, self.matrix)
+        os.replace(tmp, self._file("matrix.npz"))
+        tmp = self._file("meta.json.tmp")
+        with open(tmp, "w") as f:
+            json.dump({
+                "version": INDEX_VERSION,
+                "fitted_docs": self.fitted_docs,
+                "fit_id": self.fit_id,
+                "links": self.links,
+                "digests": self.digests
+            }, f)
+        os.replace(tmp, self._file("meta.json"))
+
+    # -- building ----------------------------------------------------------
+
+    def fit(self, links, texts):
+        """Fit vocabulary/IDF on the full corpus and vectorize every job."""
+        self._fit([(links, texts)])
+
+    def _fit(self, chunks):
+        """Fit on (links, texts) chunks in one streaming pass: only the current chunk's texts are held."""
+        started = time.perf_counter()
+        links, digests = [], []
+
+        def texts():
+            for chunk_links, chunk_texts in chunks:
+                links.extend(chunk_links)
+                for text in chunk_texts:
+                    digests.append(_digest(text))
+                    yield text
+
+        self.vectorizer = TfidfVectorizer(**VECTORIZER_PARAMS)
+        self.matrix = self.vectorizer.fit_transform(texts()).tocsr()
+        self.links = links
+        self.digests = digests
+        self.fitted_docs = len(self.links)
+        self.fit_id = _fit_id(self.vectorizer)
+        self._row = {link: i for i, link in enumerate(self.links)}
+        logging.info(f"Fitted job index on {self.fitted_docs} jobs in {time.perf_counter() - started:.2f}s")
+
+    def update(self, links, texts) -> int:
+        """Vectorize new or changed jobs with the stored vocabulary. Returns the number of rows touched."""
+        new_links, new_texts, changed = [], [], {}
+        for link, text in zip(links, texts):
+            row = self._row.get(link)
+            digest = _digest(text)
+            if row is None:
+                new_links.append(link)
+                new_texts.append(text)
+            elif self.digests[row] != digest:
+                changed[row] = text
+        if changed:
+            rows = list(changed)
+            self.matrix = self.matrix.tolil()
+            self.matrix[rows] = self.vectorizer.transform([changed[r] for r in rows])
+            self.matrix = self.matrix.tocsr()
+            for r in rows:
+                self.digests[r] = _digest(changed[r])
+        if new_links:
+            self.matrix = sp.vstack([self.matrix, self.vectorizer.transform(new_texts)], format="csr")
+            for link, text in zip(new_links, new_texts):
+                self._row[link] = len(self.links)
+                self.links.append(link)
+                self.digests.append(_digest(text))
+        return len(new_links) + len(changed)
+
+    def sync(self, corpus) -> "JobIndex":
+        """Make the index cover the corpus, refitting only when it has grown a lot.
+
+        `corpus` is a sized iterable of DataFrame chunks with link and combined_text columns
+        (analyzer.JobCorpus); it is streamed once, so only one chunk of texts is held at a time."""
+        chunks = ((chunk["link"], chunk["combined_text"]) for chunk in corpus)
+        if self.vectorizer is None and not self.load():
+            self._fit(chunks)
+            self.save()
+            return self
+        if len(corpus) > self.fitted_docs * (1 + JOB_INDEX_REFIT_RATIO):
+            logging.info(f"Corpus grew from {self.fitted_docs} to {len(corpus)} jobs; refitting job index")
+            self._fit(chunks)
+            self.save()
+            return self
+        touched = sum(self.update(links, texts) for links, texts in chunks)
+        if touched:
+            logging.info(f"Updated {touched} rows in job index")
+            self.save()
+        return self
+
+    # -- querying ----------------------------------------------------------
+
+    def transform(self, texts):
+        return self.vectorizer.transform(texts)
+
+    def similarity(self, query_texts, links=None) -> np.ndarray:
+        """Cosine similarity of each query text against the jobs (rows: queries, cols: jobs).
+
+        With `links`, columns follow that order instead of index order."""
+        scores = (self.transform(query_texts) @ self.matrix.T).toarray()
+        return scores if links is None else scores[:, self.positions(links)]
+
+    def positions(self, links) -> np.ndarray:
+        return np.fromiter((self._row[link] for link in links), dtype=np.int64)
@@ -0,0 +1,134 @@
+"""Streaming hand-off from scraper threads to the job store.
+
+Extraction threads `put()` job dicts onto a bounded queue; one writer thread drains it,
+normalizes and dedupes records, and upserts them in batches. The queue bound gives
+backpressure, so memory stays flat however long the crawl runs, and every batch is
+committed as it is written: readers (the analyzer, `job_store.py stats`) see rows
+while the crawl is still going thanks to SQLite WAL mode.
+"""
+import logging
+import os
+import queue
+import re
+import threading
+import time
+
+from job_store import JOB_COLUMNS, canonical_link, open_store
+
+WRITE_QUEUE_SIZE = int(os.getenv("WRITE_QUEUE_SIZE", "1000"))  # max records waiting for the writer
+WRITE_BATCH_SIZE = int(os.getenv("WRITE_BATCH_SIZE", "200"))  # rows per upsert transaction
+WRITE_FLUSH_SECONDS = float(os.getenv("WRITE_FLUSH_SECONDS", "2"))  # flush a partial batch after this long
+
+_SPACES = re.compile(r"\s+")
+_STOP = object()
+
+
+def normalize_job(job) -> dict:
+    """Return a copy with every store column present, whitespace collapsed and the link canonical."""
+    record = {}
+    for col in JOB_COLUMNS:
+        value = job.get(col)
+        record[col] = "" if value is None else _SPACES.sub(" ", str(value)).strip()
+    record["link"] = canonical_link(record["link"])
+    return record
+
+
+class JobWriter:
+    """Single background writer that batches records from many producer threads into the store."""
+
+    def __init__(self, store_path: str = None, batch_size: int = WRITE_BATCH_SIZE,
+                 flush_seconds: float = WRITE_FLUSH_SECONDS, queue_size: int = WRITE_QUEUE_SIZE, timer=None):
+        self.store_path = store_path
+        self.batch_size = max(1, batch_size)
+        self.flush_seconds = flush_seconds
+        self.timer = timer  # optional context manager factory, e.g. scraper._timed_stage("persist")
+        self._queue = queue.Queue(maxsize=max(1, queue_size))
+        self._seen = set()  # links already written this run (strings only, not records)
+        self._thread = None
+        self._error = None
+        self.stats = {"received": 0, "written": 0, "duplicates": 0, "dropped": 0, "batches": 0}
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="job-writer", daemon=True)
+            self._thread.start()
+        return self
+
+    def put(self, job):
+        """Queue one record; blocks while the writer is `queue_size` records behind."""
+        if self._error is not None:
+            raise RuntimeError("job writer stopped") from self._error
+        self._queue.put(job)
+
+    def close(self) -> int:
+        """Flush everything queued, stop the writer and return the number of rows written."""
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join()
+            self._thread = None
+        if self._error is not None:
+            raise RuntimeError("job writer failed") from self._error
+        logging.info("Job writer closed (%s)", ", ".join(f"{k}={v}" for k, v in self.stats.items()))
+        return self.stats["written"]
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _run(self):
+        try:
+            with open_store(self.store_path) as store:
+                self._drain(store)
+        except Exception as e:  # surfaced to producers on their next put() and by close()
+            logging.error("Job writer failed: %s", e)
+            self._error = e
+            # unblock producers still waiting on a full queue
+            while True:
+                try:
+                    self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+    def _drain(self, store):
+        batch = {}
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+            if item is _STOP:
+                self._flush(store, batch)
+                return
+            if item is not None:
+                self.stats["received"] += 1
+                record = normalize_job(item)
+                link = record["link"]
+                if not link:
+                    self.stats["dropped"] += 1
+                elif link in self._seen or link in batch:
+                    self.stats["duplicates"] += 1
+                else:
+                    batch[link] = record
+                    if deadline is None:
+                        deadline = time.monotonic() + self.flush_seconds
+            if batch and (len(batch) >= self.batch_size or time.monotonic() >= deadline):
+                self._flush(store, batch)
+                batch = {}
+                deadline = None
+
+    def _flush(self, store, batch):
+        if not batch:
+            return
+        if self.timer is not None:
+            with self.timer() as st:
+                st["items"] = written = store.upsert_many(batch.values())
+        else:
+            written = store.upsert_many(batch.values())
+        self._seen.update(batch)
+        self.stats["written"] += written
+        self.stats["batches"] += 1
+        logging.debug("Persisted batch of %d jobs", written)
@@ -0,0 +1,62 @@
+"""Job record schema shared by the browser and HTTP scraping backends (stdlib only)."""
+import re
+from datetime import datetime, timedelta
+try:
+    from zoneinfo import ZoneInfo
+except ImportError:  # Python <3.9 fallback (not expected here)
+    ZoneInfo = None
+
+
+def job_id_from_link(link: str):
+    """LinkedIn job id from a posting link (.../jobs/view/some-title-1234567890?...)."""
+    m = re.search(r"(\d{6,})(?:[/?#]|$)", link or "")
+    return m.group(1) if m else None
+
+
+def parse_posted(text: str):
+    """Parse relative posted text like '2 days ago', '3 weeks ago', '1 month ago', '30+ days ago', 'Just posted'. Return (date_obj, normalized_raw)."""
+    if not text:
+        return None, ""
+    raw = text.strip()
+    t = raw.lower()
+    now = datetime.now(ZoneInfo('America/Los_Angeles')) if ZoneInfo else datetime.utcnow()
+    # Defaults
+    if 'just' in t or 'hour' in t or 'min' in t:
+        return now.date(), raw
+    # 30+ days (LinkedIn) treat as 30
+    if '30+' in t:
+        return (now - timedelta(days=30)).date(), raw
+    m = re.search(r'(\d+)\s*(day|week|month|year)', t)
+    if m:
+        val = int(m.group(1))
+        unit = m.group(2)
+        if 'day' in unit:
+            delta = timedelta(days=val)
+        elif 'week' in unit:
+            delta = timedelta(weeks=val)
+        elif 'month' in unit:
+            # Approximate month = 30 days
+            delta = timedelta(days=30*val)
+        elif 'year' in unit:
+            delta = timedelta(days=365*val)
+        else:
+            delta = timedelta(0)
+        return (now - delta).date(), raw
+    return None, raw
+
+
+def build_job_record(title, link, company, location, posted_text, description, page_url, keyword):
+    """Assemble the job dict shared by every extraction path."""
+    posted_date_obj, posted_raw = parse_posted(posted_text)
+    return {
+        "title": title,
+        "link": link,
+        "company": company,
+        "location": location,
+        "posted_raw": posted_raw or posted_text,
+        "posted_date_pdt": posted_date_obj.isoformat() if posted_date_obj else "",
+        "description": description,
+        "source": "LinkedIn",
+        "page_url": page_url,
+        "keyword": keyword
+    }
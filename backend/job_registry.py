@@ -0,0 +1,50 @@
+"""In-memory registry of jobs scraped during one run, shared by all keyword workers.
+
+Jobs are indexed by canonical link, so membership checks and inserts are O(1) and a
+posting seen under two keywords is kept once (credited to the keyword that found it
+first). Only links and per-keyword counters are held; the records themselves stream
+to the job store through job_pipeline.JobWriter.
+"""
+from collections import Counter
+from threading import Lock
+
+from job_pipeline import canonical_link
+
+
+class JobRegistry:
+    """Thread-safe set of scraped posting links with per-keyword counts."""
+
+    def __init__(self):
+        self._lock = Lock()
+        self._links = set()
+        self._per_keyword = Counter()
+
+    def add(self, job) -> bool:
+        """Register a job unless its link is empty or already known. Returns True if it was new."""
+        link = canonical_link(job.get("link"))
+        if not link:
+            return False
+        with self._lock:
+            if link in self._links:
+                return False
+            self._links.add(link)
+            self._per_keyword[job.get("keyword")] += 1
+        return True
+
+    def __contains__(self, link) -> bool:
+        return canonical_link(link) in self._links
+
+    def __len__(self) -> int:
+        return len(self._links)
+
+    def keyword_count(self, keyword) -> int:
+        return self._per_keyword[keyword]
+
+    def keyword_counts(self) -> dict:
+        with self._lock:
+            return dict(self._per_keyword)
+
+    def clear(self):
+        with self._lock:
+            self._links.clear()
+            self._per_keyword.clear()
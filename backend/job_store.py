@@ -0,0 +1,270 @@
+"""Persistent, link-keyed job store (SQLite).
+
+Scraped postings are upserted by canonical `link` (tracking parameters stripped), so writes
+cost O(new rows) instead of rewriting the whole corpus, and history is kept across runs with
+first/last seen timestamps.
+
+    python job_store.py stats
+    python job_store.py export scraped_jobs.csv
+    python job_store.py import scraped_jobs.csv
+"""
+import argparse
+import logging
+import os
+import sqlite3
+from datetime import datetime, timezone
+from threading import Lock
+from urllib.parse import urlsplit, urlunsplit
+
+BASE_DIR = os.path.dirname(__file__)
+JOB_STORE_PATH = os.getenv("JOB_STORE_PATH", os.path.join(BASE_DIR, "jobs.db"))
+LEGACY_CSV = os.path.join(BASE_DIR, "scraped_jobs.csv")
+
+JOB_COLUMNS = [
+    "title", "link", "company", "location", "posted_raw", "posted_date_pdt",
+    "description", "source", "page_url", "keyword"
+]
+MISSING_DESCRIPTION = "Description not available"
+
+# PRAGMA user_version once rows stored under tracking-parameter links have been merged
+_CANONICAL_LINKS_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    link TEXT PRIMARY KEY,
+    title TEXT NOT NULL DEFAULT '',
+    company TEXT NOT NULL DEFAULT '',
+    location TEXT NOT NULL DEFAULT '',
+    posted_raw TEXT NOT NULL DEFAULT '',
+    posted_date_pdt TEXT NOT NULL DEFAULT '',
+    description TEXT NOT NULL DEFAULT '',
+    source TEXT NOT NULL DEFAULT '',
+    page_url TEXT NOT NULL DEFAULT '',
+    keyword TEXT NOT NULL DEFAULT '',
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_keyword ON jobs(keyword);
+CREATE INDEX IF NOT EXISTS idx_jobs_last_seen ON jobs(last_seen);
+"""
+
+# first_seen is only set on insert; a placeholder description never overwrites a real one
+_UPSERT = f"""
+INSERT INTO jobs ({', '.join(JOB_COLUMNS)}, first_seen, last_seen)
+VALUES ({', '.join('?' for _ in JOB_COLUMNS)}, ?, ?)
+ON CONFLICT(link) DO UPDATE SET
+    title = excluded.title,
+    company = excluded.company,
+    location = excluded.location,
+    posted_raw = excluded.posted_raw,
+    posted_date_pdt = excluded.posted_date_pdt,
+    description = CASE
+        WHEN excluded.description IN ('', '{MISSING_DESCRIPTION}') THEN jobs.description
+        ELSE excluded.description END,
+    source = excluded.source,
+    page_url = excluded.page_url,
+    keyword = excluded.keyword,
+    last_seen = excluded.last_seen
+"""
+
+
+def _utcnow() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+def canonical_link(link) -> str:
+    """Posting URL without per-session tracking parameters (refId, trackingId, position...)."""
+    link = (link or "").strip()
+    if "/jobs/view/" not in link:
+        return link
+    parts = urlsplit(link)
+    return urlunsplit((parts.scheme, parts.netloc, parts.path.rstrip("/"), "", ""))
+
+
+def _merge_rows(rows) -> dict:
+    """One row from several stored under variants of a link: newest fields, widest seen range."""
+    rows = sorted(rows, key=lambda r: r["last_seen"])
+    merged = dict(rows[-1])
+    merged["first_seen"] = min(r["first_seen"] for r in rows)
+    real = [r["description"] for r in rows if r["description"] not in ("", MISSING_DESCRIPTION)]
+    if real:
+        merged["description"] = real[-1]
+    return merged
+
+
+def _clean(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, float) and value != value:  # NaN from pandas
+        return ""
+    return str(value)
+
+
+class JobStore:
+    """Thread-safe SQLite job store keyed by posting link."""
+
+    def __init__(self, path: str = None):
+        self.path = path or JOB_STORE_PATH
+        self._lock = Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        # WAL lets readers (e.g. the analyzer) load rows while a crawl is writing
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] < _CANONICAL_LINKS_VERSION:
+            self._merge_canonical_links()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _merge_canonical_links(self):
+        """One-time migration: fold rows stored under tracking-parameter links into the canonical row."""
+        variants = {}
+        for (link,) in self._conn.execute("SELECT link FROM jobs WHERE link LIKE '%/jobs/view/%'"):
+            canonical = canonical_link(link)
+            if canonical != link:
+                variants.setdefault(canonical, [canonical]).append(link)
+        columns = JOB_COLUMNS + ["first_seen", "last_seen"]
+        with self._conn:
+            for canonical, links in variants.items():
+                rows = self._rows(links)
+                merged = _merge_rows(rows)
+                merged["link"] = canonical
+                self._conn.executemany("DELETE FROM jobs WHERE link = ?", [(r["link"],) for r in rows])
+                self._conn.execute(
+                    f"INSERT INTO jobs ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})",
+                    [merged[col] for col in columns])
+            self._conn.execute(f"PRAGMA user_version = {_CANONICAL_LINKS_VERSION}")
+        if variants:
+            logging.info("Merged %d stored links with tracking parameters into %d postings",
+                         sum(len(links) - 1 for links in variants.values()), len(variants))
+
+    def _rows(self, links) -> list:
+        cursor = self._conn.execute(f"SELECT * FROM jobs WHERE link IN ({', '.join('?' for _ in links)})", links)
+        names = [d[0] for d in cursor.description]
+        return [dict(zip(names, row)) for row in cursor]
+
+    def upsert_many(self, jobs, seen_at: str = None) -> int:
+        """Insert or refresh jobs by canonical link. Returns the number of rows written (rows without a link are skipped)."""
+        seen_at = seen_at or _utcnow()
+        rows = []
+        for job in jobs:
+            link = canonical_link(_clean(job.get("link")))
+            if not link:
+                continue
+            rows.append(tuple(link if col == "link" else _clean(job.get(col)) for col in JOB_COLUMNS)
+                        + (seen_at, seen_at))
+        if not rows:
+            return 0
+        with self._lock, self._conn:
+            self._conn.executemany(_UPSERT, rows)
+        return len(rows)
+
+    def known_links(self, links) -> set:
+        """Subset of `links` already stored with a real description (those can skip a detail fetch)."""
+        links = list(dict.fromkeys(l for l in links if l))
+        known = set()
+        with self._lock:
+            for i in range(0, len(links), 500):  # stay under SQLite's bound-parameter limit
+                chunk = links[i:i + 500]
+                rows = self._conn.execute(
+                    f"SELECT link FROM jobs WHERE link IN ({', '.join('?' for _ in chunk)}) "
+                    "AND description NOT IN ('', ?)", (*chunk, MISSING_DESCRIPTION)
+                ).fetchall()
+                known.update(r[0] for r in rows)
+        return known
+
+    def count(self, where: str = "", params=()) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM jobs" + (f" WHERE {where}" if where else ""),
+                                      params).fetchone()[0]
+
+    def last_rowid(self) -> int:
+        """Highest rowid. Upserts keep a row's rowid, so `rowid <= last_rowid()` pins the jobs stored now."""
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(MAX(rowid), 0) FROM jobs").fetchone()[0]
+
+    def keyword_last_seen(self) -> dict:
+        """{keyword: datetime of the most recent scrape that saw any of its postings}."""
+        with self._lock:
+            rows = self._conn.execute("SELECT keyword, MAX(last_seen) FROM jobs GROUP BY keyword").fetchall()
+        return {kw: datetime.fromisoformat(ts) for kw, ts in rows if kw and ts}
+
+    def load_dataframe(self, where: str = "", params=()):
+        """Load jobs (optionally filtered by a SQL WHERE clause) as a DataFrame."""
+        import pandas as pd
+        query = "SELECT * FROM jobs" + (f" WHERE {where}" if where else "") + " ORDER BY first_seen, link"
+        with self._lock:
+            return pd.read_sql_query(query, self._conn, params=params)
+
+    def iter_dataframes(self, chunk_rows: int, columns=None, where: str = "", params=()):
+        """Yield jobs (optionally filtered by a SQL WHERE clause) as DataFrames of at most `chunk_rows`
+        rows, in insertion order. One cursor on its own connection streams them with `fetchmany`,
+        so only the current chunk is in memory and every chunk comes from the same WAL snapshot."""
+        import pandas as pd
+        query = (f"SELECT {', '.join(columns) if columns else '*'} FROM jobs"
+                 + (f" WHERE {where}" if where else "") + " ORDER BY rowid")
+        conn = sqlite3.connect(self.path)
+        try:
+            cursor = conn.execute(query, params)
+            names = [d[0] for d in cursor.description]
+            while True:
+                rows = cursor.fetchmany(max(1, chunk_rows))
+                if not rows:
+                    break
+                yield pd.DataFrame.from_records(rows, columns=names)
+        finally:
+            conn.close()
+
+    def import_csv(self, csv_path: str) -> int:
+        """Load a legacy scraped_jobs.csv into the store."""
+        import pandas as pd
+        df = pd.read_csv(csv_path).fillna("")
+        written = self.upsert_many(df.to_dict("records"))
+        logging.info("Imported %d jobs from %s", written, csv_path)
+        return written
+
+    def export_csv(self, csv_path: str) -> int:
+        df = self.load_dataframe()
+        df.to_csv(csv_path, index=False)
+        logging.info("Exported %d jobs to %s", len(df), csv_path)
+        return len(df)
+
+
+def open_store(path: str = None) -> JobStore:
+    """Open the job store, seeding it from a legacy scraped_jobs.csv the first time."""
+    store = JobStore(path)
+    if store.count() == 0 and os.path.exists(LEGACY_CSV) and os.path.getsize(LEGACY_CSV) > 0:
+        store.import_csv(LEGACY_CSV)
+    return store
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format='[%(levelname)s] %(message)s')
+    parser = argparse.ArgumentParser(description="Inspect or convert the job store")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("stats")
+    exp = sub.add_parser("export")
+    exp.add_argument("csv_path")
+    imp = sub.add_parser("import")
+    imp.add_argument("csv_path")
+    args = parser.parse_args()
+
+    with JobStore() as store:
+        if args.command == "export":
+            store.export_csv(args.csv_path)
+        elif args.command == "import":
+            store.import_csv(args.csv_path)
+        else:
+            print(f"{store.path}: {store.count()} jobs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""Content-addressed on-disk cache for LLM responses (SQLite).
+
+Entries are keyed by a hash of the normalized prompt inputs plus the model name (see
+`cache_key`), so an identical request is answered from disk instead of the API. Entries
+expire after LLM_CACHE_TTL_HOURS and the least recently used ones are evicted once the
+cache grows past LLM_CACHE_MAX_MB.
+
+    python llm_cache.py stats
+    python llm_cache.py clear
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import time
+from threading import Lock
+
+BASE_DIR = os.path.dirname(__file__)
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", os.path.join(BASE_DIR, "llm_cache.db"))
+LLM_CACHE_TTL_HOURS = float(os.getenv("LLM_CACHE_TTL_HOURS", "168"))  # 0 = never expire
+LLM_CACHE_MAX_MB = float(os.getenv("LLM_CACHE_MAX_MB", "50"))  # 0 = unbounded
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_entries_accessed ON entries(accessed);
+"""
+
+
+def cache_key(*parts) -> str:
+    """Stable hash of JSON-serializable parts (dict key order does not matter)."""
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """Thread-safe key -> JSON value store with TTL expiry and LRU size bound."""
+
+    def __init__(self, path: str = None, ttl_hours: float = LLM_CACHE_TTL_HOURS, max_mb: float = LLM_CACHE_MAX_MB):
+        self.path = path or LLM_CACHE_PATH
+        self.ttl = ttl_hours * 3600
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self._lock = Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self.stats = {"hits": 0, "misses": 0, "writes": 0, "evicted": 0}
+        self.purge_expired()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def get(self, key: str):
+        """Cached value for `key`, or None when absent or expired."""
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT value, created FROM entries WHERE key = ?", (key,)).fetchone()
+            if row and self.ttl and now - row[1] > self.ttl:
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                row = None
+            if row is None:
+                self.stats["misses"] += 1
+                return None
+            self._conn.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+        self.stats["hits"] += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, value):
+        """Store a JSON-serializable value, then evict least recently used entries over the size bound."""
+        data = json.dumps(value, ensure_ascii=False, default=str)
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, created, accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, data, len(data.encode("utf-8")), now, now)
+            )
+            self.stats["writes"] += 1
+            if self.max_bytes:
+                self._evict_locked()
+
+    def _evict_locked(self):
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        doomed = []
+        for key, size in self._conn.execute("SELECT key, size FROM entries ORDER BY accessed"):
+            if total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM entries WHERE key = ?", doomed)
+        self.stats["evicted"] += len(doomed)
+
+    def purge_expired(self) -> int:
+        if not self.ttl:
+            return 0
+        with self._lock, self._conn:
+            removed = self._conn.execute("DELETE FROM entries WHERE created < ?", (time.time() - self.ttl,)).rowcount
+        self.stats["evicted"] += removed
+        return removed
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM entries")
+
+    def summary(self) -> dict:
+        with self._lock:
+            count, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        return {"entries": count, "bytes": size}
+
+
+def open_cache(path: str = None) -> LLMCache:
+    return LLMCache(path)
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format='[%(levelname)s] %(message)s')
+    parser = argparse.ArgumentParser(description="Inspect the LLM response cache")
+    parser.add_argument("command", choices=["stats", "clear"])
+    parser.add_argument("--path", default=None, help="cache file (defaults to LLM_CACHE_PATH)")
+    args = parser.parse_args()
+
+    with open_cache(args.path) as cache:
+        if args.command == "stats":
+            summary = cache.summary()
+            print(f"{summary['entries']} entries, {summary['bytes'] / 1024:.1f} KiB in {cache.path}")
+        else:
+            cache.clear()
+            print(f"Cleared {cache.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+"""LLM providers for the analysis stage, plus incremental parsing of streamed JSON answers.
+
+Every provider exposes `name` (part of each LLM cache key), `stream(prompt)` yielding text
+chunks as they are generated, and `generate(prompt)` returning the whole text.
+
+  gemini - Google Gemini via google-generativeai (needs GOOGLE_API_KEY)
+  local  - deterministic offline stand-in that answers the analyzer's prompts from the
+           prompt text itself, streamed with configurable latency; for benchmarks and tests
+
+`JsonArrayStream` scans a streamed answer and hands back each element of one array (e.g.
+"job_analysis") as soon as its closing brace arrives, so the first insight is available
+long before generation finishes.
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+
+LLM_PROVIDERS = ("gemini", "local")
+LLM_PROVIDER = os.getenv("LLM_PROVIDER", "gemini").lower()
+GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-pro")
+# Local stand-in: time before the first chunk (plus prompt reading time), then output speed
+LOCAL_LLM_FIRST_TOKEN_SECONDS = float(os.getenv("LOCAL_LLM_FIRST_TOKEN_SECONDS", "0.3"))
+LOCAL_LLM_PROMPT_CHARS_PER_SECOND = float(os.getenv("LOCAL_LLM_PROMPT_CHARS_PER_SECOND", "20000"))
+LOCAL_LLM_CHARS_PER_SECOND = float(os.getenv("LOCAL_LLM_CHARS_PER_SECOND", "2000"))
+LOCAL_LLM_CHUNK_CHARS = int(os.getenv("LOCAL_LLM_CHUNK_CHARS", "64"))
+
+
+def parse_llm_json(text):
+    """Parse a model response as JSON, falling back to the outermost {...} block"""
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        json_match = re.search(r'\{.*\}', text, re.DOTALL)
+        if json_match:
+            return json.loads(json_match.group())
+        raise ValueError("Could not parse LLM response as JSON")
+
+
+class JsonArrayStream:
+    """Incremental scanner over streamed JSON text that yields each object in the array
+    under `key` as soon as it is complete. `result()` parses the whole text at the end."""
+
+    def __init__(self, key: str = "job_analysis"):
+        self._key = json.dumps(key)
+        self._text = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._last_string = None
+        self._pending_key = None
+        self._array_depth = None  # depth of the target array while inside it
+        self._item_start = None
+
+    def feed(self, chunk: str):
+        """Consume one chunk; return the array elements completed by it."""
+        self._text += chunk
+        text = self._text
+        items = []
+        for pos in range(self._pos, len(text)):
+            ch = text[pos]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    self._last_string = text[self._string_start:pos + 1]
+                continue
+            if ch == '"':
+                self._in_string = True
+                self._string_start = pos
+            elif ch == ":":
+                self._pending_key = self._last_string
+            elif ch in "{[":
+                self._depth += 1
+                if ch == "[" and self._array_depth is None and self._pending_key == self._key:
+                    self._array_depth = self._depth
+                elif ch == "{" and self._array_depth is not None and self._depth == self._array_depth + 1:
+                    self._item_start = pos
+                self._pending_key = None
+            elif ch in "}]":
+                if ch == "}" and self._item_start is not None and self._depth == self._array_depth + 1:
+                    try:
+                        items.append(json.loads(text[self._item_start:pos + 1]))
+                    except ValueError:
+                        pass  # malformed element; result() still sees the full text
+                    self._item_start = None
+                elif ch == "]" and self._depth == self._array_depth:
+                    self._array_depth = None
+                self._depth -= 1
+            elif ch == ",":
+                self._pending_key = None
+        self._pos = len(text)
+        return items
+
+    @property
+    def text(self) -> str:
+        return self._text
+
+    def result(self):
+        return parse_llm_json(self._text)
+
+
+class LLMProvider:
+    """Base class: subclasses implement stream(); generate() joins it."""
+    name = "base"
+
+    def stream(self, prompt: str):
+        raise NotImplementedError
+
+    def generate(self, prompt: str) -> str:
+        return "".join(self.stream(prompt))
+
+
+class GeminiProvider(LLMProvider):
+    """google-generativeai model; streams with generate_content(stream=True)."""
+
+    def __init__(self, model: str = GEMINI_MODEL):
+        import google.generativeai as genai
+        genai.configure(api_key=os.getenv('GOOGLE_API_KEY'))
+        self.name = f"gemini:{model}"
+        self._model = genai.GenerativeModel(model)
+
+    def stream(self, prompt: str):
+        for chunk in self._model.generate_content(prompt, stream=True):
+            text = getattr(chunk, "text", "")
+            if text:
+                yield text
+
+    def generate(self, prompt: str) -> str:
+        return self._model.generate_content(prompt).text
+
+
+def _section(prompt: str, start: str, end: str) -> str:
+    head, sep, rest = prompt.partition(start)
+    return rest.partition(end)[0].strip() if sep else ""
+
+
+class LocalProvider(LLMProvider):
+    """Deterministic offline stand-in for the analyzer's prompts.
+
+    Scores each job by how many candidate skills its description mentions and streams a
+    schema-conforming JSON answer in `chunk_chars` pieces: `first_token` seconds plus the
+    prompt length over `prompt_chars_per_second` before the first piece, then
+    `chars_per_second`. Identical prompts give identical answers."""
+    name = "local:standin-v1"
+
+    def __init__(self, first_token: float = LOCAL_LLM_FIRST_TOKEN_SECONDS,
+                 chars_per_second: float = LOCAL_LLM_CHARS_PER_SECOND, chunk_chars: int = LOCAL_LLM_CHUNK_CHARS,
+                 prompt_chars_per_second: float = LOCAL_LLM_PROMPT_CHARS_PER_SECOND):
+        self.first_token = first_token
+        self.prompt_chars_per_second = prompt_chars_per_second
+        self.chars_per_second = chars_per_second
+        self.chunk_chars = max(1, chunk_chars)
+        self.calls = 0
+
+    def stream(self, prompt: str):
+        self.calls += 1
+        text = self.answer(prompt)
+        delay = self.first_token
+        if self.prompt_chars_per_second > 0:
+            delay += len(prompt) / self.prompt_chars_per_second
+        if delay > 0:
+            time.sleep(delay)
+        for i in range(0, len(text), self.chunk_chars):
+            chunk = text[i:i + self.chunk_chars]
+            if self.chars_per_second > 0:
+                time.sleep(len(chunk) / self.chars_per_second)
+            yield chunk
+
+    def answer(self, prompt: str) -> str:
+        """The full (unstreamed) answer text for a prompt."""
+        skills = [s.strip() for s in _section(prompt, "Candidate's Key Skills:", "\n\n").split(",") if s.strip()]
+        single = _section(prompt, "Job:", "\n\nRespond")
+        if single:
+            job = json.loads(single)
+            return json.dumps({**self._job_entry(job, skills), **self._insights([job], skills)}, indent=2)
+        jobs = json.loads(_section(prompt, "Job Opportunities:", "\n\nProvide") or "[]")
+        entries = [self._job_entry(job, skills) for job in jobs]
+        average = round(sum(e["fit_score"] for e in entries) / len(entries)) if entries else 0
+        return json.dumps({
+            "overall_assessment": {"fit_score": average, "summary": f"Stand-in analysis of {len(entries)} jobs"},
+            "job_analysis": entries,
+            "career_insights": self._insights(jobs, skills)
+        }, indent=2)
+
+    @staticmethod
+    def _mentions(job, skills):
+        text = f"{job.get('title') or ''} {job.get('description') or ''}".lower()
+        return [s for s in skills if s.lower() in text]
+
+    def _job_entry(self, job, skills):
+        matched = self._mentions(job, skills)
+        missing = [s for s in skills if s not in matched]
+        seed = int(hashlib.blake2b(json.dumps(job, sort_keys=True, default=str).encode(), digest_size=2).hexdigest(), 16)
+        return {
+            "job_title": job.get("title") or "",
+            "company": job.get("company") or "",
+            "fit_score": min(100, 30 + round(60 * len(matched) / max(1, len(skills))) + seed % 10),
+            "strengths": [f"Experience with {s}" for s in matched[:3]],
+            "challenges": [f"Limited evidence of {s}" for s in missing[:2]],
+            "growth_opportunities": [f"Deepen {s}" for s in matched[3:5]],
+            "cultural_fit": "Not assessed by the local stand-in",
+            "recommendations": [f"Highlight {s} in the application" for s in matched[:2]]
+        }
+
+    def _insights(self, jobs, skills):
+        demand = {s: sum(s in self._mentions(job, skills) for job in jobs) for s in skills}
+        return {
+            "skill_gaps": [s for s, count in demand.items() if not count][:5],
+            "growth_areas": sorted((s for s, count in demand.items() if count), key=lambda s: -demand[s])[:3],
+            "industry_trends": []
+        }
+
+
+def get_provider(name=None):
+    """Provider by name (an LLMProvider instance is returned as is), or None when it can't be
+    used (missing API key or SDK)."""
+    if isinstance(name, LLMProvider):
+        return name
+    name = (name or LLM_PROVIDER).lower()
+    if name not in LLM_PROVIDERS:
+        raise ValueError(f"Unknown LLM provider {name!r}; expected one of {', '.join(LLM_PROVIDERS)}")
+    if name == "local":
+        return LocalProvider()
+    if not os.getenv('GOOGLE_API_KEY'):
+        return None
+    try:
+        return GeminiProvider()
+    except ImportError:
+        logging.warning("google-generativeai not installed; LLM analysis disabled.")
+    except Exception:
+        logging.warning("Failed to initialize Gemini model; continuing without LLM analysis")
+    return None
@@ -1,344 +1,52 @@
-import fitz  # PyMuPDF
-import spacy
-import re
-import pandas as pd
-import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-from collections import Counter
-import json
-from datetime import datetime
-from scraper import get_csv_file
-import logging
-try:
-    import google.generativeai as genai
-except ImportError:
-    genai = None
-    logging.warning("google-generativeai not installed; LLM analysis disabled.")
-from typing import List, Dict
-import os
-from dotenv import load_dotenv
-try:
-    from docx import Document
-except ImportError:
-    Document = None
-    logging.warning("python-docx not installed; DOCX resume parsing disabled.")
-
-# Load environment variables
-load_dotenv()
-
-# Set up logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
-
-class JobAnalyzer:
-    def __init__(self, resume_path):
-        self.resume_path = resume_path
-        self.nlp = spacy.load("en_core_web_sm")
-        self.resume_text = None
-        self.skills = None
-        self.df = None
-        self.matched_jobs = None
-        self.llm_analysis = None
-        
-        # Initialize Gemini
-        if genai and os.getenv('GOOGLE_API_KEY'):
-            genai.configure(api_key=os.getenv('GOOGLE_API_KEY'))
-            try:
-                self.model = genai.GenerativeModel('gemini-pro')
-            except Exception:
-                self.model = None
-                logging.warning("Failed to initialize Gemini model; continuing without LLM analysis")
-        else:
-            self.model = None
-        
-        # Path to the CSV file
-        self.csv_path = os.path.join(os.path.dirname(__file__), 'scraped_jobs.csv')
-        
-    def extract_text_from_pdf(self):
-        """Extract text from resume PDF or DOCX"""
-        logging.info("Extracting text from resume...")
-        try:
-            if self.resume_path.lower().endswith('.pdf'):
-                doc = fitz.open(self.resume_path)
-                self.resume_text = "".join(page.get_text() for page in doc)
-                doc.close()
-            elif self.resume_path.lower().endswith('.docx'):
-                if not Document:
-                    raise ImportError("python-docx not installed. Install with 'pip install python-docx'.")
-                d = Document(self.resume_path)
-                self.resume_text = "\n".join(p.text for p in d.paragraphs)
-            else:
-                raise ValueError("Unsupported resume format. Use PDF or DOCX.")
-        except Exception as e:
-            logging.error(f"Error extracting text from resume: {e}")
-            raise
-
-    def extract_skills(self):
-        """Extract skills from resume using NLP"""
-        logging.info("Extracting skills from resume...")
-        doc = self.nlp(self.resume_text)
-        
-        # Custom skill patterns (extend this list based on your domain)
-        skill_patterns = [
-            r'python|java|javascript|react|node\.js|sql|aws|docker|kubernetes|git|c\+\+|ruby|golang',
-            r'machine learning|deep learning|artificial intelligence|data science|nlp|computer vision',
-            r'agile|scrum|ci/cd|devops|test driven development|rest api|microservices',
-            r'mongodb|postgresql|mysql|redis|elasticsearch|kafka|graphql'
-        ]
-        
-        # Extract skills using both NER and pattern matching
-        skills = []
-        
-        # NER-based extraction
-        for ent in doc.ents:
-            if ent.label_ in ["PRODUCT", "ORG", "GPE"] and len(ent.text) > 2:
-                skills.append(ent.text)
-        
-        # Pattern-based extraction
-        for pattern in skill_patterns:
-            matches = re.finditer(pattern, self.resume_text.lower())
-            skills.extend([match.group() for match in matches])
-        
-        # Clean and normalize skills
-        self.skills = list(set([
-            re.sub(r'[^\x00-\x7F]+', '', skill).strip()
-            for skill in skills
-            if skill.strip() and not skill.startswith('\x80')
-        ]))
-        
-        logging.info(f"Extracted {len(self.skills)} unique skills")
-
-    def analyze_jobs_with_llm(self, top_jobs: List[Dict]) -> Dict:
-        """Analyze jobs using Gemini for better matching and insights"""
-        if not self.model:
-            return {"disabled": True, "reason": "LLM model not available"}
-        
-        logging.info("Starting LLM-based job analysis...")
-        
-        # Prepare the prompt for Gemini
-        prompt = f"""As an expert job matching AI, analyze these job opportunities based on the candidate's resume and skills.
-        
-Resume Summary:
-{self.resume_text[:1000]}  # First 1000 chars of resume
-
-Candidate's Key Skills:
-{', '.join(self.skills)}
-
-Please analyze the following job opportunities and provide:
-1. Overall fit assessment (0-100%)
-2. Key strengths and potential challenges
-3. Growth opportunities
-4. Cultural fit assessment
-5. Specific recommendations for application
-
-Job Opportunities:
-{json.dumps(top_jobs, indent=2)}
-
-Provide your analysis in a structured JSON format with the following fields:
-{{
-    "overall_assessment": {{
-        "fit_score": number,
-        "summary": "string"
-    }},
-    "job_analysis": [
-        {{
-            "job_title": "string",
-            "company": "string",
-            "fit_score": number,
-            "strengths": ["string"],
-            "challenges": ["string"],
-            "growth_opportunities": ["string"],
-            "cultural_fit": "string",
-            "recommendations": ["string"]
-        }}
-    ],
-    "career_insights": {{
-        "skill_gaps": ["string"],
-        "growth_areas": ["string"],
-        "industry_trends": ["string"]
-    }}
-}}"""
-
-        try:
-            # Generate response using Gemini
-            response = self.model.generate_content(prompt)
-            
-            # Parse the response
-            try:
-                self.llm_analysis = json.loads(response.text)
-            except json.JSONDecodeError:
-                # If response is not valid JSON, try to extract JSON part
-                json_match = re.search(r'\{.*\}', response.text, re.DOTALL)
-                if json_match:
-                    self.llm_analysis = json.loads(json_match.group())
-                else:
-                    raise ValueError("Could not parse Gemini response as JSON")
-            
-            logging.info("Completed LLM-based job analysis")
-            return self.llm_analysis
-            
-        except Exception as e:
-            logging.error(f"Error in LLM analysis: {e}")
-            return {
-                "error": "Failed to complete LLM analysis",
-                "details": str(e)
-            }
+"""Command line entry point: match a resume against the scraped job corpus.
 
-    def analyze_jobs(self, min_match_score=0.3):
-        """Analyze jobs and find matches"""
-        logging.info("Starting job analysis...")
-        
-        # Refresh job data by running scraper
-        get_csv_file()
-        
-        # Load scraped jobs
-        if not os.path.exists(self.csv_path):
-            raise FileNotFoundError(f"Scraped jobs CSV not found at {self.csv_path}")
-        if os.path.getsize(self.csv_path) == 0:
-            raise ValueError("Scraped jobs CSV is empty. Scraper likely failed or was blocked.")
-        self.df = pd.read_csv(self.csv_path)
-        if self.df.empty:
-            raise ValueError("Scraped jobs CSV has no rows.")
-        logging.info(f"Loaded {len(self.df)} jobs from CSV")
-        
-        # Prepare text for analysis
-        self.df['combined_text'] = self.df.apply(
-            lambda x: f"{x['title']} {x['description']} {x['company']}", axis=1
-        )
-        
-        # Create TF-IDF vectors
-        vectorizer = TfidfVectorizer(
-            lowercase=True,
-            stop_words='english',
-            ngram_range=(1, 2),
-            max_features=5000
-        )
-        
-        # Combine resume skills and job descriptions
-        all_texts = list(self.df['combined_text']) + [' '.join(self.skills)]
-        tfidf_matrix = vectorizer.fit_transform(all_texts)
-        
-        # Calculate similarity scores
-        cos_sim = cosine_similarity(tfidf_matrix[-1], tfidf_matrix[:-1]).flatten()
-        self.df['match_score'] = cos_sim
-        
-        # Add skill match percentage
-        total_skills = max(1, len(self.skills))
-        self.df['matched_skills'] = self.df['combined_text'].apply(
-            lambda x: [skill for skill in self.skills if skill.lower() in x.lower()]
-        )
-        self.df['skill_match_percent'] = self.df['matched_skills'].apply(
-            lambda x: len(x) / total_skills * 100
-        )
-        
-        # Calculate final score
-        self.df['final_score'] = (
-            0.6 * self.df['match_score'] + 
-            0.4 * (self.df['skill_match_percent'] / 100)
-        )
-        
-        # Filter and sort jobs
-        self.matched_jobs = self.df[
-            self.df['final_score'] > min_match_score
-        ].sort_values(
-            by='final_score', 
-            ascending=False
-        )
-        
-        logging.info(f"Found {len(self.matched_jobs)} matching jobs")
-        
-        # Get top jobs for LLM analysis
-        top_jobs = self.matched_jobs.head(5).to_dict('records')
-        
-        # Perform LLM analysis
-        llm_analysis = self.analyze_jobs_with_llm(top_jobs)
-        
-        return self.generate_report(llm_analysis)
-
-    def generate_report(self, llm_analysis=None):
-        """Generate detailed analysis report"""
-        if self.matched_jobs is None or len(self.matched_jobs) == 0:
-            return {
-                "analysis_date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                "total_jobs_analyzed": len(self.df) if self.df is not None else 0,
-                "matching_jobs_found": 0,
-                "top_matches": [],
-                "skill_analysis": {
-                    "your_skills": self.skills,
-                    "most_demanded_skills": {},
-                    "skill_gap_analysis": []
-                },
-                "error": "No matching jobs found."
-            }
-            
-        report = {
-            "analysis_date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "total_jobs_analyzed": len(self.df),
-            "matching_jobs_found": len(self.matched_jobs),
-            "top_matches": [],
-            "skill_analysis": {
-                "your_skills": self.skills,
-                "most_demanded_skills": self.get_most_demanded_skills(),
-                "skill_gap_analysis": self.get_skill_gap_analysis()
-            },
-            "llm_analysis": llm_analysis
-        }
-        
-        # Add top 10 matching jobs
-        for _, job in self.matched_jobs.head(10).iterrows():
-            report["top_matches"].append({
-                "title": job['title'],
-                "company": job['company'],
-                "location": job['location'],
-                "match_score": f"{job['final_score']:.2f}",
-                "matched_skills": job['matched_skills'],
-                "link": job['link']
-            })
-            
-        # Save report to file
-        with open('job_analysis_report.json', 'w') as f:
-            json.dump(report, f, indent=2)
-            
-        return report
-
-    def get_most_demanded_skills(self):
-        """Analyze most demanded skills from job postings"""
-        all_job_text = ' '.join(self.df['combined_text']).lower()
-        skill_frequency = {
-            skill.lower(): all_job_text.count(skill.lower())
-            for skill in self.skills
-        }
-        return dict(sorted(skill_frequency.items(), key=lambda x: x[1], reverse=True))
-
-    def get_skill_gap_analysis(self):
-        """Analyze potential skill gaps"""
-        common_tech_skills = [
-            'docker', 'kubernetes', 'aws', 'azure', 'gcp', 'ci/cd', 'jenkins',
-            'react', 'vue', 'angular', 'node.js', 'typescript', 'graphql',
-            'machine learning', 'python', 'java', 'golang', 'rust'
-        ]
-        
-        job_descriptions = ' '.join(self.df['description']).lower()
-        missing_skills = []
-        
-        for skill in common_tech_skills:
-            if (skill not in [s.lower() for s in self.skills] and 
-                job_descriptions.count(skill) > len(self.df) * 0.1):
-                missing_skills.append({
-                    'skill': skill,
-                    'demand_level': job_descriptions.count(skill) / len(self.df)
-                })
-                
-        return sorted(missing_skills, key=lambda x: x['demand_level'], reverse=True)
-
-def main():
+Kept deliberately thin; analyzer.py imports its heavy dependencies only on the code
+paths that need them, so argument handling and offline runs start fast
+(see bench_startup.py).
+"""
+import argparse
+import logging
+from analyzer import (
+    JobAnalyzer, REFRESH_MODES, REFRESH_MODE, CORPUS_TTL_HOURS, LLM_MODES, LLM_MODE, LLM_TOP_JOBS, LLM_CONCURRENCY,
+    SEMANTIC_MATCH
+)
+from llm_providers import LLM_PROVIDERS, LLM_PROVIDER
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Match a resume against scraped job postings")
+    parser.add_argument("--resume", default="Tushin_Resume.docx", help="resume file (PDF or DOCX)")
+    parser.add_argument("--refresh", choices=REFRESH_MODES, default=REFRESH_MODE,
+                        help="corpus freshness policy (default: %(default)s)")
+    parser.add_argument("--ttl-hours", type=float, default=CORPUS_TTL_HOURS,
+                        help="max corpus age before a keyword is re-scraped (default: %(default)s)")
+    parser.add_argument("--min-score", type=float, default=0.3, help="minimum final score for a match")
+    parser.add_argument("--no-llm", action="store_true", help="skip Gemini analysis (the SDK is never imported)")
+    parser.add_argument("--llm-provider", choices=LLM_PROVIDERS, default=LLM_PROVIDER,
+                        help="LLM backend; 'local' is a deterministic offline stand-in (default: %(default)s)")
+    parser.add_argument("--llm-mode", choices=LLM_MODES, default=LLM_MODE,
+                        help="one request per job or one prompt for all (default: %(default)s)")
+    parser.add_argument("--llm-top", type=int, default=LLM_TOP_JOBS,
+                        help="number of top matches sent to the LLM (default: %(default)s)")
+    parser.add_argument("--llm-concurrency", type=int, default=LLM_CONCURRENCY,
+                        help="LLM requests in flight in per_job mode (default: %(default)s)")
+    parser.add_argument("--semantic", action=argparse.BooleanOptionalAction, default=SEMANTIC_MATCH,
+                        help="blend dense LSA similarity into the match score (default: %(default)s)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
     try:
-        analyzer = JobAnalyzer("Tushin_Resume.docx")
+        analyzer = JobAnalyzer(args.resume, use_llm=not args.no_llm)
+        analyzer.llm_provider = args.llm_provider
+        analyzer.llm_mode = args.llm_mode
+        analyzer.llm_concurrency = args.llm_concurrency
+        analyzer.semantic_match = args.semantic
         analyzer.extract_text_from_pdf()
         analyzer.extract_skills()
         if not analyzer.skills:
             logging.warning("No skills extracted from resume. Matching quality may be low.")
-        report = analyzer.analyze_jobs()
+        report = analyzer.analyze_jobs(args.min_score, refresh=args.refresh, ttl_hours=args.ttl_hours,
+                                       llm_top_jobs=args.llm_top)
         
         # Print summary to console
         print("\n=== Job Analysis Summary ===")
@@ -355,22 +63,24 @@ def main():
                 print(f"Match Score: {job['match_score']}")
                 print(f"Link: {job['link']}")
             
-            if report.get('llm_analysis'):
+            llm_analysis = report.get('llm_analysis') or {}
+            if llm_analysis.get('disabled') or llm_analysis.get('error'):
+                print(f"\nLLM analysis skipped: {llm_analysis.get('reason') or llm_analysis.get('details')}")
+            elif llm_analysis.get('overall_assessment'):
                 print("\n=== LLM Analysis ===")
-                llm_analysis = report['llm_analysis']
                 print(f"\nOverall Fit Score: {llm_analysis['overall_assessment']['fit_score']}%")
                 print(f"Summary: {llm_analysis['overall_assessment']['summary']}")
                 
                 print("\nCareer Insights:")
-                for insight in llm_analysis['career_insights']['industry_trends']:
+                for insight in llm_analysis.get('career_insights', {}).get('industry_trends', []):
                     print(f"- {insight}")
                 
                 print("\nDetailed Job Analysis:")
-                for job_analysis in llm_analysis['job_analysis']:
-                    print(f"\n{job_analysis['job_title']} at {job_analysis['company']}")
-                    print(f"Fit Score: {job_analysis['fit_score']}%")
+                for job_analysis in llm_analysis.get('job_analysis', []):
+                    print(f"\n{job_analysis.get('job_title')} at {job_analysis.get('company')}")
+                    print(f"Fit Score: {job_analysis.get('fit_score')}%")
                     print("Strengths:")
-                    for strength in job_analysis['strengths']:
+                    for strength in job_analysis.get('strengths', []):
                         print(f"- {strength}")
         
         print("\nDetailed report saved to 'job_analysis_report.json'")
@@ -0,0 +1,60 @@
+"""Process-wide spaCy pipeline trimmed to named-entity recognition.
+
+Skill extraction only reads `doc.ents`, so the parser, tagger, lemmatizer and attribute
+ruler are excluded at load time. spaCy itself is imported and the model loaded lazily
+on first use, then shared by every JobAnalyzer and batch run in the process.
+"""
+import json
+import logging
+import os
+from threading import Lock
+
+SPACY_MODEL = os.getenv("SPACY_MODEL", "en_core_web_sm")
+NLP_BATCH_SIZE = int(os.getenv("NLP_BATCH_SIZE", "32"))
+NLP_N_PROCESS = int(os.getenv("NLP_N_PROCESS", "1"))
+
+# Components not needed for doc.ents (names missing from a model are ignored by spaCy)
+_EXCLUDE = ["parser", "tagger", "morphologizer", "lemmatizer", "attribute_ruler", "senter"]
+
+_nlp = None
+_nlp_lock = Lock()
+
+
+def get_nlp():
+    """Return the shared NER-only pipeline, loading it on first call."""
+    global _nlp
+    if _nlp is None:
+        with _nlp_lock:
+            if _nlp is None:
+                import spacy
+                nlp = spacy.load(SPACY_MODEL, exclude=_EXCLUDE)
+                # Drop the shared tok2vec too when NER carries its own embedding layer
+                if "tok2vec" in nlp.pipe_names and "ner" not in getattr(nlp.get_pipe("tok2vec"), "listening_components", []):
+                    nlp.remove_pipe("tok2vec")
+                logging.info(f"Loaded spaCy model {SPACY_MODEL} with pipes: {', '.join(nlp.pipe_names)}")
+                _nlp = nlp
+    return _nlp
+
+
+def pipe_docs(texts, batch_size=None, n_process=None):
+    """Yield docs for many texts using nlp.pipe (n_process > 1 forks worker processes)."""
+    return get_nlp().pipe(
+        texts,
+        batch_size=batch_size or NLP_BATCH_SIZE,
+        n_process=n_process or NLP_N_PROCESS
+    )
+
+
+def model_version(name=None) -> str:
+    """Installed version of a spaCy model (package or directory) without importing spaCy."""
+    name = name or SPACY_MODEL
+    try:
+        from importlib.metadata import PackageNotFoundError, version
+        return version(name)
+    except PackageNotFoundError:
+        pass
+    try:
+        with open(os.path.join(name, "meta.json")) as f:
+            return json.load(f).get("version", "unknown")
+    except (OSError, ValueError):
+        return "unknown"
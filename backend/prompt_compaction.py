@@ -0,0 +1,138 @@
+"""Token-budgeted compaction of LLM prompt inputs.
+
+Job records carry every store column plus `combined_text` (a second copy of the description)
+and descriptions are often 5-10k characters, so raw prompts vary wildly in size and latency.
+Compaction keeps only PROMPT_JOB_FIELDS, reduces each description to its most relevant
+sentences (distinct resume skills mentioned, plus TF-IDF similarity to the resume when the
+job index vectorizer is available) and trims the resume at section boundaries. Job lists are
+measured as rendered and the lowest-ranked jobs are dropped when even short descriptions would
+not fit, so every prompt fits LLM_PROMPT_TOKENS.
+"""
+import json
+import os
+import re
+
+LLM_PROMPT_TOKENS = int(os.getenv("LLM_PROMPT_TOKENS", "4000"))  # hard cap per prompt
+LLM_JOB_TOKENS = int(os.getenv("LLM_JOB_TOKENS", "400"))  # description budget per job
+LLM_RESUME_TOKENS = int(os.getenv("LLM_RESUME_TOKENS", "300"))
+CHARS_PER_TOKEN = 4  # rough average for English prose; only used for budgeting
+MIN_DESCRIPTION_CHARS = 200
+
+# Everything else (combined_text, scores, page_url, timestamps...) is dropped from prompts
+PROMPT_JOB_FIELDS = ("title", "company", "location", "matched_skills", "description")
+
+_SENTENCE_BREAK = re.compile(r"(?<=[.!?;])\s+|\s*[•·▪●]\s*|\n+")
+_BLANK_LINE = re.compile(r"\n\s*\n")
+
+
+def estimate_tokens(text: str) -> int:
+    return -(-len(text or "") // CHARS_PER_TOKEN)
+
+
+def split_sentences(text: str):
+    return [" ".join(s.split()) for s in _SENTENCE_BREAK.split(text or "") if s and s.strip()]
+
+
+def _cut(text: str, max_chars: int) -> str:
+    """Shorten at a word boundary."""
+    if len(text) <= max_chars:
+        return text
+    return text[:max(0, max_chars - 1)].rsplit(" ", 1)[0] + "…"
+
+
+class SentenceRanker:
+    """Scores sentences by distinct skills mentioned plus TF-IDF similarity to the skill query."""
+
+    def __init__(self, skills, vectorizer=None):
+        from skill_matcher import SkillMatcher
+        self.matcher = SkillMatcher(skills or [])
+        self.vectorizer = vectorizer
+        self._query = None
+        if vectorizer is not None and skills:
+            self._query = vectorizer.transform([" ".join(skills)])
+
+    def scores(self, sentences):
+        scores = self.matcher.match_counts(self.matcher.count_matrix(sentences)).astype(float)
+        if self._query is not None:
+            # rows are L2-normalized, so the dot product is the cosine similarity (0..1)
+            scores += (self.vectorizer.transform(sentences) @ self._query.T).toarray().ravel()
+        return scores
+
+    def select(self, text: str, max_chars: int) -> str:
+        """Most relevant sentences of `text` that fit in max_chars, kept in their original order."""
+        text = text or ""
+        if max_chars <= 0:
+            return ""
+        if len(" ".join(text.split())) <= max_chars:
+            return " ".join(text.split())
+        # boilerplate (EEO statements, benefits) is often repeated verbatim
+        unique = {}
+        for sentence in split_sentences(text):
+            unique.setdefault(sentence.lower(), sentence)
+        sentences = list(unique.values())
+        if not sentences:
+            return ""
+        scores = self.scores(sentences)
+        picked, used = [], 0
+        for i in sorted(range(len(sentences)), key=lambda i: (-scores[i], i)):
+            cost = len(sentences[i]) + (1 if picked else 0)
+            if used + cost <= max_chars:
+                picked.append(i)
+                used += cost
+        if not picked:
+            return _cut(sentences[int(scores.argmax())], max_chars)
+        return " ".join(sentences[i] for i in sorted(picked))
+
+
+def compact_resume(text: str, max_chars: int) -> str:
+    """Whole resume sections (blank-line separated blocks, else lines) in order, as many as fit.
+
+    A section that does not fit is skipped rather than cut, so later short sections (e.g.
+    Skills) still make it in; only a single oversized first line is ever shortened."""
+    blocks = [b.strip() for b in _BLANK_LINE.split(text or "") if b.strip()]
+    if len(blocks) <= 1:
+        blocks = [line.strip() for line in (text or "").splitlines() if line.strip()]
+    picked, used = [], 0
+    for block in blocks:
+        block = "\n".join(" ".join(line.split()) for line in block.splitlines() if line.strip())
+        cost = len(block) + (2 if picked else 0)
+        if used + cost <= max_chars:
+            picked.append(block)
+            used += cost
+    if not picked and blocks:
+        return _cut(" ".join(blocks[0].split()), max_chars)
+    return "\n\n".join(picked)
+
+
+def _render_jobs(jobs) -> str:
+    return json.dumps(jobs, indent=1, ensure_ascii=False, default=str)
+
+
+def compact_jobs(jobs, ranker: SentenceRanker, max_chars: int, job_tokens: int = LLM_JOB_TOKENS, render=None):
+    """PROMPT_JOB_FIELDS of each job with descriptions shrunk so render(jobs) fits max_chars.
+
+    `jobs` are expected best first: when fewer than MIN_DESCRIPTION_CHARS per job would remain,
+    the lowest-ranked jobs are dropped (never the first), so the result may be shorter than
+    `jobs`. Descriptions are then shrunk until the rendered list fits; a job list whose fields
+    alone exceed max_chars ends up with empty descriptions."""
+    render = render or _render_jobs
+    slim = [{field: job.get(field) for field in PROMPT_JOB_FIELDS} for job in jobs]
+    if not slim:
+        return slim
+    sources = [str(job.get("description") or "") for job in slim]
+
+    def room(records):
+        # what the rendered records leave for descriptions
+        return max_chars - len(render([{**job, "description": ""} for job in records]))
+
+    while len(slim) > 1 and room(slim) // len(slim) < MIN_DESCRIPTION_CHARS:
+        slim.pop()
+    per_job = max(0, min(job_tokens * CHARS_PER_TOKEN, room(slim) // len(slim)))
+    while True:
+        for job, source in zip(slim, sources):
+            job["description"] = ranker.select(source, per_job)
+        # escaping in the rendered text can still push it over; shrink by the overflow and retry
+        over = len(render(slim)) - max_chars
+        if over <= 0 or per_job == 0:
+            return slim
+        per_job = max(0, per_job - -(-over // len(slim)))
@@ -0,0 +1,132 @@
+"""Process-wide adaptive rate limiter shared by every scraper thread and coroutine.
+
+A token bucket paces requests (page loads, scrolls, clicks, HTTP fetches) across the whole
+process. Its refill rate follows AIMD: each healthy response adds RATE_INCREASE requests/sec
+up to RATE_MAX, and each throttling signal (HTTP 429/999, auth wall, unexpectedly empty
+card list) multiplies it by RATE_DECREASE and pauses everyone for RATE_COOLDOWN_SECONDS.
+Aggregate throughput therefore tracks what the site tolerates instead of a fixed
+worst-case sleep per thread.
+"""
+import asyncio
+import logging
+import os
+import random
+import time
+from collections import Counter
+from threading import Lock
+
+RATE_INITIAL = float(os.getenv("RATE_INITIAL", "2"))  # requests/sec across the process
+RATE_MIN = float(os.getenv("RATE_MIN", "0.2"))
+RATE_MAX = float(os.getenv("RATE_MAX", "10"))
+RATE_BURST = float(os.getenv("RATE_BURST", "3"))  # tokens that can accumulate while idle
+RATE_INCREASE = float(os.getenv("RATE_INCREASE", "0.05"))  # additive increase per healthy response
+RATE_DECREASE = float(os.getenv("RATE_DECREASE", "0.5"))  # multiplicative decrease per throttle signal
+RATE_COOLDOWN_SECONDS = float(os.getenv("RATE_COOLDOWN_SECONDS", "15"))
+RATE_JITTER = float(os.getenv("RATE_JITTER", "0.25"))  # +/- fraction of randomness on each wait
+
+THROTTLE_STATUS = (429, 999)  # LinkedIn answers 999 when it suspects automation
+_BLOCK_MARKERS = ("authwall", "/login", "/checkpoint/", "/uas/login")
+
+
+def looks_blocked(url: str = "", status: int = 200, text: str = "") -> str:
+    """Return a throttle reason ("http_429", "auth_wall") for a response, or "" if it looks healthy."""
+    if status in THROTTLE_STATUS or "too many requests" in (text or "")[:2000].lower():
+        return "http_429"
+    if any(marker in (url or "") for marker in _BLOCK_MARKERS):
+        return "auth_wall"
+    return ""
+
+
+class AdaptiveRateLimiter:
+    """Thread-safe token bucket whose rate adapts with additive increase / multiplicative decrease."""
+
+    def __init__(self, rate: float = RATE_INITIAL, min_rate: float = RATE_MIN, max_rate: float = RATE_MAX,
+                 burst: float = RATE_BURST, increase: float = RATE_INCREASE, decrease: float = RATE_DECREASE,
+                 cooldown: float = RATE_COOLDOWN_SECONDS, jitter: float = RATE_JITTER):
+        self._lock = Lock()
+        self.configure(rate, min_rate, max_rate, burst, increase, decrease, cooldown, jitter)
+
+    def configure(self, rate: float = RATE_INITIAL, min_rate: float = RATE_MIN, max_rate: float = RATE_MAX,
+                  burst: float = RATE_BURST, increase: float = RATE_INCREASE, decrease: float = RATE_DECREASE,
+                  cooldown: float = RATE_COOLDOWN_SECONDS, jitter: float = RATE_JITTER):
+        """Reset limits and counters (used by benchmarks and tests)."""
+        with self._lock:
+            self.min_rate = min_rate
+            self.max_rate = max(max_rate, min_rate)
+            self._rate = min(max(rate, self.min_rate), self.max_rate)
+            self.burst = max(1.0, burst)
+            self.increase = increase
+            self.decrease = decrease
+            self.cooldown = cooldown
+            self.jitter = jitter
+            self._tokens = 1.0
+            self._updated = time.monotonic()
+            self._paused_until = 0.0
+            self.stats = {"acquired": 0, "waited_seconds": 0.0, "successes": 0, "throttled": Counter()}
+
+    @property
+    def rate(self) -> float:
+        """Current refill rate in requests/sec."""
+        return self._rate
+
+    def _reserve(self, cost: float) -> float:
+        """Take `cost` tokens (possibly going into debt) and return how long the caller must wait."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self._rate)
+            self._updated = now
+            self._tokens -= cost
+            # queue behind any cooldown, then behind earlier reservations (negative tokens)
+            wait = max(0.0, self._paused_until - now) + max(0.0, -self._tokens / self._rate)
+            if wait and self.jitter:
+                wait *= 1 + random.uniform(-self.jitter, self.jitter)
+            self.stats["acquired"] += 1
+            self.stats["waited_seconds"] += wait
+            return wait
+
+    def acquire(self, cost: float = 1.0) -> float:
+        """Block until the caller may issue `cost` requests. Returns the seconds waited."""
+        wait = self._reserve(cost)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, cost: float = 1.0) -> float:
+        """asyncio variant of acquire() sharing the same bucket."""
+        wait = self._reserve(cost)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def success(self):
+        """Record a healthy response: additive increase."""
+        with self._lock:
+            self._rate = min(self.max_rate, self._rate + self.increase)
+            self.stats["successes"] += 1
+
+    def throttled(self, reason: str = "throttled"):
+        """Record a throttling signal: multiplicative decrease plus a shared cooldown."""
+        with self._lock:
+            now = time.monotonic()
+            self.stats["throttled"][reason] += 1
+            if now < self._paused_until:
+                return  # other threads already reported this episode; decrease once per cooldown
+            self._rate = max(self.min_rate, self._rate * self.decrease)
+            self._paused_until = now + self.cooldown
+            self._tokens = min(self._tokens, 0.0)
+            rate = self._rate
+        logging.warning("Throttling detected (%s); backing off to %.2f req/s for %.0fs", reason, rate, self.cooldown)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "rate": round(self._rate, 3),
+                "acquired": self.stats["acquired"],
+                "waited_seconds": round(self.stats["waited_seconds"], 3),
+                "successes": self.stats["successes"],
+                "throttled": dict(self.stats["throttled"]),
+            }
+
+
+# The one limiter every backend shares
+limiter = AdaptiveRateLimiter()
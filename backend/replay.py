@@ -0,0 +1,379 @@
+"""Record/replay harness for the LinkedIn scraper.
+
+Record once against live LinkedIn:
+
+    python replay.py record --keyword "Software Engineer" --out fixtures/
+
+Then serve the fixtures from a local stand-in that mimics the public search page
+(infinite scroll, "See more jobs" button, end-of-list marker, show-more-less-html__markup
+detail pane):
+
+    python replay.py serve --fixtures fixtures/ --port 8765
+    JOB_SEARCH_URL="http://127.0.0.1:8765/jobs/search?keywords={keyword}&pageNum=0" python scraper.py
+
+The server only needs the standard library; recording imports scraper.py (selenium) lazily.
+"""
+import argparse
+import html
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote, urlparse
+
+from job_records import job_id_from_link
+
+logging.basicConfig(level=logging.INFO, format='[%(levelname)s] %(message)s')
+
+BASE_DIR = os.path.dirname(__file__)
+DEFAULT_FIXTURES_DIR = os.path.join(BASE_DIR, "fixtures")
+
+# Cards per initial page / per scroll batch, and how many batches auto-load on scroll
+# before the "See more jobs" button takes over (roughly what public LinkedIn does).
+REPLAY_BATCH_SIZE = int(os.getenv("REPLAY_BATCH_SIZE", "25"))
+REPLAY_SCROLL_BATCHES = int(os.getenv("REPLAY_SCROLL_BATCHES", "3"))
+REPLAY_LATENCY = float(os.getenv("REPLAY_LATENCY", "0"))  # seconds added to every response
+
+
+def _slug(keyword: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", keyword.lower()).strip("-") or "keyword"
+
+
+def save_fixture(keyword: str, cards, out_dir: str = DEFAULT_FIXTURES_DIR) -> str:
+    """Write one keyword's cards ([{job_id, card_html, detail_html}]) to <out_dir>/<slug>.json."""
+    os.makedirs(out_dir, exist_ok=True)
+    path = os.path.join(out_dir, f"{_slug(keyword)}.json")
+    with open(path, "w") as f:
+        json.dump({
+            "keyword": keyword,
+            "recorded_at": datetime.now().isoformat(timespec="seconds"),
+            "cards": cards
+        }, f)
+    logging.info("Saved %d cards for %r to %s", len(cards), keyword, path)
+    return path
+
+
+def load_fixtures(fixtures_dir: str = DEFAULT_FIXTURES_DIR):
+    """Return {keyword_lower: [card, ...]} for every fixture file in the directory."""
+    fixtures = {}
+    if not os.path.isdir(fixtures_dir):
+        return fixtures
+    for name in sorted(os.listdir(fixtures_dir)):
+        if not name.endswith(".json"):
+            continue
+        with open(os.path.join(fixtures_dir, name)) as f:
+            data = json.load(f)
+        fixtures[data["keyword"].lower()] = data["cards"]
+    return fixtures
+
+
+def synthetic_fixtures(keywords, cards_per_keyword: int = 500, description_words: int = 300):
+    """Generate LinkedIn-shaped cards so benchmarks can run without a recording."""
+    filler = ("python sql aws docker kubernetes react machine learning data pipelines "
+              "microservices agile testing ownership collaboration scale reliability").split()
+    fixtures = {}
+    for k_idx, keyword in enumerate(keywords):
+        cards = []
+        for i in range(cards_per_keyword):
+            job_id = str(4000000000 + k_idx * 1000000 + i)
+            title = f"{keyword} {i}"
+            link = f"https://www.linkedin.com/jobs/view/{_slug(title)}-{job_id}"
+            words = " ".join(filler[(i + w) % len(filler)] for w in range(description_words))
+            cards.append({
+                "job_id": job_id,
+                "card_html": (
+                    f'<div class="base-card" data-entity-urn="urn:li:jobPosting:{job_id}">'
+                    f'<a class="base-card__full-link" href="{link}"><span class="sr-only">{html.escape(title)}</span></a>'
+                    f'<div class="base-search-card__info">'
+                    f'<h3 class="base-search-card__title">{html.escape(title)}</h3>'
+                    f'<h4 class="base-search-card__subtitle">Company {i % 97}</h4>'
+                    f'<div class="base-search-card__metadata">'
+                    f'<span class="job-search-card__location">City {i % 31}, CA</span>'
+                    f'<time class="job-search-card__listdate" datetime="2025-01-01">{1 + i % 28} days ago</time>'
+                    f'</div></div></div>'
+                ),
+                "detail_html": f'<div class="show-more-less-html__markup">{html.escape(title)}: {words}</div>'
+            })
+        fixtures[keyword.lower()] = cards
+    return fixtures
+
+
+# ---------------------------------------------------------------------------
+# Recording
+# ---------------------------------------------------------------------------
+
+_CARD_HTML_JS = """
+return Array.from(document.querySelectorAll('div.base-card')).map(card => {
+    const a = card.querySelector('a.base-card__full-link');
+    return {urn: card.getAttribute('data-entity-urn') || '', link: a ? a.href : '', html: card.outerHTML};
+});
+"""
+
+def record_keyword(keyword: str, out_dir: str = DEFAULT_FIXTURES_DIR, max_cards: int = 0) -> str:
+    """Load one live search page (scroll + see more), then capture every card and its detail pane."""
+    import scraper  # selenium only needed when recording
+
+    url = scraper.job_boards[0].format(keyword=keyword.replace(" ", "%20"))
+    driver = scraper._init_driver(url)
+    if not driver:
+        raise RuntimeError("Could not launch a browser for recording")
+    try:
+        driver.get(url)
+        scraper.install_overlay_suppressor(driver)
+        scraper._scroll_to_load_all_jobs(driver)
+        if scraper._see_more_present(driver):
+            scraper._click_see_more(driver, keyword, seen_before=0)
+        driver.set_script_timeout(scraper.DETAIL_WAIT_SECONDS + 5)
+        raw_cards = driver.execute_script(_CARD_HTML_JS) or []
+        if max_cards:
+            raw_cards = raw_cards[:max_cards]
+        cards = []
+        for idx, raw in enumerate(raw_cards):
+            job_id = raw["urn"].rsplit(":", 1)[-1] if raw["urn"] else job_id_from_link(raw["link"])
+            job_id = job_id or str(idx)
+            scraper.limiter.acquire()
+            try:
+                detail = driver.execute_async_script(scraper._READ_DETAIL_JS, idx,
+                                                     int(scraper.DETAIL_WAIT_SECONDS * 1000), True)
+            except Exception as e:
+                logging.debug("Detail capture failed for card %d: %s", idx, e)
+                detail = None
+            cards.append({"job_id": job_id, "card_html": raw["html"], "detail_html": detail or ""})
+    finally:
+        try:
+            driver.quit()
+        except Exception:
+            pass
+    return save_fixture(keyword, cards, out_dir)
+
+
+# ---------------------------------------------------------------------------
+# Replay server
+# ---------------------------------------------------------------------------
+
+_PAGE_TEMPLATE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{title} | Replay</title>
+<style>
+  div.base-card {{ min-height: 96px; border-bottom: 1px solid #ddd; }}
+  #detail-pane {{ position: fixed; right: 0; top: 0; width: 40%; height: 100%; overflow: auto; }}
+</style></head>
+<body>
+<ul class="jobs-search__results-list">{cards}</ul>
+<div id="detail-pane"></div>
+<script>
+const CFG = {config};
+const list = document.querySelector('.jobs-search__results-list');
+const pane = document.getElementById('detail-pane');
+let next = CFG.start + CFG.initial, autoLoads = 0, loading = false;
+
+function seeMoreButton() {{ return document.querySelector('button.infinite-scroller__show-more-button'); }}
+function syncButton() {{
+  const want = autoLoads >= CFG.scrollBatches && next < CFG.end;
+  const btn = seeMoreButton();
+  if (want && !btn) {{
+    const b = document.createElement('button');
+    b.className = 'infinite-scroller__show-more-button';
+    b.setAttribute('aria-label', 'See more jobs');
+    b.textContent = 'See more jobs';
+    b.addEventListener('click', loadMore);
+    document.body.insertBefore(b, pane);
+  }} else if (!want && btn) {{
+    btn.remove();
+  }}
+  if (next >= CFG.end && !document.querySelector('.see-more-jobs__viewed-all')) {{
+    const done = document.createElement('p');
+    done.className = 'see-more-jobs__viewed-all';
+    done.textContent = "You've viewed all jobs for this search";
+    document.body.insertBefore(done, pane);
+  }}
+}}
+function loadMore() {{
+  if (loading || next >= CFG.end) return;
+  loading = true;
+  fetch(CFG.moreUrl + '&start=' + next).then(r => r.text()).then(html => {{
+    list.insertAdjacentHTML('beforeend', html);
+    next += CFG.batch;
+    loading = false;
+    syncButton();
+  }});
+}}
+window.addEventListener('scroll', () => {{
+  if (autoLoads < CFG.scrollBatches && window.innerHeight + window.scrollY >= document.body.scrollHeight - 50) {{
+    autoLoads++;
+    loadMore();
+  }}
+}});
+document.addEventListener('click', e => {{
+  const card = e.target.closest('div.base-card');
+  if (!card) return;
+  e.preventDefault();
+  fetch(CFG.detailUrl + card.dataset.jobId).then(r => r.text()).then(html => {{ pane.innerHTML = html; }});
+}});
+syncButton();
+</script>
+</body></html>
+"""
+
+
+class _ReplayHandler(BaseHTTPRequestHandler):
+    server_version = "LinkedInReplay/1.0"
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real site (every response sets Content-Length)
+
+    def log_message(self, fmt, *args):  # keep benchmark output clean
+        logging.debug("replay: " + fmt, *args)
+
+    def _send(self, route: str, status: int, body: str, content_type: str = "text/html; charset=utf-8"):
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+        with self.server.stats_lock:
+            self.server.stats[route] += 1
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        params = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+        keyword = params.get("keywords", "")
+        start = int(params.get("start", "0") or 0)
+        srv = self.server
+        if parsed.path == "/jobs/search":
+            return self._send("search", 200, srv.render_search_page(keyword, start))
+        if parsed.path == "/jobs-guest/jobs/api/seeMoreJobPostings/search":
+            cards = srv.cards_for(keyword)[start:start + srv.batch_size]
+            return self._send("see_more", 200, "".join(srv.card_li(c) for c in cards))
+        if parsed.path.startswith("/jobs-guest/jobs/api/jobPosting/"):
+            card = srv.details.get(parsed.path.rsplit("/", 1)[-1])
+            if card is None:
+                return self._send("detail", 404, "not found", "text/plain")
+            return self._send("detail", 200, card.get("detail_html") or "")
+        if parsed.path.startswith("/jobs/view/"):
+            job_id = job_id_from_link(parsed.path)
+            card = srv.details.get(job_id or "")
+            if card is None:
+                return self._send("view", 404, "not found", "text/plain")
+            return self._send("view", 200, f"<html><body>{card['card_html']}{card.get('detail_html') or ''}</body></html>")
+        return self._send("other", 404, "not found", "text/plain")
+
+
+class ReplayServer(ThreadingHTTPServer):
+    """Local HTTP stand-in for public LinkedIn job search, backed by recorded or synthetic fixtures.
+
+    Routes:
+      /jobs/search?keywords=..&start=N                   search page (first batch + scroll/see-more JS)
+      /jobs-guest/jobs/api/seeMoreJobPostings/search     next batch of card fragments
+      /jobs-guest/jobs/api/jobPosting/<job_id>           detail pane fragment
+      /jobs/view/<slug>-<job_id>                         standalone job page
+    """
+    daemon_threads = True
+    request_queue_size = 128  # listen backlog; the default of 5 drops SYNs under concurrent clients
+
+    def __init__(self, fixtures, host: str = "127.0.0.1", port: int = 0,
+                 batch_size: int = REPLAY_BATCH_SIZE, scroll_batches: int = REPLAY_SCROLL_BATCHES,
+                 latency: float = REPLAY_LATENCY):
+        super().__init__((host, port), _ReplayHandler)
+        self.fixtures = {k.lower(): v for k, v in fixtures.items()}
+        self.details = {c["job_id"]: c for cards in self.fixtures.values() for c in cards}
+        self.batch_size = batch_size
+        self.scroll_batches = scroll_batches
+        self.latency = latency
+        self.stats = defaultdict(int)  # responses per route, for benchmarks
+        self.stats_lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def search_url_template(self) -> str:
+        """Drop-in replacement for scraper.job_boards[0]."""
+        return f"{self.base_url}/jobs/search?keywords={{keyword}}&location=&position=1&pageNum=0"
+
+    def cards_for(self, keyword: str):
+        return self.fixtures.get(keyword.lower(), [])
+
+    @staticmethod
+    def card_li(card) -> str:
+        # data-job-id lets the page script fetch the right detail pane on click
+        card_html = re.sub(r"^<div", f'<div data-job-id="{card["job_id"]}"', card["card_html"].lstrip(), count=1)
+        return f"<li>{card_html}</li>"
+
+    def render_search_page(self, keyword: str, start: int) -> str:
+        cards = self.cards_for(keyword)
+        first = cards[start:start + self.batch_size]
+        config = {
+            "start": start,
+            "initial": len(first),
+            "end": len(cards),
+            "batch": self.batch_size,
+            "scrollBatches": self.scroll_batches,
+            "moreUrl": f"/jobs-guest/jobs/api/seeMoreJobPostings/search?keywords={quote(keyword)}",
+            "detailUrl": "/jobs-guest/jobs/api/jobPosting/",
+        }
+        return _PAGE_TEMPLATE.format(
+            title=html.escape(keyword),
+            cards="".join(self.card_li(c) for c in first),
+            config=json.dumps(config)
+        )
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, name="replay-server", daemon=True)
+        self._thread.start()
+        logging.info("Replay server on %s (%d keywords, %d cards)", self.base_url,
+                     len(self.fixtures), len(self.details))
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record or replay LinkedIn search fixtures")
+    sub = parser.add_subparsers(dest="command", required=True)
+    rec = sub.add_parser("record", help="capture live search + detail HTML")
+    rec.add_argument("--keyword", action="append", required=True)
+    rec.add_argument("--out", default=DEFAULT_FIXTURES_DIR)
+    rec.add_argument("--max-cards", type=int, default=0)
+    srv = sub.add_parser("serve", help="serve fixtures on a local port")
+    srv.add_argument("--fixtures", default=DEFAULT_FIXTURES_DIR)
+    srv.add_argument("--synthetic", type=int, default=0, help="ignore fixtures, generate N cards per keyword")
+    srv.add_argument("--keyword", action="append", default=[])
+    srv.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    if args.command == "record":
+        for kw in args.keyword:
+            record_keyword(kw, args.out, args.max_cards)
+        return
+    if args.synthetic:
+        fixtures = synthetic_fixtures(args.keyword or ["Software Engineer"], args.synthetic)
+    else:
+        fixtures = load_fixtures(args.fixtures)
+    with ReplayServer(fixtures, port=args.port) as server:
+        print(f"JOB_SEARCH_URL={server.search_url_template}")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Content-addressed on-disk cache of parsed resumes.
+
+Entries are keyed by the blake2b digest of the resume file's bytes, so a renamed or copied
+file still hits and an edited one misses. Each entry holds the extracted text plus, per
+skill-extraction version (skill patterns, spaCy model and its version, see
+`analyzer.skill_extraction_version`), the entities and skills found in it. An unchanged
+resume therefore skips PDF/DOCX extraction and the spaCy pass entirely; changing the
+patterns or the model only redoes the spaCy pass.
+
+    python resume_cache.py stats
+    python resume_cache.py clear
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+
+BASE_DIR = os.path.dirname(__file__)
+RESUME_CACHE_DIR = os.getenv("RESUME_CACHE_DIR", os.path.join(BASE_DIR, "resume_cache"))
+RESUME_CACHE = os.getenv("RESUME_CACHE", "true").lower() in ("1", "true", "yes")
+
+
+def file_digest(path: str) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+class ResumeCache:
+    """One JSON file per resume digest: {"text": ..., "analyses": {version: {"entities", "skills"}}}."""
+
+    def __init__(self, path: str = None):
+        self.path = path or RESUME_CACHE_DIR
+
+    def _file(self, digest: str) -> str:
+        return os.path.join(self.path, f"{digest}.json")
+
+    def get(self, digest: str):
+        """The cached entry for a digest, or None."""
+        try:
+            with open(self._file(digest)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def text(self, digest: str):
+        entry = self.get(digest)
+        return entry["text"] if entry else None
+
+    def analysis(self, digest: str, version: str):
+        """{"entities": [[text, label], ...], "skills": [...]} for a version, or None."""
+        entry = self.get(digest)
+        return (entry or {}).get("analyses", {}).get(version)
+
+    def put(self, digest: str, text: str, version: str = None, entities=None, skills=None):
+        """Store the text of a resume and, with a version, its entities and skills."""
+        entry = self.get(digest) or {"analyses": {}}
+        entry["text"] = text
+        if version is not None:
+            entry["analyses"][version] = {"entities": [list(e) for e in entities or []], "skills": list(skills or [])}
+        os.makedirs(self.path, exist_ok=True)
+        # unique temp name: batch runs and concurrent CLI runs may write the same digest
+        tmp = f"{self._file(digest)}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(entry, f)
+        os.replace(tmp, self._file(digest))
+
+    def clear(self):
+        for name in self._entries():
+            os.remove(os.path.join(self.path, name))
+
+    def summary(self) -> dict:
+        names = self._entries()
+        return {"entries": len(names), "bytes": sum(os.path.getsize(os.path.join(self.path, n)) for n in names)}
+
+    def _entries(self):
+        if not os.path.isdir(self.path):
+            return []
+        return [name for name in os.listdir(self.path) if name.endswith(".json")]
+
+
+def open_resume_cache(path: str = None):
+    """The resume cache, or None when disabled with RESUME_CACHE=false."""
+    return ResumeCache(path) if RESUME_CACHE else None
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format='[%(levelname)s] %(message)s')
+    parser = argparse.ArgumentParser(description="Inspect the parsed-resume cache")
+    parser.add_argument("command", choices=["stats", "clear"])
+    parser.add_argument("--path", default=None, help="cache directory (defaults to RESUME_CACHE_DIR)")
+    args = parser.parse_args()
+
+    cache = ResumeCache(args.path)
+    if args.command == "stats":
+        summary = cache.summary()
+        print(f"{summary['entries']} resumes, {summary['bytes'] / 1024:.1f} KiB in {cache.path}")
+    else:
+        cache.clear()
+        print(f"Cleared {cache.path}")
+
+
+if __name__ == "__main__":
+    main()
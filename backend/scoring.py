@@ -0,0 +1,151 @@
+"""Chunked resume-vs-corpus scoring with a running top-k.
+
+The corpus arrives as DataFrame chunks of SCORE_CHUNK_ROWS postings streamed from the job
+store (analyzer.JobCorpus). Each chunk is scored (one sparse row slice of the job index
+times the resume vector, one skill count pass over the chunk's text) and only the best k
+candidates seen so far are kept, rows included, merged with `np.argpartition`. Nothing is
+sorted except the final k rows, so peak memory is bounded by the chunk size, not the
+corpus size.
+
+With a semantic index (see semantic_index.py) the match component blends the TF-IDF cosine
+with the dense LSA cosine of the same rows, so related wording scores without exact terms.
+"""
+import logging
+import os
+import time
+
+import numpy as np
+import scipy.sparse as sp
+
+from skill_matcher import SkillMatcher
+
+SCORE_CHUNK_ROWS = int(os.getenv("SCORE_CHUNK_ROWS", "20000"))
+# final_score cut-offs reported alongside the top-k (match distribution)
+SCORE_THRESHOLDS = (0.3, 0.5, 0.7)
+
+
+def _merge_top(scores, order, rows, chunk_scores, chunk_order, chunk_rows, k):
+    """Best k of the running candidates plus a chunk's candidates: scores, corpus order and rows."""
+    import pandas as pd
+    scores = np.concatenate([scores, chunk_scores])
+    order = np.concatenate([order, chunk_order])
+    rows = chunk_rows if rows is None else pd.concat([rows, chunk_rows])
+    if len(scores) > k:
+        keep = np.argpartition(-scores, k - 1)[:k]
+        scores, order, rows = scores[keep], order[keep], rows.iloc[keep]
+    return scores, order, rows
+
+
+class ScoringKernel:
+    """final_score of one or more resumes (skill lists) against rows of the job index.
+
+    The one definition of a match shared by score_jobs (main.py) and batch.py:
+    final = match_weight * match + skill_weight * share of the resume's skills in the job text,
+    where match is the TF-IDF cosine of the job and the joined skills, blended with the dense
+    LSA cosine when a synced `semantic_index` is given:
+    (1 - semantic_blend) * tfidf + semantic_blend * semantic."""
+
+    def __init__(self, job_index, resume_skills, match_weight: float = 0.6, skill_weight: float = 0.4,
+                 semantic_index=None, semantic_blend: float = 0.5):
+        self.job_index = job_index
+        self.match_weight = match_weight
+        self.skill_weight = skill_weight
+        self.semantic_index = semantic_index
+        self.semantic_blend = semantic_blend
+        resume_skills = [[s for s in skills if s and s.strip()] for skills in resume_skills]
+        self.queries = job_index.transform([" ".join(skills) for skills in resume_skills])
+        self.dense = semantic_index.embed_rows(self.queries) if semantic_index is not None else None
+        # One corpus scan for the union of all resumes' skills, then one sparse product per chunk
+        self.matcher = SkillMatcher(list(dict.fromkeys(s for skills in resume_skills for s in skills)))
+        col = {skill: i for i, skill in enumerate(self.matcher.skills)}
+        rows = [r for r, skills in enumerate(resume_skills) for _ in dict.fromkeys(skills)]
+        cols = [col[s] for skills in resume_skills for s in dict.fromkeys(skills)]
+        self.owned = sp.csr_matrix((np.ones(len(rows), dtype=np.float32), (rows, cols)),
+                                   shape=(len(resume_skills), len(self.matcher.skills)))
+        self.totals = np.maximum(1, np.diff(self.owned.indptr)).astype(np.float32)[:, None]
+
+    def score(self, positions, texts) -> dict:
+        """Scores of every resume (rows) against the given job index rows and their texts (columns).
+
+        Returns {"final", "match", "semantic" (None without a semantic index), "skill_share"} as
+        resumes x jobs arrays, plus "hits", the jobs x union-skill presence matrix."""
+        match = (self.job_index.matrix[positions] @ self.queries.T).toarray().T
+        semantic = None
+        blended = match
+        if self.dense is not None:
+            # negative LSA cosines carry no signal for ranking matches
+            semantic = np.clip(self.dense @ np.asarray(self.semantic_index.vectors[positions]).T, 0.0, 1.0)
+            blended = (1 - self.semantic_blend) * match + self.semantic_blend * semantic
+        hits = (self.matcher.count_matrix(texts) > 0).astype(np.float32).tocsr()
+        skill_share = (self.owned @ hits.T).toarray() / self.totals
+        return {
+            "final": self.match_weight * blended + self.skill_weight * skill_share,
+            "match": match,
+            "semantic": semantic,
+            "skill_share": skill_share,
+            "hits": hits,
+        }
+
+    def matched_skills(self, resume: int, hits, row: int):
+        """The resume's skills found in row `row` of a `hits` matrix, in skill order."""
+        found = set(hits.indices[hits.indptr[row]:hits.indptr[row + 1]])
+        owned = self.owned.indices[self.owned.indptr[resume]:self.owned.indptr[resume + 1]]
+        return [self.matcher.skills[c] for c in sorted(owned) if c in found]
+
+
+def score_jobs(corpus, job_index, skills, k: int, min_score: float = 0.0, match_weight: float = 0.6,
+               skill_weight: float = 0.4, thresholds=SCORE_THRESHOLDS, semantic_index=None,
+               semantic_blend: float = 0.5):
+    """Top-k postings of `corpus` by final_score above `min_score`.
+
+    `corpus` is an iterable of DataFrame chunks with link and combined_text columns
+    (analyzer.JobCorpus, or `[df]` for a frame already in memory). Scores follow ScoringKernel.
+    Returns (matches, stats): `matches` holds the k best rows, best first, with match_score,
+    matched_skills, skill_match_percent and final_score columns (plus semantic_score with a
+    `semantic_index`); `stats` has the number of postings scored, how many cleared min_score
+    ("matches") and counts above each threshold."""
+    started = time.perf_counter()
+    kernel = ScoringKernel(job_index, [skills], match_weight, skill_weight, semantic_index, semantic_blend)
+    thresholds = sorted(set(thresholds) | {min_score})
+    above = dict.fromkeys(thresholds, 0)
+    top_scores = np.empty(0, dtype=np.float64)
+    top_order = np.empty(0, dtype=np.int64)
+    top_rows = None
+    k = max(0, k)
+
+    scored = 0
+    for chunk in corpus:
+        final = kernel.score(job_index.positions(chunk["link"]), chunk["combined_text"])["final"][0]
+        for threshold in thresholds:
+            above[threshold] += int(np.count_nonzero(final > threshold))
+        keep = np.flatnonzero(final > min_score)
+        if k and len(keep):
+            if len(keep) > k:
+                keep = keep[np.argpartition(-final[keep], k - 1)[:k]]
+            top_scores, top_order, top_rows = _merge_top(top_scores, top_order, top_rows,
+                                                         final[keep], keep + scored, chunk.iloc[keep], k)
+        scored += len(chunk)
+
+    # best first; ties keep corpus order
+    order = np.lexsort((top_order, -top_scores))
+    if top_rows is None:
+        import pandas as pd
+        top_rows = pd.DataFrame(columns=["link", "combined_text"])
+    matches = top_rows.iloc[order].reset_index(drop=True)
+    scores = kernel.score(job_index.positions(matches["link"]), matches["combined_text"])
+    matches["match_score"] = scores["match"][0]
+    if scores["semantic"] is not None:
+        matches["semantic_score"] = scores["semantic"][0]
+    matches["matched_skills"] = [kernel.matched_skills(0, scores["hits"], row) for row in range(len(matches))]
+    matches["skill_match_percent"] = scores["skill_share"][0] * 100
+    matches["final_score"] = top_scores[order]
+
+    stats = {
+        "scored": scored,
+        "matches": above[min_score],
+        "above": {f"{t:g}": above[t] for t in thresholds},
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+    logging.info(f"Scored {scored} jobs in {stats['seconds']:.2f}s "
+                 f"({stats['matches']} above {min_score:g}, top {len(matches)} kept)")
+    return matches, stats
@@ -4,22 +4,25 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from bs4 import BeautifulSoup
-from datetime import datetime, timedelta
-try:
-    from zoneinfo import ZoneInfo
-except ImportError:  # Python <3.9 fallback (not expected here)
-    ZoneInfo = None
 import re
-import pandas as pd
 import time
-import random
 import undetected_chromedriver as uc
 from concurrent.futures import ThreadPoolExecutor
 import os
 import logging
 from selenium.common.exceptions import WebDriverException
 import subprocess
-from selenium.webdriver.common.keys import Keys
+from job_store import open_store
+from job_records import build_job_record
+from scraper_config import job_boards, keywords
+from collections import defaultdict
+from contextlib import contextmanager
+import functools
+from driver_pool import DriverPool, DRIVER_POOL_SIZE, DRIVER_MAX_PAGES
+from rate_limiter import limiter, looks_blocked
+from job_registry import JobRegistry
+from job_pipeline import JobWriter
+from detail_fetcher import DetailFetcher
 
 logging.basicConfig(level=logging.INFO, format='[%(levelname)s] %(message)s')
 
@@ -30,40 +33,63 @@ HEADLESS = os.getenv("HEADLESS", "false").lower() in ["1", "true", "yes"]
 DEBUG_MODE = os.getenv("SCRAPER_DEBUG", "false").lower() in ["1", "true", "yes"]
 # Scrolling / pagination tuning (env overridable)
 MAX_SCROLL_ATTEMPTS = int(os.getenv("MAX_SCROLL_ATTEMPTS", "100"))  # per page
-SCROLL_STAGNATION_LIMIT = int(os.getenv("SCROLL_STAGNATION_LIMIT", "4"))  # consecutive no-growth scrolls
-SCROLL_MIN_DELAY = float(os.getenv("SCROLL_MIN_DELAY", "0.6"))
-SCROLL_MAX_DELAY = float(os.getenv("SCROLL_MAX_DELAY", "1.4"))
+SCROLL_STAGNATION_LIMIT = int(os.getenv("SCROLL_STAGNATION_LIMIT", "2"))  # consecutive timed-out scrolls
+SCROLL_SETTLE_SECONDS = float(os.getenv("SCROLL_SETTLE_SECONDS", "3"))  # max wait for cards after a scroll
 MAX_PAGES = int(os.getenv("MAX_PAGES", "50"))  # hard safety cap per keyword
 # Concurrency defaults to number of keywords unless explicitly set
 _kw_conc_env = os.getenv("KEYWORD_CONCURRENCY")
 KEYWORD_CONCURRENCY = int(_kw_conc_env) if _kw_conc_env else 0  # 0 means auto = len(keywords)
-FAST_WRITE = os.getenv("FAST_WRITE", "false").lower() in ("1", "true", "yes")  # write after each page
+EXPORT_CSV = os.getenv("EXPORT_CSV", "false").lower() in ("1", "true", "yes")  # also dump the store to scraped_jobs.csv
 TARGET_JOBS_PER_KEYWORD = int(os.getenv("TARGET_JOBS_PER_KEYWORD", "5000"))
 SEE_MORE_LIMIT = int(os.getenv("SEE_MORE_LIMIT", "100"))  # max extra clicks per keyword
-SEE_MORE_MIN_DELAY = float(os.getenv("SEE_MORE_MIN_DELAY", "0.8"))
-SEE_MORE_MAX_DELAY = float(os.getenv("SEE_MORE_MAX_DELAY", "1.6"))
+SEE_MORE_WAIT_SECONDS = float(os.getenv("SEE_MORE_WAIT_SECONDS", "3.2"))  # max wait for cards after a click
 HARD_GLOBAL_LIMIT = int(os.getenv("HARD_GLOBAL_LIMIT", "0"))  # absolute cap across all keywords (0 = unlimited)
 STAGGER_LAUNCH_SECONDS = float(os.getenv("STAGGER_LAUNCH_SECONDS", "0"))  # delay between keyword browser launches
+DRIVER_POOL_PERSIST = os.getenv("DRIVER_POOL_PERSIST", "false").lower() in ("1", "true", "yes")  # keep browsers warm between runs
+# Card extraction: "bulk" snapshots card fields then clicks each card for its description,
+# "discover" (opt-in, needs httpx and the guest jobPosting endpoint) leaves descriptions to the
+# DetailFetcher pool, "legacy" reparses the page per card
+EXTRACT_MODE = os.getenv("EXTRACT_MODE", "bulk").lower()
+DETAIL_WAIT_SECONDS = float(os.getenv("DETAIL_WAIT_SECONDS", "6"))
+# "browser" drives Selenium; "http" fetches the public guest endpoints directly (http_scraper.py)
+SCRAPE_BACKENDS = ("browser", "http")
+SCRAPE_BACKEND = os.getenv("SCRAPE_BACKEND", "browser").lower()
 
 # service = Service(executable_path="./chromedriver-mac-arm64/chromedriver")  # Not needed with undetected_chromedriver
 
-# Job boards & keywords
-job_boards = [
-    # We will append pagination params (&start=OFFSET or &pageNum=N) dynamically
-    "https://www.linkedin.com/jobs/search?keywords={keyword}&location=&trk=public_jobs_jobs-search-bar_search-submit&position=1&pageNum=0"
-]
+# Links collected this run, deduplicated across all keyword workers (records stream to the store)
+registry = JobRegistry()
+
+from threading import Lock
 
-keywords = ["AI Research Analyst", "Software Engineer"]
+# Per-stage wall time / call / item counters, read by bench_scraper.py
+stage_metrics = defaultdict(lambda: {"seconds": 0.0, "calls": 0, "items": 0})
+_metrics_lock = Lock()
 
-all_jobs = []
 
-from threading import Lock
-lock = Lock()
+@contextmanager
+def _timed_stage(name: str):
+    """Accumulate wall time for a scraper stage. Set result["items"] inside the block to count output."""
+    result = {"items": 0}
+    started = time.perf_counter()
+    try:
+        yield result
+    finally:
+        elapsed = time.perf_counter() - started
+        with _metrics_lock:
+            entry = stage_metrics[name]
+            entry["seconds"] += elapsed
+            entry["calls"] += 1
+            entry["items"] += result["items"] or 0
+
+
+def reset_stage_metrics():
+    with _metrics_lock:
+        stage_metrics.clear()
 
 # Base paths
 BASE_DIR = os.path.dirname(__file__)
 OUTPUT_CSV = os.path.join(BASE_DIR, 'scraped_jobs.csv')
-OUTPUT_TMP = os.path.join(BASE_DIR, 'scraped_jobs_partial.csv')
 
 
 def build_options():
@@ -111,56 +137,86 @@ def safe_get_attr(element, css_selector, attr):
         return ""
 
 
-def close_linkedin_modal(driver):
+# Sign-in walls, modals and their backdrops; hidden by a stylesheet and removed as they appear
+_OVERLAY_SELECTORS = [
+    "div[role='dialog']", ".artdeco-modal", ".artdeco-modal-overlay", ".authentication-outlet",
+    ".contextual-sign-in-modal", ".base-contextual-sign-in-modal", ".overlay", ".modal-overlay"
+]
+# Cookie consent / GDPR banners: accepted once
+_CONSENT_SELECTORS = [
+    "button[data-control-name='accept']",
+    "button.artdeco-global-alert-action__confirm-button",
+    "button[aria-label='Accept cookies']",
+    "button[data-test-global-alert-accept]"
+]
+
+# Idempotent per document: a stylesheet hides overlays immediately, a MutationObserver removes
+# them (and accepts consent banners) as they are inserted. Counters live on window.__overlaySuppressor.
+_OVERLAY_SUPPRESSOR_JS = """
+const [overlays, consent] = arguments;
+const existing = window.__overlaySuppressor;
+if (existing) return {removed: existing.removed, consent: existing.consent, installed: false};
+const state = window.__overlaySuppressor = {removed: 0, consent: 0};
+const selector = overlays.join(', ');
+const style = document.createElement('style');
+style.id = 'overlay-suppressor';
+style.textContent = selector + ' { display: none !important; } html, body { overflow: auto !important; }';
+(document.head || document.documentElement).appendChild(style);
+const sweep = () => {
+    document.querySelectorAll(selector).forEach(el => { el.remove(); state.removed++; });
+    for (const sel of consent) {
+        const btn = document.querySelector(sel);
+        if (btn && !btn.dataset.suppressed) {
+            btn.dataset.suppressed = '1';
+            try { btn.click(); state.consent++; } catch (e) {}
+        }
+    }
+};
+let queued = false;
+new MutationObserver(() => {
+    if (queued) return;
+    queued = true;
+    setTimeout(() => { queued = false; sweep(); }, 0);
+}).observe(document.documentElement, {childList: true, subtree: true});
+sweep();
+return {removed: state.removed, consent: state.consent, installed: true};
+"""
+
+_OVERLAY_STATS_JS = """
+const s = window.__overlaySuppressor;
+return s ? {removed: s.removed, consent: s.consent} : null;
+"""
+
+
+def install_overlay_suppressor(driver) -> bool:
+    """Install the in-page overlay suppressor on the current document (call after each navigation).
+    Returns True if it was newly installed."""
     try:
-        selectors = [
-            "button[aria-label='Dismiss']",
-            "button[aria-label='Close']",
-            "button.artdeco-modal__dismiss",
-            "button[data-test-modal-close-btn]",
-            "div[role='dialog'] button[aria-label='Dismiss']",
-            "div[role='dialog'] button[aria-label='Close']"
-        ]
-        dismissed = False
-        for sel in selectors:
-            buttons = driver.find_elements(By.CSS_SELECTOR, sel)
-            if buttons:
-                try:
-                    buttons[0].click()
-                    time.sleep(0.3)
-                    dismissed = True
-                    break
-                except Exception:
-                    pass
-        # Cookie consent / GDPR banners common selectors
-        consent_selectors = [
-            "button[data-control-name='accept']",
-            "button.artdeco-global-alert-action__confirm-button",
-            "button[aria-label='Accept cookies']",
-            "button[data-test-global-alert-accept']"
-        ]
-        for sel in consent_selectors:
-            try:
-                btns = driver.find_elements(By.CSS_SELECTOR, sel)
-                if btns:
-                    btns[0].click()
-                    time.sleep(0.2)
-            except Exception:
-                pass
-        if not dismissed:
-            try:
-                driver.find_element(By.TAG_NAME, 'body').send_keys(Keys.ESCAPE)
-                time.sleep(0.2)
-            except Exception:
-                pass
-        if driver.find_elements(By.CSS_SELECTOR, "div[role='dialog'], .artdeco-modal, .authentication-outlet"):
-            driver.execute_script("document.querySelectorAll('[role=\\'dialog\\'], .artdeco-modal, .authentication-outlet, .overlay, .modal-overlay, .artdeco-modal-overlay').forEach(e=>e.remove());")
-            time.sleep(0.2)
+        result = driver.execute_script(_OVERLAY_SUPPRESSOR_JS, _OVERLAY_SELECTORS, _CONSENT_SELECTORS)
+        return bool(result and result.get("installed"))
+    except Exception as e:
+        logging.debug("Overlay suppressor install failed: %s", e)
+        return False
+
+
+def _record_overlay_metrics(driver):
+    """Add this document's removal counters to stage_metrics (call once per page, before leaving it)."""
+    try:
+        counts = driver.execute_script(_OVERLAY_STATS_JS)
     except Exception:
-        pass
+        counts = None
+    if not counts:
+        return
+    with _metrics_lock:
+        for name, key in (("overlays_removed", "removed"), ("consent_accepted", "consent")):
+            entry = stage_metrics[name]
+            entry["calls"] += 1
+            entry["items"] += counts.get(key) or 0
 
 
+@functools.lru_cache(maxsize=None)
 def detect_browser_major():
+    """Browser major version, probed once per process (the subprocess call costs ~100ms+)."""
     path = brave_path if os.path.exists(brave_path) else None
     try:
         if path:
@@ -173,11 +229,11 @@ def detect_browser_major():
         pass
     return None
 
-def _init_driver(url: str):
+def _init_driver(url: str = ""):
     """Initialize undetected Chrome driver with resilience."""
     options = build_options()
     browser_major = detect_browser_major()
-    logging.info("Initializing browser for %s (detected major=%s)", url, browser_major)
+    logging.info("Initializing browser%s (detected major=%s)", f" for {url}" if url else "", browser_major)
     # Attempt uc first, then manual driver fallback (particularly for Apple Silicon path issues)
     try:
         if browser_major:
@@ -213,21 +269,97 @@ def _init_driver(url: str):
     return None
 
 
+def _card_count(driver) -> int:
+    return len(driver.find_elements(By.CSS_SELECTOR, "div.base-card"))
+
+
+_SEE_MORE_SELECTORS = [
+    "button[aria-label='See more jobs']",
+    "button.infinite-scroller__show-more-button",
+    "button[aria-label='Load more results']",
+    "button[data-tracking-control-name='infinite-scroller_show-more']",
+    ".infinite-scroller__show-more-button button"
+]
+
+# Perform an optional action (scroll / click See more / nudge), then resolve as soon as the card
+# list grows (after a short quiet period so a whole batch lands) or is verifiably exhausted:
+# the "viewed all jobs" marker is shown, or a See-more button is waiting to be clicked.
+_WAIT_FOR_CARDS_JS = """
+const [previous, timeoutMs, action, seeMoreSelectors, done] = arguments;
+const count = () => document.querySelectorAll('div.base-card').length;
+const visible = el => !!el && el.offsetParent !== null && !el.disabled;
+const seeMoreButton = () => {
+    for (const sel of seeMoreSelectors) { const b = document.querySelector(sel); if (visible(b)) return b; }
+    return null;
+};
+const exhausted = () => visible(document.querySelector('.see-more-jobs__viewed-all'));
+if (action === 'click') {
+    const btn = seeMoreButton();
+    if (!btn) { done({count: count(), reason: 'no_button'}); return; }
+    btn.scrollIntoView({block: 'center'});
+    btn.click();
+} else if (action === 'scroll') {
+    window.scrollTo(0, document.body.scrollHeight);
+} else if (action === 'nudge') {
+    window.scrollBy(0, Math.floor(window.innerHeight * 0.4));
+}
+let finished = false, quiet = null;
+const observer = new MutationObserver(check);
+const timer = setTimeout(() => finish('timeout'), timeoutMs);
+function finish(reason) {
+    if (finished) return;
+    finished = true;
+    observer.disconnect();
+    clearTimeout(timer);
+    clearTimeout(quiet);
+    done({count: count(), reason: reason});
+}
+function check() {
+    if (count() > previous) {
+        clearTimeout(quiet);
+        quiet = setTimeout(() => finish('grew'), 150);
+    } else if (exhausted()) {
+        finish('exhausted');
+    } else if (action !== 'click' && seeMoreButton()) {
+        finish('see_more');
+    }
+}
+observer.observe(document.body, {childList: true, subtree: true, attributes: true, attributeFilter: ['class', 'style', 'hidden']});
+check();
+"""
+
+
+def _wait_for_cards(driver, previous: int, timeout: float, action: str = ""):
+    """Run `action` in the page and wait for the card list to change, in one round trip.
+
+    Returns (card_count, reason) where reason is "grew", "exhausted" (all jobs shown),
+    "see_more" (scrolling is done, the button takes over), "no_button" or "timeout"."""
+    try:
+        result = driver.execute_async_script(_WAIT_FOR_CARDS_JS, previous, int(timeout * 1000), action,
+                                             _SEE_MORE_SELECTORS)
+        return result["count"], result["reason"]
+    except Exception as e:
+        logging.debug("Card wait script failed (%s): %s", action or "wait", e)
+        return _card_count(driver), "timeout"
+
+
 def _scroll_to_load_all_jobs(driver):
-    """Scroll the page incrementally to trigger dynamic job list loading."""
+    """Scroll the page incrementally to trigger dynamic job list loading.
+    Each scroll that can fetch a batch is paced by the shared rate limiter; waits end on DOM
+    events (growth, end-of-list marker, See-more button) rather than fixed sleeps."""
     stagnation = 0
-    last_count = 0
+    last_count = _card_count(driver)
     for attempt in range(1, MAX_SCROLL_ATTEMPTS + 1):
-        close_linkedin_modal(driver)
-        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(random.uniform(SCROLL_MIN_DELAY, SCROLL_MAX_DELAY))
-        cards = driver.find_elements(By.CSS_SELECTOR, "div.base-card")
-        count = len(cards)
-        if count == last_count:
-            stagnation += 1
-        else:
+        limiter.acquire()
+        count, reason = _wait_for_cards(driver, last_count, SCROLL_SETTLE_SECONDS, action="scroll")
+        if count > last_count:
+            limiter.success()
             stagnation = 0
             last_count = count
+        elif reason in ("exhausted", "see_more"):
+            break  # verifiably done scrolling: no need to sit out the stagnation rounds
+        else:
+            stagnation += 1
         if attempt % 10 == 0:
             logging.info("Scroll attempt %d: loaded %d cards", attempt, count)
         if stagnation >= SCROLL_STAGNATION_LIMIT:
@@ -235,55 +367,24 @@ def _scroll_to_load_all_jobs(driver):
     return driver.find_elements(By.CSS_SELECTOR, "div.base-card")
 
 
-def _parse_posted(text: str):
-    """Parse relative posted text like '2 days ago', '3 weeks ago', '1 month ago', '30+ days ago', 'Just posted'. Return (date_obj, normalized_raw)."""
-    if not text:
-        return None, ""
-    raw = text.strip()
-    t = raw.lower()
-    now = datetime.now(ZoneInfo('America/Los_Angeles')) if ZoneInfo else datetime.utcnow()
-    # Defaults
-    if 'just' in t or 'hour' in t or 'min' in t:
-        return now.date(), raw
-    # 30+ days (LinkedIn) treat as 30
-    if '30+' in t:
-        return (now - timedelta(days=30)).date(), raw
-    m = re.search(r'(\d+)\s*(day|week|month|year)', t)
-    if m:
-        val = int(m.group(1))
-        unit = m.group(2)
-        if 'day' in unit:
-            delta = timedelta(days=val)
-        elif 'week' in unit:
-            delta = timedelta(weeks=val)
-        elif 'month' in unit:
-            # Approximate month = 30 days
-            delta = timedelta(days=30*val)
-        elif 'year' in unit:
-            delta = timedelta(days=365*val)
-        else:
-            delta = timedelta(0)
-        return (now - delta).date(), raw
-    return None, raw
-
-
 def _extract_cards(driver, page_url: str, keyword: str):
-    """Extract job data from all currently loaded cards. Adds keyword tag and posted date."""
-    jobs_collected = 0
+    """Extract job data from all currently loaded cards. Adds keyword tag and posted date.
+    Returns the jobs that were new to the registry."""
+    added = []
     job_cards = driver.find_elements(By.CSS_SELECTOR, "div.base-card")
     for idx, card in enumerate(job_cards):
         try:
-            close_linkedin_modal(driver)
             driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", card)
-            time.sleep(random.uniform(0.2, 0.55))
+            limiter.acquire()
             try:
                 card.click()
             except Exception:
                 pass
             try:
-                WebDriverWait(driver, 6).until(
+                WebDriverWait(driver, DETAIL_WAIT_SECONDS).until(
                     EC.presence_of_element_located((By.CSS_SELECTOR, "div.show-more-less-html__markup"))
                 )
+                limiter.success()
             except Exception:
                 pass
             page_html = driver.page_source
@@ -301,183 +402,295 @@ def _extract_cards(driver, page_url: str, keyword: str):
                     posted_text = safe_get_text(card, "time.job-search-card__listdate")
                 except Exception:
                     posted_text = ""
-            posted_date_obj, posted_raw = _parse_posted(posted_text)
-            posted_date_iso = posted_date_obj.isoformat() if posted_date_obj else ""
             desc_div = soup.find("div", class_="show-more-less-html__markup")
             description = desc_div.get_text(" ", strip=True) if desc_div else "Description not available"
             if not title:
                 continue
-            with lock:
-                all_jobs.append({
-                    "title": title,
-                    "link": link,
-                    "company": company,
-                    "location": location,
-                    "posted_raw": posted_raw or posted_text,
-                    "posted_date_pdt": posted_date_iso,
-                    "description": description,
-                    "source": "LinkedIn",
-                    "page_url": page_url,
-                    "keyword": keyword
-                })
-            jobs_collected += 1
+            job = build_job_record(title, link, company, location, posted_text, description, page_url, keyword)
+            if registry.add(job):
+                added.append(job)
         except Exception as e:
             logging.debug("Error processing card %d: %s", idx, e)
             continue
-    return jobs_collected
+    return added
+
+
+# One round trip: every loaded card's list fields, read straight from the DOM.
+_SNAPSHOT_CARDS_JS = """
+const text = (root, sel) => { const el = root.querySelector(sel); return el ? el.innerText.trim() : ""; };
+return Array.from(document.querySelectorAll('div.base-card')).map(card => {
+    const a = card.querySelector('a.base-card__full-link');
+    return {
+        job_id: (card.getAttribute('data-entity-urn') || '').split(':').pop(),
+        title: text(card, 'h3.base-search-card__title'),
+        link: a ? a.href : "",
+        company: text(card, 'h4.base-search-card__subtitle'),
+        location: text(card, 'span.job-search-card__location'),
+        posted: text(card, 'time')
+    };
+});
+"""
+
+# Click card N and resolve with its description pane (text, or outerHTML with asHtml), or null
+# on timeout. A pane counts as the clicked card's once it is not the node shown before the click
+# and any job id it carries (top card link, else currentJobId in the URL) is the card's, so
+# reposts with identical descriptions are still read. Only the pane is read, never the page source.
+_READ_DETAIL_JS = """
+const [idx, timeoutMs, asHtml, done] = arguments;
+const card = document.querySelectorAll('div.base-card')[idx];
+if (!card) { done(null); return; }
+const idOf = href => { const m = (href || '').split('?')[0].match(/(\\d+)\\/?$/); return m ? m[1] : ''; };
+const link = card.querySelector('a.base-card__full-link');
+const jobId = (card.getAttribute('data-entity-urn') || '').split(':').pop() || idOf(link && link.href);
+const paneJobId = () => {
+    const top = document.querySelector('a.topcard__link');
+    if (top) return idOf(top.href);
+    return new URLSearchParams(location.search).get('currentJobId') || '';
+};
+const read = pane => asHtml ? pane.outerHTML : pane.innerText.replace(/\\s+/g, ' ').trim();
+const shown = document.querySelector('div.show-more-less-html__markup');
+if (shown && jobId && paneJobId() === jobId) { done(read(shown)); return; }
+if (shown) shown.dataset.stalePane = '1';
+card.scrollIntoView({block: 'center'});
+try { (link || card).click(); } catch (e) {}
+const started = Date.now();
+(function poll() {
+    const pane = document.querySelector('div.show-more-less-html__markup');
+    if (pane && !pane.dataset.stalePane) {
+        const paneId = paneJobId();
+        if (!paneId || !jobId || paneId === jobId) { done(read(pane)); return; }
+    }
+    if (Date.now() - started >= timeoutMs) { done(null); return; }
+    setTimeout(poll, 100);
+})();
+"""
+
+
+def _snapshot_cards(driver):
+    """Return list fields (title, link, company, location, posted) for every loaded card."""
+    try:
+        return driver.execute_script(_SNAPSHOT_CARDS_JS) or []
+    except WebDriverException as e:
+        logging.warning("Card snapshot failed: %s", e)
+        return []
+
+
+def _extract_cards_bulk(driver, page_url: str, keyword: str):
+    """Bulk variant of _extract_cards: one snapshot call for all card fields,
+    then one script call per card that reads only the description pane."""
+    added = []
+    snapshot = _snapshot_cards(driver)
+    for idx, fields in enumerate(snapshot):
+        if not fields.get("title"):
+            continue
+        if fields.get("link") in registry:
+            continue  # already collected (possibly by another keyword): skip the detail click
+        try:
+            limiter.acquire()
+            desc = driver.execute_async_script(_READ_DETAIL_JS, idx, int(DETAIL_WAIT_SECONDS * 1000), False)
+        except Exception as e:
+            logging.debug("Error reading detail for card %d: %s", idx, e)
+            desc = None
+        if desc:
+            limiter.success()
+            description = desc
+        else:
+            description = "Description not available"
+        job = build_job_record(fields["title"], fields.get("link", ""), fields.get("company", ""),
+                                fields.get("location", ""), fields.get("posted", ""),
+                                description, page_url, keyword)
+        if registry.add(job):
+            added.append(job)
+    return added
+
+
+def _discover_cards(driver, page_url: str, keyword: str):
+    """Phase one of the two-phase crawl: card metadata and links only, no clicks.
+    Descriptions are left empty for DetailFetcher to fill in."""
+    added = []
+    for fields in _snapshot_cards(driver):
+        if not fields.get("title"):
+            continue
+        job = build_job_record(fields["title"], fields.get("link", ""), fields.get("company", ""),
+                               fields.get("location", ""), fields.get("posted", ""), "", page_url, keyword)
+        job["job_id"] = fields.get("job_id") or ""
+        if registry.add(job):
+            added.append(job)
+    return added
+
+
+def _extract_page(driver, page_url: str, keyword: str):
+    """Run the configured extraction mode and log its throughput. Returns the newly registered jobs."""
+    started = time.perf_counter()
+    if EXTRACT_MODE == "legacy":
+        added = _extract_cards(driver, page_url, keyword)
+    elif EXTRACT_MODE == "discover":
+        added = _discover_cards(driver, page_url, keyword)
+    else:
+        added = _extract_cards_bulk(driver, page_url, keyword)
+    elapsed = time.perf_counter() - started
+    rate = len(added) / elapsed if elapsed > 0 else 0.0
+    logging.info("[KW=%s] Extracted %d new cards in %.1fs (%.2f cards/sec, mode=%s)",
+                 keyword, len(added), elapsed, rate, EXTRACT_MODE)
+    return added
+
+
+_driver_pool = None
+_driver_pool_lock = Lock()
 
 
-def scrape_keyword(keyword: str) -> int:
-    """Scrape a single keyword with one browser window (pagination + see more)."""
+def get_driver_pool(size: int = 0) -> DriverPool:
+    """Process-wide driver pool; recreated only when a different size is requested."""
+    global _driver_pool
+    size = size or DRIVER_POOL_SIZE or 1
+    with _driver_pool_lock:
+        if _driver_pool is None or _driver_pool.size != size:
+            if _driver_pool is not None:
+                _driver_pool.close()
+            _driver_pool = DriverPool(_init_driver, size=size, max_pages=DRIVER_MAX_PAGES)
+        return _driver_pool
+
+
+def close_driver_pool():
+    with _driver_pool_lock:
+        if _driver_pool is not None:
+            _driver_pool.close()
+
+
+def scrape_keyword(keyword: str, pool: DriverPool = None, writer: JobWriter = None,
+                   fetcher: DetailFetcher = None) -> int:
+    """Scrape a single keyword on a pooled browser window (pagination + see more).
+    New jobs are handed page by page to `fetcher` (discover mode: descriptions still missing)
+    or straight to `writer`; with neither they are only counted."""
     base_url = job_boards[0].format(keyword=keyword.replace(" ", "%20"))
-    driver = _init_driver(base_url)
+    pool = pool or get_driver_pool()
+    with _timed_stage("driver_init"):
+        driver = pool.acquire()
     if not driver:
         return 0
-    logging.info("[KW=%s] Browser window launched", keyword)
-    seen_links = set()
+    logging.info("[KW=%s] Browser session acquired", keyword)
     total_added = 0
     try:
         for page in range(MAX_PAGES):
+            if page:
+                # counts the previous page; swaps in a fresh session once the page budget is spent
+                with _timed_stage("driver_init"):
+                    driver = pool.checkpoint(driver)
+                if not driver:
+                    break
             offset = page * 25
             page_url = re.sub(r"pageNum=\d+", f"pageNum={page}", base_url)
             if 'start=' in page_url:
                 page_url = re.sub(r"start=\d+", f"start={offset}", page_url)
             else:
                 page_url = f"{page_url}&start={offset}"
-            try:
-                driver.get(page_url)
-            except Exception:
+            with _timed_stage("page_load"):
+                limiter.acquire()
+                try:
+                    driver.get(page_url)
+                    install_overlay_suppressor(driver)
+                    WebDriverWait(driver, 8).until(EC.presence_of_all_elements_located((By.CSS_SELECTOR, "div.base-card")))
+                    loaded = True
+                except Exception:
+                    loaded = False
+            blocked = _page_blocked(driver)
+            if blocked or (not loaded and page == 0):
+                # an empty first page means the list was withheld, not exhausted
+                limiter.throttled(blocked or "empty")
+            elif loaded:
+                limiter.success()
+            if not loaded:
                 break
-            close_linkedin_modal(driver)
+            logging.info("[KW=%s] page %d loaded (rate %.2f req/s)", keyword, page, limiter.rate)
             try:
-                WebDriverWait(driver, 8).until(EC.presence_of_all_elements_located((By.CSS_SELECTOR, "div.base-card")))
+                # in-page waits (_wait_for_cards, _READ_DETAIL_JS) must not hit the default 30s/0s limit
+                driver.set_script_timeout(max(SCROLL_SETTLE_SECONDS, SEE_MORE_WAIT_SECONDS, DETAIL_WAIT_SECONDS) + 5)
             except Exception:
-                break
-            _scroll_to_load_all_jobs(driver)
+                pass
+            with _timed_stage("scroll") as st:
+                st["items"] = len(_scroll_to_load_all_jobs(driver))
             if _see_more_present(driver):
-                _click_see_more(driver, keyword, seen_before=0)
-            before = len(all_jobs)
-            added_raw = _extract_cards(driver, page_url, keyword)
-            if added_raw:
-                unique_buffer = []
-                with lock:
-                    for job in all_jobs:
-                        link = job.get("link")
-                        if link and link not in seen_links:
-                            seen_links.add(link); unique_buffer.append(job)
-                with lock:
-                    all_jobs.clear(); all_jobs.extend(unique_buffer)
-            after = len(all_jobs)
-            page_new = after - before
-            total_added += max(0, page_new)
-            with lock:
-                kw_total = sum(1 for j in all_jobs if j.get("keyword") == keyword)
+                with _timed_stage("see_more") as st:
+                    st["items"] = _click_see_more(driver, keyword, seen_before=0)
+            with _timed_stage("extract") as st:
+                page_jobs = _extract_page(driver, page_url, keyword)
+                st["items"] = len(page_jobs)
+            _record_overlay_metrics(driver)
+            total_added += len(page_jobs)
+            kw_total = registry.keyword_count(keyword)
+            if fetcher is not None:
+                fetcher.submit(page_jobs)  # returns at once; the next page loads while details download
+            elif writer is not None:
+                for job in page_jobs:
+                    writer.put(job)
             if TARGET_JOBS_PER_KEYWORD and kw_total >= TARGET_JOBS_PER_KEYWORD:
                 break
-            if HARD_GLOBAL_LIMIT and len(all_jobs) >= HARD_GLOBAL_LIMIT:
+            if HARD_GLOBAL_LIMIT and len(registry) >= HARD_GLOBAL_LIMIT:
                 break
-            if page_new == 0 and kw_total > 0:
+            if not page_jobs and kw_total > 0:
                 break
-            if FAST_WRITE and page_new > 0:
-                _safe_write_csv(partial=True)
     finally:
-        if not DEBUG_MODE:
-            try:
-                driver.quit()
-            except Exception:
-                pass
+        pool.release(driver)
     return total_added
 
 
+def _page_blocked(driver) -> str:
+    """Throttle reason for the current page (auth wall redirect, 429 page), or ""."""
+    try:
+        return looks_blocked(driver.current_url, text=driver.title)
+    except Exception:
+        return ""
+
+
 def _click_see_more(driver, keyword: str, seen_before: int):
     """Click 'See more jobs' button.
     Modes:
       LOOP (default): legacy multi-click loop (may trigger 429)
-      SINGLE (SEE_MORE_MODE=single): one click then wait/poll for new jobs.
+      SINGLE (SEE_MORE_MODE=single): one click then wait for new jobs.
+    Each click and its wait is one script call that returns when cards arrive.
     Returns number of clicks performed (1 or >1 for loop)."""
     mode = os.getenv("SEE_MORE_MODE", "loop").lower()
-    selectors = [
-        "button[aria-label='See more jobs']",
-        "button.infinite-scroller__show-more-button",
-        "button[aria-label='Load more results']",
-        "button[data-tracking-control-name='infinite-scroller_show-more']",
-        ".infinite-scroller__show-more-button button"
-    ]
-    def locate():
-        for sel in selectors:
-            candidates = driver.find_elements(By.CSS_SELECTOR, sel)
-            if candidates:
-                return candidates[0]
-        return None
 
     if mode != "single":
-        # fallback to previous behavior but with a safety slower delay
         total_clicks = 0
-        last_len = len(driver.find_elements(By.CSS_SELECTOR, "div.base-card"))
+        last_len = _card_count(driver)
         while total_clicks < SEE_MORE_LIMIT:
-            btn = locate()
-            if not btn:
+            limiter.acquire()
+            current_len, reason = _wait_for_cards(driver, last_len, SEE_MORE_WAIT_SECONDS, action="click")
+            if reason == "no_button":
                 break
-            try:
-                driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", btn)
-                time.sleep(random.uniform(0.25, 0.5))
-                btn.click()
-                total_clicks += 1
-                # longer wait to avoid 429
-                time.sleep(random.uniform(SEE_MORE_MIN_DELAY*1.5, SEE_MORE_MAX_DELAY*2))
-                current_len = len(driver.find_elements(By.CSS_SELECTOR, "div.base-card"))
-                logging.info("[KW=%s] SeeMore(loop) click %d -> cards %d (prev %d)", keyword, total_clicks, current_len, last_len)
-                if current_len <= last_len:
-                    break
-                last_len = current_len
-                if current_len + seen_before >= TARGET_JOBS_PER_KEYWORD + 50:
-                    break
-            except Exception as e:
-                logging.debug("[KW=%s] SeeMore(loop) click failed: %s", keyword, e)
+            total_clicks += 1
+            logging.info("[KW=%s] SeeMore(loop) click %d -> cards %d (prev %d, %s)",
+                         keyword, total_clicks, current_len, last_len, reason)
+            if current_len <= last_len:
+                break
+            limiter.success()
+            last_len = current_len
+            if reason == "exhausted" or current_len + seen_before >= TARGET_JOBS_PER_KEYWORD + 50:
                 break
         return total_clicks
 
     # SINGLE mode
-    btn = locate()
-    if not btn:
-        return 0
-    start_len = len(driver.find_elements(By.CSS_SELECTOR, "div.base-card"))
-    try:
-        driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", btn)
-        time.sleep(random.uniform(0.4, 0.8))
-        btn.click()
-        logging.info("[KW=%s] SeeMore(single) clicked; waiting for additional jobs...", keyword)
-    except Exception as e:
-        logging.debug("[KW=%s] SeeMore(single) click failed: %s", keyword, e)
+    start_len = _card_count(driver)
+    limiter.acquire()
+    new_len, reason = _wait_for_cards(driver, start_len, SEE_MORE_WAIT_SECONDS, action="click")
+    if reason == "no_button":
         return 0
-    # Poll for growth
-    max_cycles = int(os.getenv("SEE_MORE_WAIT_CYCLES", "12"))  # ~ up to ~ (cycles * avg interval)
-    for cycle in range(max_cycles):
-        time.sleep(random.uniform(SEE_MORE_MIN_DELAY, SEE_MORE_MAX_DELAY*1.2))
-        close_linkedin_modal(driver)
-        # gentle scroll nudge
-        try:
-            driver.execute_script("window.scrollBy(0, Math.floor(window.innerHeight*0.4));")
-        except Exception:
-            pass
-        new_len = len(driver.find_elements(By.CSS_SELECTOR, "div.base-card"))
+    logging.info("[KW=%s] SeeMore(single) clicked; waiting for additional jobs...", keyword)
+    max_cycles = int(os.getenv("SEE_MORE_WAIT_CYCLES", "4"))  # extra waits, each after a scroll nudge
+    for cycle in range(max_cycles + 1):
         if new_len > start_len:
+            limiter.success()
             logging.info("[KW=%s] SeeMore(single) growth detected cycle %d -> %d cards (was %d)", keyword, cycle+1, new_len, start_len)
             break
-        if cycle % 4 == 3:
-            logging.info("[KW=%s] SeeMore(single) still waiting (cycle %d, cards=%d)", keyword, cycle+1, new_len)
+        if reason == "exhausted" or cycle == max_cycles:
+            break
+        new_len, reason = _wait_for_cards(driver, start_len, SEE_MORE_WAIT_SECONDS, action="nudge")
     return 1
 
 
 def _see_more_present(driver) -> bool:
-    selectors = [
-        "button[aria-label='See more jobs']",
-        "button.infinite-scroller__show-more-button",
-        "button[aria-label='Load more results']",
-        "button[data-tracking-control-name='infinite-scroller_show-more']",
-        ".infinite-scroller__show-more-button button"
-    ]
-    for sel in selectors:
+    for sel in _SEE_MORE_SELECTORS:
         try:
             if driver.find_elements(By.CSS_SELECTOR, sel):
                 return True
@@ -486,55 +699,70 @@ def _see_more_present(driver) -> bool:
     return False
 
 
-
-
-def _safe_write_csv(partial: bool = False):
-    """Thread-safe CSV write. If partial=True writes to temp file; else final output."""
-    with lock:
-        if not all_jobs:
-            return
-        df = pd.DataFrame(all_jobs)
-        df.drop_duplicates(subset=["link"], inplace=True)
-        target = OUTPUT_TMP if partial else OUTPUT_CSV
-        df.to_csv(target, index=False)
-        logging.info("Wrote %d jobs to %s", len(df), os.path.basename(target))
-
-
-def get_csv_file():
-    # Reset global list each run
-    global all_jobs
-    all_jobs = []
-
+def _scrape_with_browsers(run_keywords, writer, fetcher=None):
+    """Browser backend: keywords scheduled onto pooled Selenium sessions."""
     # Auto concurrency determination
-    effective_conc = KEYWORD_CONCURRENCY if KEYWORD_CONCURRENCY > 0 else len(keywords)
-    logging.info("Starting scrape for %d keywords (concurrency=%d, max_pages=%d, fast_write=%s)",
-                 len(keywords), effective_conc, MAX_PAGES, FAST_WRITE)
+    effective_conc = KEYWORD_CONCURRENCY if KEYWORD_CONCURRENCY > 0 else len(run_keywords)
+    # Keywords are scheduled onto at most pool.size warm browser sessions
+    pool = get_driver_pool(DRIVER_POOL_SIZE or effective_conc)
+    effective_conc = min(effective_conc, pool.size)
+    logging.info("Starting scrape for %d keywords (concurrency=%d, max_pages=%d)",
+                 len(run_keywords), effective_conc, MAX_PAGES)
 
     def run_keyword(args):
         idx, kw = args
-        if STAGGER_LAUNCH_SECONDS and idx > 0:
+        if STAGGER_LAUNCH_SECONDS and 0 < idx < pool.size:
             time.sleep(STAGGER_LAUNCH_SECONDS * idx)
-        new_count = scrape_keyword(kw)
-        logging.info("[KW=%s] Finished with %d new jobs (global=%d)", kw, new_count, len(all_jobs))
+        new_count = scrape_keyword(kw, pool, writer, fetcher)
+        logging.info("[KW=%s] Finished with %d new jobs (global=%d)", kw, new_count, len(registry))
 
-    if effective_conc > 1:
-        with ThreadPoolExecutor(max_workers=effective_conc) as executor:
-            list(executor.map(run_keyword, enumerate(keywords)))
-    else:
-        for idx, kw in enumerate(keywords):
-            run_keyword((idx, kw))
+    try:
+        if effective_conc > 1:
+            with ThreadPoolExecutor(max_workers=effective_conc) as executor:
+                list(executor.map(run_keyword, enumerate(run_keywords)))
+        else:
+            for idx, kw in enumerate(run_keywords):
+                run_keyword((idx, kw))
+    finally:
+        # DEBUG keeps windows open for inspection; PERSIST keeps them warm for the next run
+        if not (DEBUG_MODE or DRIVER_POOL_PERSIST):
+            pool.close()
+
+
+def get_csv_file(only_keywords=None, backend: str = None):
+    """Scrape all keywords (or just `only_keywords`), streaming results into the job store.
+    `backend` is "browser" (Selenium) or "http" (guest endpoints, no browser); defaults to SCRAPE_BACKEND.
+    Returns the number of jobs written."""
+    backend = (backend or SCRAPE_BACKEND).lower()
+    if backend not in SCRAPE_BACKENDS:
+        raise ValueError(f"Unknown scrape backend {backend!r}; expected one of {', '.join(SCRAPE_BACKENDS)}")
+    # Reset the shared registry each run
+    registry.clear()
+    run_keywords = list(only_keywords) if only_keywords is not None else list(keywords)
+    if not run_keywords:
+        return 0
 
-    if not all_jobs:
+    writer = JobWriter(timer=lambda: _timed_stage("persist")).start()
+    try:
+        if backend == "http":
+            from http_scraper import scrape_keywords
+            scrape_keywords(run_keywords, registry, writer)
+        elif EXTRACT_MODE == "discover":
+            # two-phase crawl: browsers discover cards, a separate pool fetches unseen descriptions
+            with DetailFetcher(writer) as fetcher:
+                _scrape_with_browsers(run_keywords, writer, fetcher)
+        else:
+            _scrape_with_browsers(run_keywords, writer)
+    finally:
+        written = writer.close()
+
+    if not written:
         logging.warning("No jobs collected. LinkedIn may have blocked access or layout changed.")
-    else:
-        df = pd.DataFrame(all_jobs)
-        before = len(df)
-        df.drop_duplicates(subset=["link"], inplace=True)
-        deduped = len(df)
-        df.to_csv(OUTPUT_CSV, index=False)
-        logging.info("Saved %d unique jobs (removed %d duplicates) to %s", deduped, before - deduped, OUTPUT_CSV)
-
-    return all_jobs
+    elif EXPORT_CSV:
+        with open_store() as store:
+            store.export_csv(OUTPUT_CSV)
+
+    return written
 
 
 if __name__ == "__main__":
@@ -0,0 +1,15 @@
+"""Search targets shared by the scraper and the analyzer.
+
+Kept free of selenium/browser imports so the analyzer can check corpus freshness
+without loading the scraping stack.
+"""
+import os
+
+# Job boards & keywords
+job_boards = [
+    # We will append pagination params (&start=OFFSET or &pageNum=N) dynamically
+    # JOB_SEARCH_URL points the scraper elsewhere, e.g. at a local replay server (see replay.py)
+    os.getenv("JOB_SEARCH_URL", "https://www.linkedin.com/jobs/search?keywords={keyword}&location=&trk=public_jobs_jobs-search-bar_search-submit&position=1&pageNum=0")
+]
+
+keywords = ["AI Research Analyst", "Software Engineer"]
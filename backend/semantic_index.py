@@ -0,0 +1,198 @@
+"""Optional dense LSA index over the job corpus, built offline from the TF-IDF job index.
+
+TruncatedSVD projects the sparse TF-IDF rows (5000 features) onto SEMANTIC_DIMS latent
+dimensions, where co-occurring terms ("ml engineer", "machine learning") land close
+together. Job vectors are L2-normalized float32 rows in a memory-mapped file, so a query
+is one projection plus a dense mat-vec over the mapped vectors (read chunk by chunk, never
+loaded whole). Rows follow the job index rows; new or changed postings are folded in with
+the stored projection, and the SVD is refitted whenever the job index vectorizer is.
+
+    python semantic_index.py build
+    python semantic_index.py query "machine learning engineer" --top-k 5
+"""
+import argparse
+import json
+import logging
+import os
+import time
+
+import joblib
+import numpy as np
+
+BASE_DIR = os.path.dirname(__file__)
+SEMANTIC_INDEX_DIR = os.getenv("SEMANTIC_INDEX_DIR", os.path.join(BASE_DIR, "semantic_index"))
+SEMANTIC_DIMS = int(os.getenv("SEMANTIC_DIMS", "128"))
+SEMANTIC_CHUNK_ROWS = int(os.getenv("SEMANTIC_CHUNK_ROWS", "65536"))  # mapped rows per mat-vec block
+
+# Bump when the SVD settings change so stale indexes are rebuilt instead of reused
+SEMANTIC_INDEX_VERSION = 2
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (matrix / norms).astype(np.float32)
+
+
+class SemanticIndex:
+    """float32 LSA vectors for every row of a JobIndex, memory-mapped from disk."""
+
+    def __init__(self, path: str = None, dims: int = SEMANTIC_DIMS):
+        self.path = path or SEMANTIC_INDEX_DIR
+        self.dims = dims
+        self.svd = None
+        self.vectors = None         # np.memmap (rows x dims), row i = job index row i
+        self.digests = []
+        self.source_fit = None      # fit_id of the job index the SVD was fitted on
+
+    # -- persistence -------------------------------------------------------
+
+    def _file(self, name):
+        return os.path.join(self.path, name)
+
+    def load(self) -> bool:
+        """Map a saved index. Returns False if none exists or it was built with other settings."""
+        try:
+            with open(self._file("meta.json")) as f:
+                meta = json.load(f)
+            if meta.get("version") != SEMANTIC_INDEX_VERSION or meta.get("dims") != self.dims:
+                logging.info("Semantic index settings changed; rebuilding")
+                return False
+            self.svd = joblib.load(self._file("svd.joblib"))
+            rows = len(meta["digests"])
+            self.vectors = np.memmap(self._file("vectors.f32"), dtype=np.float32, mode="r", shape=(rows, self.dims)) \
+                if rows else np.empty((0, self.dims), dtype=np.float32)
+        except (OSError, ValueError) as e:
+            logging.debug(f"No usable semantic index at {self.path}: {e}")
+            return False
+        self.digests = meta["digests"]
+        self.source_fit = meta["source_fit"]
+        return True
+
+    def _save(self, vectors: np.ndarray):
+        """Write vectors and metadata atomically, then remap the vectors read-only."""
+        os.makedirs(self.path, exist_ok=True)
+        tmp = self._file("svd.tmp.joblib")
+        joblib.dump(self.svd, tmp)
+        os.replace(tmp, self._file("svd.joblib"))
+        tmp = self._file("vectors.tmp.f32")
+        out = np.memmap(tmp, dtype=np.float32, mode="w+", shape=vectors.shape) if len(vectors) else None
+        if out is not None:
+            for start in range(0, len(vectors), SEMANTIC_CHUNK_ROWS):
+                out[start:start + SEMANTIC_CHUNK_ROWS] = vectors[start:start + SEMANTIC_CHUNK_ROWS]
+            out.flush()
+            del out
+            os.replace(tmp, self._file("vectors.f32"))
+        tmp = self._file("meta.json.tmp")
+        with open(tmp, "w") as f:
+            json.dump({"version": SEMANTIC_INDEX_VERSION, "dims": self.dims,
+                       "source_fit": self.source_fit, "digests": self.digests}, f)
+        os.replace(tmp, self._file("meta.json"))
+        self.load()
+
+    # -- building ----------------------------------------------------------
+
+    def _project(self, sparse_rows) -> np.ndarray:
+        return _normalize_rows(self.svd.transform(sparse_rows))
+
+    def fit(self, job_index):
+        """Fit the SVD on the job index matrix and project every job."""
+        from sklearn.decomposition import TruncatedSVD
+        started = time.perf_counter()
+        matrix = job_index.matrix
+        dims = max(1, min(self.dims, matrix.shape[1] - 1, matrix.shape[0] - 1))
+        self.svd = TruncatedSVD(n_components=dims, algorithm="randomized", random_state=0).fit(matrix)
+        vectors = np.empty((matrix.shape[0], self.dims), dtype=np.float32)
+        for start in range(0, matrix.shape[0], SEMANTIC_CHUNK_ROWS):
+            vectors[start:start + SEMANTIC_CHUNK_ROWS] = self.embed_rows(matrix[start:start + SEMANTIC_CHUNK_ROWS])
+        self.digests = list(job_index.digests)
+        self.source_fit = job_index.fit_id
+        self._save(vectors)
+        logging.info(f"Fitted semantic index ({dims} dims) on {matrix.shape[0]} jobs "
+                     f"in {time.perf_counter() - started:.2f}s")
+
+    def sync(self, job_index) -> "SemanticIndex":
+        """Cover exactly the job index rows, folding in new or changed rows with the stored SVD."""
+        if self.svd is None and not self.load():
+            self.fit(job_index)
+            return self
+        # the SVD components only mean something in the column space they were fitted on
+        if self.source_fit != job_index.fit_id or len(self.digests) > len(job_index.digests):
+            logging.info("Job index was refitted; refitting semantic index")
+            self.fit(job_index)
+            return self
+        rows = [i for i, digest in enumerate(job_index.digests)
+                if i >= len(self.digests) or self.digests[i] != digest]
+        if not rows:
+            return self
+        vectors = np.zeros((len(job_index.digests), self.dims), dtype=np.float32)
+        vectors[:len(self.vectors)] = self.vectors
+        vectors[rows] = self.embed_rows(job_index.matrix[rows])
+        self.digests = list(job_index.digests)
+        self._save(vectors)
+        logging.info(f"Folded {len(rows)} rows into semantic index")
+        return self
+
+    # -- querying ----------------------------------------------------------
+
+    def embed_rows(self, tfidf_rows) -> np.ndarray:
+        """Dense, L2-normalized vectors (dims wide) for TF-IDF rows."""
+        projected = self._project(tfidf_rows)
+        if projected.shape[1] < self.dims:
+            # tiny corpora fit fewer components; zero-pad so stored rows are always dims wide
+            projected = np.pad(projected, ((0, 0), (0, self.dims - projected.shape[1])))
+        return projected
+
+    def embed(self, job_index, texts) -> np.ndarray:
+        return self.embed_rows(job_index.transform(texts))
+
+    def similarity(self, query: np.ndarray, positions=None) -> np.ndarray:
+        """Cosine similarity of one query vector against all rows (or the given row positions)."""
+        query = np.asarray(query, dtype=np.float32).ravel()
+        if positions is not None:
+            return self.vectors[np.asarray(positions)] @ query
+        out = np.empty(len(self.vectors), dtype=np.float32)
+        for start in range(0, len(self.vectors), SEMANTIC_CHUNK_ROWS):
+            out[start:start + SEMANTIC_CHUNK_ROWS] = self.vectors[start:start + SEMANTIC_CHUNK_ROWS] @ query
+        return out
+
+    def top_k(self, query: np.ndarray, k: int):
+        """(row positions, scores) of the k most similar rows, best first."""
+        scores = self.similarity(query)
+        k = min(k, len(scores))
+        if k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return top, scores[top]
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format='[%(levelname)s] %(message)s')
+    parser = argparse.ArgumentParser(description="Build or query the dense LSA job index")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("build")
+    query = sub.add_parser("query")
+    query.add_argument("text")
+    query.add_argument("--top-k", type=int, default=10)
+    args = parser.parse_args()
+
+    from analyzer import JobCorpus
+    from job_index import JobIndex
+    corpus = JobCorpus()
+    job_index = JobIndex().sync(corpus)
+    index = SemanticIndex().sync(job_index)
+    if args.command == "query":
+        positions, scores = index.top_k(index.embed(job_index, [args.text])[0], args.top_k)
+        wanted = {job_index.links[pos] for pos in positions}
+        titles = {link: title for chunk in corpus for link, title in zip(chunk["link"], chunk["title"])
+                  if link in wanted}
+        for pos, score in zip(positions, scores):
+            link = job_index.links[pos]
+            print(f"{score:.3f}  {titles.get(link, '')}  {link}")
+    else:
+        print(f"{len(index.vectors)} job vectors ({index.dims} dims) in {index.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Multi-pattern skill matching over job texts.
+
+Builds a sparse job x skill count matrix in one pass per document over pre-lowercased
+text. Uses an Aho-Corasick automaton when `pyahocorasick` is installed (cost independent
+of the number of skills), otherwise one `str.count` per skill on the lowercased text.
+Matching is case-insensitive substring matching, the same rule as `skill.lower() in text.lower()`.
+"""
+import numpy as np
+import scipy.sparse as sp
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+
+class SkillMatcher:
+    def __init__(self, skills):
+        # Column order follows the given skills; case variants share one lowercase term
+        self.skills = [s for s in skills if s and s.strip()]
+        self._term_cols = {}
+        for col, skill in enumerate(self.skills):
+            self._term_cols.setdefault(skill.lower(), []).append(col)
+        self._automaton = None
+        if ahocorasick is not None and self._term_cols:
+            self._automaton = ahocorasick.Automaton()
+            for term, cols in self._term_cols.items():
+                self._automaton.add_word(term, cols)
+            self._automaton.make_automaton()
+
+    def _count_row(self, text: str):
+        counts = {}
+        if self._automaton is not None:
+            for _, cols in self._automaton.iter(text):
+                for col in cols:
+                    counts[col] = counts.get(col, 0) + 1
+            return counts
+        for term, cols in self._term_cols.items():
+            n = text.count(term)
+            if n:
+                for col in cols:
+                    counts[col] = n
+        return counts
+
+    def count_matrix(self, texts) -> sp.csr_matrix:
+        """Occurrences of each skill in each text (rows: texts, cols: self.skills)."""
+        indptr, indices, data = [0], [], []
+        for text in texts:
+            counts = self._count_row(text.lower() if isinstance(text, str) else "")
+            indices.extend(counts.keys())
+            data.extend(counts.values())
+            indptr.append(len(indices))
+        return sp.csr_matrix(
+            (np.asarray(data, dtype=np.int32), np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int64)),
+            shape=(len(indptr) - 1, len(self.skills))
+        )
+
+    def matched_skills(self, matrix: sp.csr_matrix, rows=None):
+        """List of matched skill names for each row (or only the given row positions)."""
+        matrix = matrix.tocsr()
+        rows = range(matrix.shape[0]) if rows is None else rows
+        out = []
+        for r in rows:
+            cols = np.sort(matrix.indices[matrix.indptr[r]:matrix.indptr[r + 1]])
+            out.append([self.skills[c] for c in cols])
+        return out
+
+    @staticmethod
+    def match_counts(matrix: sp.csr_matrix) -> np.ndarray:
+        """Number of distinct skills present in each row."""
+        return np.diff(matrix.tocsr().indptr)
+
+    @staticmethod
+    def document_frequency(matrix: sp.csr_matrix) -> np.ndarray:
+        """Number of rows containing each skill."""
+        return np.bincount(matrix.tocsr().indices, minlength=matrix.shape[1])
+
+    @staticmethod
+    def term_counts(matrix: sp.csr_matrix) -> np.ndarray:
+        """Total occurrences of each skill across all rows."""
+        return np.asarray(matrix.sum(axis=0)).ravel()